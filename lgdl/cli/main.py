@@ -1,6 +1,6 @@
-import click, json, re
+import click, json
 from lgdl.parser.parser import parse_lgdl
-from lgdl.parser.ir import compile_game
+from lgdl.parser.ir import compile_game, REGEX_TYPES
 
 @click.group()
 def cli(): ...
@@ -20,8 +20,10 @@ def compile(path, out):
     g = parse_lgdl(path)
     ir = compile_game(g)
     def _default(obj):
-        if isinstance(obj, re.Pattern):
+        if isinstance(obj, REGEX_TYPES):
             return obj.pattern
+        if isinstance(obj, frozenset):
+            return sorted(obj)
         raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
     with open(out,"w") as f:
@@ -100,6 +100,17 @@ class LGDLConfig:
     Default: $0.01 (well above typical ~$0.0015 with cascade)
     """
 
+    llm_cache_similarity: float = 0.95
+    """Embedding similarity at which a cached LLM match result is reused.
+
+    Inputs this close to a previously scored input (same game, pattern and
+    relevant vocabulary) skip the LLM call. Exact repeats are always reused
+    while fresh; set above 1.0 to reuse only those.
+    """
+
+    llm_cache_ttl: float = 3600.0
+    """Seconds a cached LLM match result stays valid."""
+
     # ====================
     # Phase 2: Semantic Slot Extraction (Future)
     # ====================
@@ -187,6 +198,8 @@ class LGDLConfig:
           LGDL_CASCADE_EMBEDDING_THRESHOLD - Embedding threshold (0.0-1.0)
           OPENAI_LLM_MODEL - LLM model name
           LGDL_MAX_COST_PER_TURN - Cost circuit breaker
+          LGDL_LLM_CACHE_SIMILARITY - Similarity for reusing LLM results
+          LGDL_LLM_CACHE_TTL - Lifetime of cached LLM results (seconds)
 
           LGDL_ENABLE_SEMANTIC_SLOT_EXTRACTION - Enable Phase 2 (future)
           LGDL_ENABLE_LEARNING - Enable Phase 3 (future)
@@ -221,6 +234,8 @@ class LGDLConfig:
             llm_max_tokens=int(os.getenv("LGDL_LLM_MAX_TOKENS", "100")),
             llm_temperature=float(os.getenv("LGDL_LLM_TEMPERATURE", "0.0")),
             max_cost_per_turn=float(os.getenv("LGDL_MAX_COST_PER_TURN", "0.01")),
+            llm_cache_similarity=float(os.getenv("LGDL_LLM_CACHE_SIMILARITY", "0.95")),
+            llm_cache_ttl=float(os.getenv("LGDL_LLM_CACHE_TTL", "3600")),
 
             # Phase 2: Semantic extraction (future)
             enable_semantic_slot_extraction=os.getenv(
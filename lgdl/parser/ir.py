@@ -1,9 +1,21 @@
 import re
-from typing import Dict, Any, Set
+from typing import Dict, Any, FrozenSet, Set
 from .ast import Game, Move
 
+# Optional: RE2 (linear-time, no backtracking) for trigger pattern regexes
+try:
+    import re2
+    RE2_AVAILABLE = True
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.case_sensitive = False
+    _RE2_OPTIONS.log_errors = False  # unsupported syntax falls back to re quietly
+except ImportError:
+    RE2_AVAILABLE = False
+
 LEVELS = {"low":0.2, "medium":0.5, "high":0.8, "critical":0.95, "adaptive":0.7}
 
+_WORD_RE = re.compile(r"[a-z]+")
+
 def _to_threshold(conf: Dict[str, Any]) -> float:
     if conf.get("kind") == "numeric":
         return float(conf.get("value", 0.75))
@@ -11,12 +23,30 @@ def _to_threshold(conf: Dict[str, Any]) -> float:
         return float(conf.get("numeric", LEVELS.get(conf.get("value"), 0.7)))
     return 0.75
 
-def compile_regex(pat: str) -> re.Pattern:
+def compile_regex(pat: str):
+    """Compile a trigger pattern to a case-insensitive regex.
+
+    Uses RE2 when google-re2 is installed, falling back to the stdlib re
+    module for syntax RE2 rejects (backreferences, lookaround). Both expose
+    the same .pattern / .search() / groupdict() API the matchers use.
+    """
     rx = pat
     rx = rx.replace("*", ".*")
     rx = re.sub(r"\{([A-Za-z_][A-Za-z0-9_\.]*)(\?)?\}", r"(?P<\1>.+)", rx)
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(rx, _RE2_OPTIONS)
+        except re2.error:
+            pass
     return re.compile(rx, re.I)
 
+# Compiled regex types compile_regex may return (for IR serialization)
+REGEX_TYPES = (re.Pattern, type(compile_regex(""))) if RE2_AVAILABLE else (re.Pattern,)
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Lowercase word tokens used by the token-overlap fallback matcher."""
+    return frozenset(_WORD_RE.findall(text.lower()))
+
 def compile_game(game: Game) -> Dict[str, Any]:
     moves = []
     for mv in game.moves:
@@ -43,7 +73,8 @@ def compile_move(mv: Move) -> Dict[str, Any]:
             pats.append({
                 "text": p.text,
                 "mods": p.modifiers,
-                "regex": compile_regex(p.text)
+                "regex": compile_regex(p.text),
+                "_tokens": tokenize(p.text)  # precomputed for token-overlap scoring
             })
         trigz.append({"participant": t.participant, "patterns": pats})
 
@@ -286,7 +286,7 @@ class LGDLRuntime:
                 print(f"[Negotiation] Skipped: {e.message} ({e.code})")
 
         # Initialize response accumulators (used by both slot and non-slot moves)
-        response_acc = ""
+        response_parts: List[str] = []
         action_out = None
         last_status = "ok"
 
@@ -376,9 +376,12 @@ class LGDLRuntime:
             if "all_slots_filled" in mv.get("slot_conditions", {}):
                 # Execute all_slots_filled actions first
                 for action in mv["slot_conditions"]["all_slots_filled"]:
-                    r, action_out, last_status = await self._exec_action(action, params)
+                    if action.get("type") == "capability":
+                        r, action_out, last_status = await self._exec_capability(action, params)
+                    else:
+                        r, action_out, last_status = self._exec_action_sync(action, params)
                     if r:
-                        response_acc += ("" if not response_acc else " ") + r
+                        response_parts.append(r)
 
                 # Clear slots after execution
                 await self.slot_manager.clear_slots(conversation_id, mv["id"])
@@ -403,9 +406,12 @@ class LGDLRuntime:
                     cond = link["condition"]
                     if eval_condition(cond, score, threshold, last_status, params):
                         for act in link["actions"]:
-                            r, action_out, last_status = await self._exec_action(act, params)
+                            if act.get("type") == "capability":
+                                r, action_out, last_status = await self._exec_capability(act, params)
+                            else:
+                                r, action_out, last_status = self._exec_action_sync(act, params)
                             if r:
-                                response_acc += ("" if not response_acc else " ") + r
+                                response_parts.append(r)
                         branch_executed = True
                         break
                 continue
@@ -417,14 +423,16 @@ class LGDLRuntime:
             if eval_result:
                 print(f"[Block] Executing block with {len(blk.get('actions', []))} actions")
                 for act in blk.get("actions", []):
-                    r, action_out, last_status = await self._exec_action(act, params)
+                    if act.get("type") == "capability":
+                        r, action_out, last_status = await self._exec_capability(act, params)
+                    else:
+                        r, action_out, last_status = self._exec_action_sync(act, params)
                     if r:
-                        response_acc += ("" if not response_acc else " ") + r
+                        response_parts.append(r)
                         print(f"[Block] Added response: {r[:80]}...")
                 branch_executed = True
 
-        if not response_acc:
-            response_acc = "OK."
+        response_acc = " ".join(response_parts) or "OK."
 
         # Build result with negotiation metadata if present
         result = {
@@ -500,7 +508,8 @@ class LGDLRuntime:
 
         return result
 
-    async def _exec_action(self, action: Dict[str, Any], params: Dict[str, Any]):
+    def _exec_action_sync(self, action: Dict[str, Any], params: Dict[str, Any]):
+        """Execute a non-capability action without a coroutine round-trip."""
         atype = action.get("type")
         data = action.get("data", {})
         status = "ok"
@@ -508,33 +517,36 @@ class LGDLRuntime:
             return self.templates.render(data.get("text",""), params), None, status
         if atype == "offer_choices":
             return "Options: " + ", ".join(data.get("choices", [])), None, status
-        if atype == "capability":
-            call = data.get("call", {})
-            func = call.get("function")
-            if not self.policy.allowed(func):
-                return "Not allowed.", None, "err"
-            # Check if capabilities are enabled
-            if not self.cap:
-                return "Capabilities not configured.", None, "err"
-            # Build payload from all non-None params (generalized for all games)
-            payload = {}
-            for k, v in params.items():
-                if v is not None and not k.startswith("_"):
-                    payload[k] = v
-            res = await self.cap.execute(f'{call.get("service")}.{func}', payload)
-
-            # Merge response data into params for subsequent template rendering
-            # This enables templates to use values like ${base_price * quantity}
-            if "data" in res and isinstance(res["data"], dict):
-                params.update(res["data"])
-
-            return res.get("message",""), func, status
         if atype in ("continue","return"):
             return "", None, status
         if atype == "escalate":
             return "Escalating to " + data.get("to","human"), "escalate", status
         return "", None, status
 
+    async def _exec_capability(self, action: Dict[str, Any], params: Dict[str, Any]):
+        """Execute a capability action (the only action type that awaits I/O)."""
+        data = action.get("data", {})
+        call = data.get("call", {})
+        func = call.get("function")
+        if not self.policy.allowed(func):
+            return "Not allowed.", None, "err"
+        # Check if capabilities are enabled
+        if not self.cap:
+            return "Capabilities not configured.", None, "err"
+        # Build payload from all non-None params (generalized for all games)
+        payload = {}
+        for k, v in params.items():
+            if v is not None and not k.startswith("_"):
+                payload[k] = v
+        res = await self.cap.execute(f'{call.get("service")}.{func}', payload)
+
+        # Merge response data into params for subsequent template rendering
+        # This enables templates to use values like ${base_price * quantity}
+        if "data" in res and isinstance(res["data"], dict):
+            params.update(res["data"])
+
+        return res.get("message",""), func, "ok"
+
     def _has_clarify(self, move: dict) -> bool:
         """
         Check if move has clarify action in uncertain block.
@@ -5,9 +5,11 @@ Provides abstract interface for LLM completions with structured output support.
 Includes OpenAI implementation with cost estimation and error handling.
 """
 
+import importlib.util
 import json
 import logging
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
@@ -17,8 +19,58 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Optional: orjson for faster schema serialization and response parsing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 for the pooled OpenAI connection needs the h2 package (httpx[http2])
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+_json_dumps = orjson.dumps if ORJSON_AVAILABLE else json.dumps
+
 logger = logging.getLogger(__name__)
 
+# Fixed first line of every system message (static, so it heads the cached prefix)
+_SYSTEM_PREAMBLE = "You are a precise pattern matching assistant. Always respond with valid JSON."
+
+# Process-wide tiktoken encoders, keyed by model name (None = unavailable)
+_ENCODERS: Dict[str, Any] = {}
+
+
+def _get_encoder(model: str):
+    """Return a cached tiktoken encoder for model, or None if unavailable.
+
+    Unknown models fall back to the cl100k_base encoding.
+    """
+    if model in _ENCODERS:
+        return _ENCODERS[model]
+
+    encoder = None
+    if TIKTOKEN_AVAILABLE:
+        try:
+            encoder = tiktoken.encoding_for_model(model)
+        except KeyError:
+            try:
+                encoder = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken encoding unavailable: {e}")
+        except Exception as e:
+            logger.warning(f"tiktoken encoding unavailable for {model}: {e}")
+
+    _ENCODERS[model] = encoder
+    return encoder
+
 
 @dataclass
 class CompletionResult:
@@ -53,7 +105,8 @@ class LLMClient(ABC):
         prompt: str,
         response_schema: Dict[str, Any],
         max_tokens: int = 100,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        system_prompt: Optional[str] = None
     ) -> CompletionResult:
         """Get structured completion from LLM.
 
@@ -62,6 +115,9 @@ class LLMClient(ABC):
             response_schema: JSON schema for expected response structure
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature (0.0 = deterministic)
+            system_prompt: Optional static instructions sent ahead of prompt
+                (kept byte-identical across calls so provider prefix caching
+                applies)
 
         Returns:
             CompletionResult with parsed JSON and metadata
@@ -148,10 +204,19 @@ class OpenAIClient(LLMClient):
                 f"Model {model} not in pricing table. Using gpt-4o-mini pricing as fallback."
             )
 
+        import httpx
+
+        # One pooled connection set per client: keep-alive (and HTTP/2 when
+        # h2 is installed) lets concurrent scoring calls share TLS sessions
         self.client = AsyncOpenAI(
             api_key=api_key,
             max_retries=max_retries,
-            timeout=timeout
+            timeout=timeout,
+            http_client=httpx.AsyncClient(
+                http2=H2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=50),
+                timeout=timeout
+            )
         )
         self.model = model
 
@@ -160,17 +225,20 @@ class OpenAIClient(LLMClient):
         prompt: str,
         response_schema: Dict[str, Any],
         max_tokens: int = 100,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        system_prompt: Optional[str] = None
     ) -> CompletionResult:
         """Get structured JSON completion from OpenAI.
 
         Uses OpenAI's JSON mode to enforce structured output.
 
         Args:
-            prompt: System + user prompt
+            prompt: User prompt (per-call content)
             response_schema: Expected JSON schema (for documentation)
             max_tokens: Maximum output tokens
             temperature: Sampling temperature
+            system_prompt: Optional static instructions, appended to the
+                system message so the message prefix stays cacheable
 
         Returns:
             CompletionResult with parsed JSON
@@ -190,7 +258,7 @@ class OpenAIClient(LLMClient):
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a precise pattern matching assistant. Always respond with valid JSON."
+                        "content": _SYSTEM_PREAMBLE + (f"\n\n{system_prompt}" if system_prompt else "")
                     },
                     {
                         "role": "user",
@@ -204,7 +272,7 @@ class OpenAIClient(LLMClient):
 
             # Extract and parse response
             content_text = response.choices[0].message.content
-            parsed_content = json.loads(content_text)
+            parsed_content = _json_loads(content_text)
 
             # Calculate cost
             input_tokens = response.usage.prompt_tokens
@@ -239,7 +307,8 @@ class OpenAIClient(LLMClient):
     ) -> float:
         """Estimate completion cost.
 
-        Uses rough tokenization estimate (4 chars ≈ 1 token).
+        Counts input tokens exactly with tiktoken when installed; otherwise
+        uses a rough tokenization estimate (4 chars ≈ 1 token).
 
         Args:
             prompt: The prompt text
@@ -248,8 +317,12 @@ class OpenAIClient(LLMClient):
         Returns:
             Estimated cost in USD
         """
-        # Rough token estimate: ~4 characters per token
-        estimated_input_tokens = len(prompt) / 4
+        encoder = _get_encoder(self.model)
+        if encoder is not None:
+            estimated_input_tokens = len(encoder.encode(prompt))
+        else:
+            # Rough token estimate: ~4 characters per token
+            estimated_input_tokens = len(prompt) / 4
         estimated_output_tokens = max_tokens
 
         return self._calculate_cost(
@@ -287,30 +360,40 @@ class OpenAIClient(LLMClient):
     ) -> str:
         """Format JSON schema as human-readable description.
 
+        Response schemas are almost always the same literal per caller, so the
+        formatted text is memoized on the schema's JSON serialization (orjson
+        when installed).
+
         Args:
             schema: JSON schema dictionary
 
         Returns:
             Formatted description string
         """
-        lines = []
-        for field, spec in schema.items():
-            field_type = spec.get("type", "any")
-            description = spec.get("description", "")
+        return _format_schema_json(_json_dumps(schema))
+
 
-            line = f"- {field} ({field_type})"
-            if description:
-                line += f": {description}"
+@lru_cache(maxsize=64)
+def _format_schema_json(schema_json) -> str:
+    """Format a JSON-serialized schema (cached by its serialized form, str or bytes)."""
+    lines = []
+    for field, spec in _json_loads(schema_json).items():
+        field_type = spec.get("type", "any")
+        description = spec.get("description", "")
 
-            # Add constraints
-            if "minimum" in spec and "maximum" in spec:
-                line += f" [range: {spec['minimum']}-{spec['maximum']}]"
-            elif "enum" in spec:
-                line += f" [one of: {', '.join(spec['enum'])}]"
+        line = f"- {field} ({field_type})"
+        if description:
+            line += f": {description}"
 
-            lines.append(line)
+        # Add constraints
+        if "minimum" in spec and "maximum" in spec:
+            line += f" [range: {spec['minimum']}-{spec['maximum']}]"
+        elif "enum" in spec:
+            line += f" [one of: {', '.join(spec['enum'])}]"
 
-        return "\n".join(lines)
+        lines.append(line)
+
+    return "\n".join(lines)
 
 
 class MockLLMClient(LLMClient):
@@ -347,7 +430,8 @@ class MockLLMClient(LLMClient):
         prompt: str,
         response_schema: Dict[str, Any],
         max_tokens: int = 100,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        system_prompt: Optional[str] = None
     ) -> CompletionResult:
         """Return mock completion.
 
@@ -356,33 +440,53 @@ class MockLLMClient(LLMClient):
             response_schema: Used to determine response structure
             max_tokens: Ignored
             temperature: Ignored
+            system_prompt: Ignored
 
         Returns:
             CompletionResult with mock data
         """
         # Build mock response matching schema
+        content = self._mock_object(response_schema)
+
+        return CompletionResult(
+            content=content,
+            cost=0.0,  # No cost for mock
+            tokens_used=50,
+            model="mock"
+        )
+
+    def _mock_object(self, properties: Dict[str, Any], index: int = 0) -> Dict[str, Any]:
+        """Build a mock object for a {field: spec} schema.
+
+        Arrays of objects get minItems entries, numbered by an "id" field
+        from 1 (as batch prompts number their candidates).
+        """
         content = {}
 
-        for field, spec in response_schema.items():
+        for field, spec in properties.items():
             if field == "confidence":
                 content[field] = self.default_confidence
             elif field == "reasoning":
                 content[field] = self.default_reasoning
+            elif field == "id" and index:
+                content[field] = index
             elif spec.get("type") == "number":
                 content[field] = 0.5
             elif spec.get("type") == "boolean":
                 content[field] = True
             elif spec.get("type") == "array":
-                content[field] = []
+                item_props = spec.get("items", {}).get("properties")
+                if item_props:
+                    content[field] = [
+                        self._mock_object(item_props, index=n)
+                        for n in range(1, spec.get("minItems", 0) + 1)
+                    ]
+                else:
+                    content[field] = []
             else:
                 content[field] = "mock_value"
 
-        return CompletionResult(
-            content=content,
-            cost=0.0,  # No cost for mock
-            tokens_used=50,
-            model="mock"
-        )
+        return content
 
     def estimate_cost(
         self,
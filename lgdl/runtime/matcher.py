@@ -1,18 +1,163 @@
-import os, re, math, json, hashlib, time, sqlite3, warnings
-from typing import Dict, Any, Tuple, List
+import os, re, json, asyncio, hashlib, sqlite3, threading, time, warnings
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Any, FrozenSet, Tuple, List
 from pathlib import Path
 import numpy as np
 
+from ..parser.ir import tokenize
+
+# Optional RE2 (linear-time automaton) for the per-move prefilter regexes
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 # Optional OpenAI embeddings: if OPENAI_API_KEY is set, use embeddings; else fallback to overlap.
 USE_OPENAI = bool(os.getenv("OPENAI_API_KEY"))
 
+# Stay well under SQLite's default limit of 999 bound parameters per statement
+_SQL_IN_CHUNK = 900
+
+# Memoized tokenizer: pattern texts and repeated utterances are tokenized once
+_tokens = lru_cache(maxsize=1024)(tokenize)
+
 def token_overlap(a: str, b: str) -> float:
-    ta = set(re.findall(r"[a-z]+", a.lower()))
-    tb = set(re.findall(r"[a-z]+", b.lower()))
+    return _token_set_overlap(_tokens(a), _tokens(b))
+
+def _token_set_overlap(ta: FrozenSet[str], tb: FrozenSet[str]) -> float:
     if not ta or not tb:
         return 0.0
     return min(1.0, 0.4 + 0.1 * len(ta & tb))
 
+_NAMED_GROUP_RE = re.compile(r"\(\?P<[A-Za-z_][A-Za-z0-9_]*>")
+# A backreference (\1 or (?P=name)) not preceded by an escaped backslash
+_BACKREF_RE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=")
+
+def _has_backreference(patterns: List[Dict[str, Any]]) -> bool:
+    """True if any pattern refers back to a group; such patterns can't be
+    OR-combined since the groups they refer to are renamed or renumbered."""
+    return any(_BACKREF_RE.search(pat["regex"].pattern) for pat in patterns)
+
+def union_regex(patterns: List[Dict[str, Any]]) -> re.Pattern | None:
+    """OR-combine compiled pattern regexes into one prefilter regex.
+
+    Capture names are dropped (several patterns capture the same slot name),
+    so the union only answers "does any pattern match?" in a single scan;
+    parameters still come from the matching pattern's own regex.
+
+    Compiled with RE2 when google-re2 is installed (linear-time, no
+    backtracking), otherwise with the stdlib re module.
+
+    Returns None for no patterns or syntax the combined regex can't express
+    (e.g. backreferences), in which case callers skip the prefilter.
+    """
+    if not patterns or _has_backreference(patterns):
+        return None
+    source = "|".join(
+        f"(?:{_NAMED_GROUP_RE.sub('(?:', pat['regex'].pattern)})" for pat in patterns
+    )
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile("(?i)" + source)
+        except Exception:
+            pass  # syntax RE2 doesn't support (e.g. lookarounds)
+    try:
+        return re.compile(source, re.I)
+    except re.error:
+        return None
+
+
+def indexed_union_regex(patterns: List[Dict[str, Any]]) -> re.Pattern | None:
+    """OR-combine pattern regexes, wrapping pattern i in an outer group ``p{i}``.
+
+    One search reports (via ``lastgroup``) which pattern matched at the
+    leftmost position. Inner capture names are dropped as in union_regex.
+
+    Returns None for no patterns or syntax the combined regex can't express
+    (e.g. backreferences).
+    """
+    if not patterns or _has_backreference(patterns):
+        return None
+    source = "|".join(
+        f"(?P<p{i}>{_NAMED_GROUP_RE.sub('(?:', pat['regex'].pattern)})"
+        for i, pat in enumerate(patterns)
+    )
+    try:
+        return re.compile(source, re.I)
+    except re.error:
+        return None
+
+
+def pattern_set(patterns: List[Dict[str, Any]]):
+    """Compile patterns into one RE2 multi-pattern set, or None.
+
+    ``Match(text)`` on the returned set reports the indices of every pattern
+    that matches in a single linear-time scan. Capture groups are dropped
+    (the set only answers "which patterns hit?"); callers re-run the original
+    regex of a hit to extract parameters.
+
+    Returns None when google-re2 is not installed or a pattern uses syntax
+    RE2 doesn't support, so callers fall back to scanning regexes one by one.
+    """
+    if not RE2_AVAILABLE or not patterns:
+        return None
+    try:
+        pset = re2.Set.SearchSet(re2.Options())
+        for pat in patterns:
+            pset.Add("(?i)" + _NAMED_GROUP_RE.sub("(?:", pat["regex"].pattern))
+        pset.Compile()
+    except Exception:
+        return None
+    return pset
+
+
+def _pattern_tokens(pat: Dict[str, Any]) -> FrozenSet[str]:
+    """Pattern tokens precomputed by compile_game (tokenized here for hand-built IR)."""
+    tokens = pat.get("_tokens")
+    if tokens is None:
+        tokens = _tokens(pat["text"])
+    return tokens
+
+
+def _quantize_i8(vec: np.ndarray) -> bytes:
+    """Pack vec as a float32 scale followed by int8 codes (~4x smaller than f32)."""
+    vec = np.asarray(vec, dtype=np.float32)
+    scale = np.float32(np.abs(vec).max() or 1.0)
+    codes = np.round(vec / scale * 127).astype(np.int8)
+    return scale.tobytes() + codes.tobytes()
+
+
+def _dequantize_i8(blob: bytes) -> np.ndarray:
+    """Inverse of _quantize_i8, re-normalized to unit length."""
+    scale = np.frombuffer(blob, dtype=np.float32, count=1)[0]
+    codes = np.frombuffer(blob, dtype=np.int8, offset=4)
+    return _l2_normalize(codes.astype(np.float32) * (scale / 127))
+
+
+def _live_patterns(move: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Patterns of a move's user/assistant triggers (the ones matched against input)."""
+    return [
+        pat
+        for trig in move["triggers"]
+        if trig["participant"] in ("user", "assistant")
+        for pat in trig["patterns"]
+    ]
+
+
+def _pattern_entry(pat: Dict[str, Any], row: int | None) -> Tuple:
+    """(regex, pattern, strict, fuzzy, row) tuple iterated by _apply_patterns."""
+    mods = pat.get("mods", [])
+    return (pat["regex"], pat, "strict" in mods, "fuzzy" in mods, row)
+
+
+def _l2_normalize(vec: List[float]) -> np.ndarray:
+    """Scale vec to unit length so cached vectors can be compared by dot product."""
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = np.linalg.norm(arr) or 1.0
+    return arr / norm
+
 
 class EmbeddingClient:
     """
@@ -20,34 +165,68 @@ class EmbeddingClient:
 
     Features:
     - SQLite cache keyed by (text_hash, model, version)
+    - In-memory LRU of recent vectors in front of SQLite
+    - Vectors stored as raw float32 BLOBs (or int8 + scale with
+      EMBEDDING_CACHE_DTYPE=int8) and returned as np.ndarray
     - Version lock warnings on model mismatch
     - Deterministic TF-IDF character bigram fallback
     """
 
+    # Vectors kept in the in-memory LRU (hot utterances and pattern texts)
+    MEMORY_CACHE_SIZE = 4096
+
     def __init__(self):
         self.model = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
         self.version_lock = os.getenv("OPENAI_EMBEDDING_VERSION", "2025-01")
         self.cache_enabled = os.getenv("EMBEDDING_CACHE", "1") == "1"
+        # Storage format for new cache rows: "f32" (default) or "i8"
+        self.cache_encoding = "i8" if os.getenv("EMBEDDING_CACHE_DTYPE") == "int8" else "f32"
 
         if self.cache_enabled:
-            cache_dir = Path(".embeddings_cache")
-            cache_dir.mkdir(exist_ok=True)
-            self.cache_db = cache_dir / f"{self.model}_{self.version_lock}.db"
-            self._init_cache_db()
+            # The cache file is created on first use (see _ensure_db)
+            self.cache_db = Path(".embeddings_cache") / f"{self.model}_{self.version_lock}.db"
+            self._db_lock = threading.Lock()
+            self._conn = None
+            self._mem: "OrderedDict[str, np.ndarray]" = OrderedDict()
+            self._mem_lock = threading.Lock()
         else:
-            self.cache: Dict[str, List[float]] = {}
+            self.cache: Dict[str, np.ndarray] = {}
 
+        # The OpenAI client is built on the first online embed (see client)
         self.enabled = bool(os.getenv("OPENAI_API_KEY"))
-        if self.enabled:
-            try:
-                from openai import OpenAI
-                self.client = OpenAI()
-            except Exception:
-                self.enabled = False
+        self._client = None
+
+    @property
+    def client(self):
+        """OpenAI client, imported and constructed on first use."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    def _ensure_db(self):
+        """Open the cache database on first use. Caller holds self._db_lock."""
+        if self._conn is None:
+            self.cache_db.parent.mkdir(exist_ok=True)
+            self._init_cache_db()
 
     def _init_cache_db(self):
-        """Initialize SQLite cache with versioning."""
-        conn = sqlite3.connect(self.cache_db)
+        """Open the long-lived cache connection and initialize the schema.
+
+        One autocommit connection is kept per client (guarded by a lock) in
+        WAL mode, so lookups don't pay connect/close and page-cache warmup and
+        writes don't fsync on every insert.
+        """
+        self._conn = conn = sqlite3.connect(
+            self.cache_db, check_same_thread=False, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         conn.execute("""
             CREATE TABLE IF NOT EXISTS embeddings (
                 text_hash TEXT PRIMARY KEY,
@@ -55,17 +234,41 @@ class EmbeddingClient:
                 model TEXT,
                 version TEXT,
                 embedding BLOB,
+                encoding TEXT NOT NULL DEFAULT 'f32',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        conn.commit()
-        conn.close()
+        # Caches created before binary storage hold JSON text; tag those rows
+        # so _get_cached can decode and rewrite them on first read.
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+        if "encoding" not in columns:
+            conn.execute(
+                "ALTER TABLE embeddings ADD COLUMN encoding TEXT NOT NULL DEFAULT 'json'"
+            )
+        # Rows keyed by the old 64-char sha256 hex digest are rekeyed in place
+        # from their stored text (new keys are 32-char blake2b digests).
+        if conn.execute(
+            "SELECT 1 FROM embeddings WHERE length(text_hash) = 64 LIMIT 1"
+        ).fetchone():
+            conn.create_function("lgdl_key", 1, self._key, deterministic=True)
+            conn.execute(
+                "UPDATE OR REPLACE embeddings SET text_hash = lgdl_key(text) "
+                "WHERE length(text_hash) = 64 AND text IS NOT NULL"
+            )
+
+    def close(self):
+        """Close the cache connection (no-op when the SQLite cache is disabled)."""
+        conn = getattr(self, "_conn", None)
+        if conn is not None:
+            conn.close()
+            self._conn = None
 
-    def _key(self, text: str) -> str:
-        """Generate cache key from text."""
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    @staticmethod
+    def _key(text: str) -> str:
+        """Generate cache key from text (128-bit BLAKE2b, hex)."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> np.ndarray:
         """
         Get embedding for text with caching.
 
@@ -73,28 +276,26 @@ class EmbeddingClient:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            Embedding vector (float32)
         """
         text_hash = self._key(text)
 
         # Check cache
         if self.cache_enabled:
-            cached = self._get_cached(text_hash)
-            if cached:
+            cached = self._lookup(text_hash)
+            if cached is not None:
                 return cached
         elif text_hash in self.cache:
             return self.cache[text_hash]
 
         # Fallback to offline mode if no API key
         if not self.enabled:
-            vec = self._offline_embedding(text)
-            self._store_cache(text_hash, text, vec)
-            return vec
+            return self._store_cache(text_hash, text, self._offline_embedding(text))
 
         # Fetch from OpenAI
         try:
             res = self.client.embeddings.create(model=self.model, input=[text])
-            vec = res.data[0].embedding
+            vec = _l2_normalize(res.data[0].embedding)
 
             # Version check (warn on mismatch)
             if hasattr(res, 'model'):
@@ -109,8 +310,7 @@ class EmbeddingClient:
                     # Fail closed: don't cache mismatched versions
                     return vec
 
-            self._store_cache(text_hash, text, vec)
-            return vec
+            return self._store_cache(text_hash, text, vec)
 
         except Exception as e:
             # Fall back to offline
@@ -121,41 +321,213 @@ class EmbeddingClient:
             self.enabled = False
             return self.embed(text)
 
-    def _get_cached(self, text_hash: str) -> List[float] | None:
-        """Retrieve cached embedding if available."""
-        conn = sqlite3.connect(self.cache_db)
-        cursor = conn.execute(
-            "SELECT embedding FROM embeddings "
-            "WHERE text_hash = ? AND model = ? AND version = ?",
-            (text_hash, self.model, self.version_lock)
-        )
-        row = cursor.fetchone()
-        conn.close()
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Get embeddings for several texts with one cache query and one API call.
 
-        if row:
-            return json.loads(row[0])
-        return None
+        Cache lookups are batched with ``IN (...)``, all misses are sent to
+        OpenAI in a single request, and new vectors are written back with
+        ``executemany``.
+
+        Args:
+            texts: Texts to embed (duplicates are embedded once)
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        keys = {text: self._key(text) for text in texts}
 
-    def _store_cache(self, text_hash: str, text: str, vec: List[float]):
-        """Store embedding in cache."""
         if self.cache_enabled:
-            conn = sqlite3.connect(self.cache_db)
-            conn.execute(
-                "INSERT OR REPLACE INTO embeddings "
-                "(text_hash, text, model, version, embedding) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (text_hash, text, self.model, self.version_lock, json.dumps(vec))
-            )
-            conn.commit()
-            conn.close()
+            found = {}
+            for text_hash in set(keys.values()):
+                vec = self._mem_get(text_hash)
+                if vec is not None:
+                    found[text_hash] = vec
+            rest = [h for h in set(keys.values()) if h not in found]
+            if rest:
+                for text_hash, vec in self._get_cached_many(rest).items():
+                    self._remember(text_hash, vec)
+                    found[text_hash] = vec
         else:
+            found = {h: self.cache[h] for h in keys.values() if h in self.cache}
+
+        missing = [text for text, h in keys.items() if h not in found]
+        if missing:
+            found.update(self._embed_uncached(missing, keys))
+
+        return [found[keys[text]] for text in texts]
+
+    def _embed_uncached(self, texts: List[str], keys: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """Compute and cache embeddings for texts that missed the cache."""
+        if not self.enabled:
+            vecs = [self._offline_embedding(text) for text in texts]
+            vecs = self._store_cache_many([(keys[t], t, v) for t, v in zip(texts, vecs)])
+            return {keys[t]: v for t, v in zip(texts, vecs)}
+
+        try:
+            res = self.client.embeddings.create(model=self.model, input=texts)
+            vecs = [_l2_normalize(item.embedding) for item in res.data]
+
+            # Version check (warn on mismatch)
+            if hasattr(res, 'model') and res.model != self.model:
+                warnings.warn(
+                    f"Embedding model mismatch: expected {self.model}, "
+                    f"got {res.model}. Confidence scores may not be "
+                    f"reproducible. Consider setting OPENAI_EMBEDDING_MODEL={res.model}",
+                    UserWarning
+                )
+                # Fail closed: don't cache mismatched versions
+                return {keys[t]: v for t, v in zip(texts, vecs)}
+
+            vecs = self._store_cache_many([(keys[t], t, v) for t, v in zip(texts, vecs)])
+            return {keys[t]: v for t, v in zip(texts, vecs)}
+
+        except Exception as e:
+            # Fall back to offline
+            warnings.warn(
+                f"OpenAI embedding failed: {e}. Using offline fallback.",
+                UserWarning
+            )
+            self.enabled = False
+            return self._embed_uncached(texts, keys)
+
+    def _lookup(self, text_hash: str) -> np.ndarray | None:
+        """Find a cached embedding in the memory LRU, then in SQLite."""
+        vec = self._mem_get(text_hash)
+        if vec is None:
+            vec = self._get_cached(text_hash)
+            if vec is not None:
+                self._remember(text_hash, vec)
+        return vec
+
+    def _mem_get(self, text_hash: str) -> np.ndarray | None:
+        with self._mem_lock:
+            vec = self._mem.get(text_hash)
+            if vec is not None:
+                self._mem.move_to_end(text_hash)
+            return vec
+
+    def _remember(self, text_hash: str, vec: np.ndarray):
+        """Add vec to the memory LRU (read-only, since callers share it)."""
+        vec.flags.writeable = False
+        with self._mem_lock:
+            self._mem[text_hash] = vec
+            self._mem.move_to_end(text_hash)
+            if len(self._mem) > self.MEMORY_CACHE_SIZE:
+                self._mem.popitem(last=False)
+
+    def _get_cached(self, text_hash: str) -> np.ndarray | None:
+        """Retrieve cached embedding if available."""
+        with self._db_lock:
+            self._ensure_db()
+            row = self._conn.execute(
+                "SELECT text, embedding, encoding FROM embeddings "
+                "WHERE text_hash = ? AND model = ? AND version = ?",
+                (text_hash, self.model, self.version_lock)
+            ).fetchone()
+
+        if not row:
+            return None
+        return self._decode_row(text_hash, *row)
+
+    def _get_cached_many(self, text_hashes: List[str]) -> Dict[str, np.ndarray]:
+        """Retrieve all cached embeddings among text_hashes, keyed by hash."""
+        rows = []
+        with self._db_lock:
+            self._ensure_db()
+            for i in range(0, len(text_hashes), _SQL_IN_CHUNK):
+                chunk = text_hashes[i:i + _SQL_IN_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows.extend(self._conn.execute(
+                    "SELECT text_hash, text, embedding, encoding FROM embeddings "
+                    f"WHERE text_hash IN ({placeholders}) AND model = ? AND version = ?",
+                    (*chunk, self.model, self.version_lock)
+                ).fetchall())
+
+        return {row[0]: self._decode_row(*row) for row in rows}
+
+    def _decode_row(self, text_hash: str, text: str, blob: bytes, encoding: str) -> np.ndarray:
+        """Decode a cached embedding row."""
+        if encoding == "json":
+            # Legacy row: decode once and rewrite it in binary form
+            vec = np.asarray(json.loads(blob), dtype=np.float32)
+            return self._store_cache(text_hash, text, vec)
+        if encoding == "i8":
+            return _dequantize_i8(blob)
+        return np.frombuffer(blob, dtype=np.float32)
+
+    def _encode(self, vec: np.ndarray) -> Tuple[bytes, np.ndarray]:
+        """Serialize vec in self.cache_encoding; also return the vector as stored."""
+        if self.cache_encoding == "i8":
+            blob = _quantize_i8(vec)
+            return blob, _dequantize_i8(blob)
+        vec = np.ascontiguousarray(vec, dtype=np.float32)
+        return vec.tobytes(), vec
+
+    def _store_cache(self, text_hash: str, text: str, vec: np.ndarray) -> np.ndarray:
+        """Store embedding in cache.
+
+        Returns the vector as a later cache hit will return it (int8-encoded
+        rows are lossy), so first and repeated lookups agree.
+        """
+        if not self.cache_enabled:
             self.cache[text_hash] = vec
+            return vec
+
+        blob, vec = self._encode(vec)
+        with self._db_lock:
+            self._ensure_db()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings "
+                "(text_hash, text, model, version, embedding, encoding) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (text_hash, text, self.model, self.version_lock, blob, self.cache_encoding)
+            )
+        self._remember(text_hash, vec)
+        return vec
 
-    def _offline_embedding(self, text: str) -> List[float]:
+    def _store_cache_many(self, entries: List[Tuple[str, str, np.ndarray]]) -> List[np.ndarray]:
+        """Store (text_hash, text, vec) entries in one transaction.
+
+        Returns the vectors as stored, in entry order (see _store_cache).
+        """
+        if not self.cache_enabled:
+            for text_hash, _, vec in entries:
+                self.cache[text_hash] = vec
+            return [vec for _, _, vec in entries]
+
+        rows = []
+        stored = []
+        for text_hash, text, vec in entries:
+            blob, vec = self._encode(vec)
+            rows.append((text_hash, text, self.model, self.version_lock, blob, self.cache_encoding))
+            stored.append(vec)
+        with self._db_lock:
+            self._ensure_db()
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings "
+                    "(text_hash, text, model, version, embedding, encoding) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        for (text_hash, _, _), vec in zip(entries, stored):
+            self._remember(text_hash, vec)
+        return stored
+
+    def _offline_embedding(self, text: str) -> np.ndarray:
         """
         Deterministic offline embedding using TF-IDF-inspired character bigrams.
 
         Better than bag-of-letters because it captures local character patterns.
+        Bigrams are taken over the UTF-8 bytes and hashed with a fixed
+        multiplicative (Knuth) hash of the 16-bit bigram, so vectors are
+        identical across processes, all in vectorized NumPy.
 
         Args:
             text: Text to embed
@@ -163,79 +535,332 @@ class EmbeddingClient:
         Returns:
             Normalized embedding vector (256 dimensions)
         """
-        # Use character bigrams as features (more expressive than single chars)
-        bigrams = (
-            [text[i:i+2] for i in range(len(text)-1)]
-            if len(text) > 1
-            else [text]
-        )
-
         # Fixed vocabulary size for consistent dimensionality
         vocab_size = 256
-        vec = np.zeros(vocab_size)
-
-        # Hash each bigram to vocab index and increment
-        for bigram in bigrams:
-            idx = hash(bigram) % vocab_size
-            vec[idx] += 1
+        buf = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+
+        if len(buf) > 1:
+            # Hash each byte bigram to a vocab index (top 8 bits of the
+            # 32-bit product, which depend on both bytes) and count
+            bigrams = (buf[:-1].astype(np.uint32) << 8) | buf[1:]
+            idx = (bigrams * np.uint32(2654435761)) >> 24
+            vec = np.bincount(idx, minlength=vocab_size).astype(np.float32)
+        else:
+            # Single byte (or empty text): one feature so the vector is non-zero
+            vec = np.zeros(vocab_size, dtype=np.float32)
+            vec[buf[0] if len(buf) else 0] = 1.0
 
         # L2 normalize
         norm = np.linalg.norm(vec) or 1.0
-        vec = vec / norm
+        return vec / norm
 
-        return vec.tolist()
+def cosine(a: List[float], b: List[float], normalized: bool = False) -> float:
+    """Cosine similarity clamped to [0, 1].
 
-def cosine(a: List[float], b: List[float]) -> float:
-    if not a or not b or len(a) != len(b):
+    Pass normalized=True when both vectors are unit length (everything
+    EmbeddingClient returns is) to reduce it to a single dot product.
+    """
+    if a is None or b is None or len(a) == 0 or len(a) != len(b):
+        return 0.0
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    if normalized:
+        return max(0.0, min(1.0, float(np.dot(a, b))))
+    denom = np.sqrt(np.vdot(a, a) * np.vdot(b, b))
+    if not denom:
         return 0.0
-    dot = sum(x*y for x,y in zip(a,b))
-    na = math.sqrt(sum(x*x for x in a)) or 1.0
-    nb = math.sqrt(sum(y*y for y in b)) or 1.0
-    return max(0.0, min(1.0, dot/(na*nb)))
+    return max(0.0, min(1.0, float(np.dot(a, b) / denom)))
 
 class TwoStageMatcher:
     HIGH_EXIT = 0.90
+    # Pattern matrices with at least this many floats go to the GPU (if any)
+    GPU_MIN_ELEMENTS = 1_000_000
+    # Game plans kept before the identity cache is reset
+    PLAN_CACHE_SIZE = 16
 
-    def __init__(self):
+    def __init__(self, device: str | None = None):
+        """
+        Args:
+            device: Optional torch device (e.g. "cuda") for scoring large
+                pattern matrices. Defaults to $LGDL_MATCHER_DEVICE; CPU/NumPy
+                is used when unset or when torch is not installed.
+        """
         self.emb = EmbeddingClient()
+        self.device = device or os.getenv("LGDL_MATCHER_DEVICE") or None
+        # id(compiled_game) -> pattern plan built by prepare()
+        self._plans: Dict[int, Dict[str, Any]] = {}
+
+    def prepare(self, compiled_game: Dict[str, Any]) -> Dict[str, Any]:
+        """Index a game's live patterns and stack their embeddings.
+
+        Patterns are static per compiled game, so they are embedded once (in
+        one batch) and stored as an L2-normalized (P, D) float32 matrix. Each
+        match() then scores the input against every pattern with one GEMV.
+        The plan is cached per game object.
+
+        Each move also gets a union of its pattern regexes so moves that
+        cannot match are rejected with one regex scan.
+
+        Returns:
+            Plan dict with "rows" (row -> (move_id, pattern)), "row_of"
+            (id(pattern) -> row), "span" (id(move) -> (start, stop) rows),
+            "live" (id(move) -> flattened pattern entries), "union"
+            (id(move) -> prefilter regex), "pat_mat" (None without
+            embeddings) and per-row "strict"/"fuzzy" masks
+        """
+        plan = self._plans.get(id(compiled_game))
+        if plan is not None and plan["game"] is compiled_game:
+            return plan
+
+        rows = []
+        row_of = {}
+        span = {}
+        entries = {}
+        union = {}
+        for mv in compiled_game["moves"]:
+            live = _live_patterns(mv)
+            start = len(rows)
+            for pat in live:
+                row_of[id(pat)] = len(rows)
+                rows.append((mv["id"], pat))
+            span[id(mv)] = (start, len(rows))
+            entries[id(mv)] = tuple(
+                _pattern_entry(pat, start + i) for i, pat in enumerate(live)
+            )
+            union[id(mv)] = union_regex(live)
+
+        pat_mat = None
+        if self.emb.enabled and rows:
+            vecs = self.emb.embed_many([pat["text"] for _, pat in rows])
+            # A failed API call flips the client to offline mode mid-batch
+            if self.emb.enabled:
+                pat_mat = np.vstack(vecs).astype(np.float32)
+                norms = np.linalg.norm(pat_mat, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                pat_mat /= norms
+
+        pat_gpu = None
+        if pat_mat is not None and self.device and pat_mat.size >= self.GPU_MIN_ELEMENTS:
+            pat_gpu = self._to_device(pat_mat)
+
+        mods = [pat.get("mods", []) for _, pat in rows]
+        strict = np.array(["strict" in m for m in mods], dtype=bool)
+        fuzzy = np.array(["fuzzy" in m for m in mods], dtype=bool) & ~strict
+
+        plan = {
+            "game": compiled_game,
+            "rows": rows,
+            "row_of": row_of,
+            "span": span,
+            "live": entries,
+            "union": union,
+            "pat_mat": pat_mat,
+            "pat_gpu": pat_gpu,
+            "strict": strict,
+            "fuzzy": fuzzy
+        }
+        if len(self._plans) >= self.PLAN_CACHE_SIZE:
+            self._plans.clear()  # reloaded games must not pin old plans
+        self._plans[id(compiled_game)] = plan
+        return plan
+
+    def _semantic(self, text: str, pat: Dict[str, Any], state: Dict[str, Any]) -> float:
+        """Semantic score of text vs pat, computing per-input work on first use.
+
+        state is per match() call: the input is embedded and scored against
+        the pattern matrix (or tokenized, offline) only when the first
+        pattern actually needs a semantic score. If match() recorded the
+        candidate rows (moves that passed the regex prefilter), only those
+        rows are scored.
+        """
+        if self.emb.enabled:
+            sims = self._sims(text, state)
+            if sims is not None:
+                return min(1.0, 0.4 + 0.6 * float(sims[state["plan"]["row_of"][id(pat)]]))
+            if self.emb.enabled:
+                return min(1.0, 0.4 + 0.6 * cosine(self.emb.embed(text), self.emb.embed(pat["text"]), normalized=True))
+
+        tokens = state.get("tokens")
+        if tokens is None:
+            tokens = state["tokens"] = _tokens(text)
+        return _token_set_overlap(tokens, _pattern_tokens(pat))
+
+    def _sims(self, text: str, state: Dict[str, Any]) -> np.ndarray | None:
+        """Per-row cosine of text against the plan's pattern matrix (cached in state)."""
+        if "sims" not in state:
+            state["sims"] = None
+            plan = state.get("plan")
+            if self.emb.enabled and plan is not None and plan["pat_mat"] is not None:
+                text_vec = state.get("text_vec")  # pre-embedded by match_batch
+                if text_vec is None:
+                    text_vec = self.emb.embed(text)
+                text_vec = _l2_normalize(text_vec)
+                if self.emb.enabled:
+                    if plan.get("pat_gpu") is not None:
+                        state["sims"] = self._score_rows_gpu(plan["pat_gpu"], text_vec)
+                    else:
+                        state["sims"] = self._score_rows(
+                            plan["pat_mat"], text_vec, state.get("candidates")
+                        )
+        return state["sims"]
+
+    def _to_device(self, pat_mat: np.ndarray):
+        """Copy the pattern matrix to self.device as float16, or None without torch."""
+        try:
+            import torch
+        except ImportError:
+            warnings.warn(
+                f"LGDL matcher device '{self.device}' requested but torch is not installed; "
+                "scoring on CPU",
+                RuntimeWarning
+            )
+            return None
+        return torch.from_numpy(pat_mat).half().to(self.device)
+
+    def _score_rows_gpu(self, pat_gpu, text_vec: np.ndarray) -> np.ndarray:
+        """GEMV of the device-resident pattern matrix against text_vec."""
+        import torch
+
+        text_t = torch.from_numpy(text_vec).half().to(pat_gpu.device)
+        sims = (pat_gpu @ text_t).float().cpu().numpy()
+        return np.clip(sims, 0.0, 1.0)
 
-    def _apply_patterns(self, text: str, move: Dict[str, Any]) -> Tuple[float, Dict[str, Any], str]:
+    def _matrix_scores(self, text: str, state: Dict[str, Any]) -> np.ndarray | None:
+        """Final score of every pattern row for a regex hit, in one NumPy pass.
+
+        Blends the semantic scores with the regex base score (0.75 for any
+        hit) using the plan's strict/fuzzy masks, mirroring the scalar
+        formulas in _apply_patterns. None when there is no pattern matrix.
+        """
+        if "scores" not in state:
+            state["scores"] = None
+            sims = self._sims(text, state)
+            if sims is not None:
+                plan = state["plan"]
+                base = 0.75
+                sem = np.minimum(1.0, 0.4 + 0.6 * sims)
+                default = np.maximum(base, 0.7 * sem + 0.3 * base)
+                state["scores"] = np.where(
+                    plan["strict"], np.maximum(0.92, sem),
+                    np.where(plan["fuzzy"], sem, default)
+                )
+        return state["scores"]
+
+    @staticmethod
+    def _score_rows(pat_mat: np.ndarray, text_vec: np.ndarray, candidates) -> np.ndarray:
+        """Clipped cosine of text_vec against pat_mat rows.
+
+        With a candidate row index covering less than half of the matrix,
+        only those rows are gathered and multiplied; other rows score 0.
+        """
+        if candidates is None or 2 * len(candidates) >= len(pat_mat):
+            return np.clip(pat_mat @ text_vec, 0.0, 1.0)
+        sims = np.zeros(len(pat_mat), dtype=np.float32)
+        sims[candidates] = np.clip(pat_mat[candidates] @ text_vec, 0.0, 1.0)
+        return sims
+
+    def _apply_patterns(
+        self,
+        text: str,
+        move: Dict[str, Any],
+        state: Dict[str, Any] = None,
+        union: re.Pattern = None
+    ) -> Tuple[float, Dict[str, Any], str]:
         best = (0.0, {}, "")
-        for trig in move["triggers"]:
-            if trig["participant"] not in ("user","assistant"):
+        if union is not None and not union.search(text):
+            return best
+        if state is None:
+            state = {}
+        plan = state.get("plan")
+        live = plan["live"].get(id(move)) if plan is not None else None
+        if live is None:
+            live = [_pattern_entry(pat, None) for pat in _live_patterns(move)]
+        # A strict hit scores 0.92 whatever the semantics say; only compute
+        # semantics if they could lift the move over a stricter threshold.
+        strict_needs_sem = move.get("threshold", 0.0) > 0.92
+        for regex, pat, strict, fuzzy, row in live:
+            m = regex.search(text)
+            if not m:
                 continue
-            for pat in trig["patterns"]:
-                m = pat["regex"].search(text)
-                if not m:
-                    continue
-                params = {k: (v.strip() if v else v) for k, v in m.groupdict().items()}
-                base = 0.75 if m else 0.0
+            base = 0.75
+            # Upper bound on this pattern's score (sem <= 1.0); skip the
+            # semantic work when it cannot beat the current best.
+            if strict:
+                score_ub = 1.0 if strict_needs_sem else 0.92
+            elif fuzzy:
+                score_ub = 1.0
+            else:
+                score_ub = max(base, 0.7 + 0.3*base)
+            if score_ub <= best[0]:
+                continue
+            params = {k: (v.strip() if v else v) for k, v in m.groupdict().items()}
+            if strict and not strict_needs_sem:
+                score = 0.92
+            elif row is not None and self._matrix_scores(text, state) is not None:
+                score = float(state["scores"][row])
+            else:
                 # semantic via embeddings (or fallback overlap)
-                if self.emb.enabled:
-                    sim = cosine(self.emb.embed(text), self.emb.embed(pat["text"]))
-                    sem = min(1.0, 0.4 + 0.6 * sim)
-                else:
-                    sem = token_overlap(text, pat["text"])
-                mods = pat.get("mods", [])
-                if "strict" in mods:
+                sem = self._semantic(text, pat, state)
+                if strict:
                     score = max(0.92, sem)
-                elif "fuzzy" in mods:
+                elif fuzzy:
                     score = sem
                 else:
                     score = max(base, 0.7*sem + 0.3*base)
-                if score > best[0]:
-                    best = (score, params, pat["text"])
+            if score > best[0]:
+                best = (score, params, pat["text"])
         return best
 
     def match(self, text: str, compiled_game: Dict[str, Any]) -> Dict[str, Any]:
+        return self._match(text, compiled_game)
+
+    def match_batch(self, texts: List[str], compiled_game: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Match several inputs against one game, embedding them in one call.
+
+        Results are the same as calling match() on each text; the inputs'
+        embeddings are fetched together with embed_many (one cache query and
+        at most one API request) instead of one embed() per input.
+        """
+        plan = self.prepare(compiled_game)
+        vecs = [None] * len(texts)
+        if self.emb.enabled and plan["pat_mat"] is not None and texts:
+            embedded = self.emb.embed_many(texts)
+            # A failed API call flips the client to offline mode mid-batch
+            if self.emb.enabled:
+                vecs = embedded
+        return [self._match(text, compiled_game, vec) for text, vec in zip(texts, vecs)]
+
+    def _match(
+        self,
+        text: str,
+        compiled_game: Dict[str, Any],
+        text_vec: np.ndarray | None = None
+    ) -> Dict[str, Any]:
         best = None
+        plan = self.prepare(compiled_game)
+        union = plan["union"]
+        span = plan["span"]
+        HIGH = self.HIGH_EXIT
+        # Regex prefilter first, so semantic scoring only touches the
+        # pattern rows of moves that can still match.
+        candidates = []
         for mv in compiled_game["moves"]:
-            score, params, pat_text = self._apply_patterns(text, mv)
+            regex = union.get(id(mv))
+            if regex is None or regex.search(text):
+                candidates.append(mv)
+        rows = [
+            np.arange(*span[id(mv)]) for mv in candidates if id(mv) in span
+        ]
+        state = {
+            "plan": plan,
+            "candidates": np.concatenate(rows) if rows else np.zeros(0, dtype=np.intp),
+            "text_vec": text_vec
+        }
+        for mv in candidates:
+            score, params, pat_text = self._apply_patterns(text, mv, state)
             if score == 0:
                 continue
-            if score >= self.High_EXIT if False else False:  # keep constant case safe
-                pass
-            if score >= self.HIGH_EXIT:
+            if score >= HIGH:
                 return {"move": mv, "score": score, "params": params}
             if not best or score > best["score"]:
                 best = {"move": mv, "score": score, "params": params}
@@ -246,6 +871,152 @@ class TwoStageMatcher:
 # Phase 1: Context-Aware Semantic Matching
 # ============================================================================
 
+class SemanticCache:
+    """Similarity-keyed cache of LLM match results.
+
+    Near-duplicate inputs (cosine >= threshold between their embeddings)
+    reuse a stored result instead of paying for another LLM call. Entries
+    are bucketed by (game, pattern, relevant vocabulary) so a result is
+    never reused across patterns or vocabulary groundings.
+
+    Bounded to MAX_ENTRIES (least recently used bucket evicted first);
+    entries expire after ttl seconds.
+
+    ``emb`` is an EmbeddingClient or a zero-argument callable returning one,
+    resolved on first lookup so owners can keep their client lazy. Inputs
+    are embedded in a worker thread (the client may hit SQLite or the
+    network), so get/put never block the event loop.
+    """
+
+    MAX_ENTRIES = 10_000
+
+    def __init__(
+        self,
+        emb: "EmbeddingClient | Callable[[], EmbeddingClient]",
+        threshold: float = 0.95,
+        ttl: float = 3600.0
+    ):
+        self._emb = emb
+        self.threshold = threshold
+        self.ttl = ttl
+        # bucket -> {text: (vec, expires_at, result)}
+        self._buckets: "OrderedDict[Tuple, Dict[str, Tuple[np.ndarray, float, Dict[str, Any]]]]" = OrderedDict()
+        self._size = 0
+        # (text, vec) of the last input embedded; a batch looks the same
+        # input up in one bucket per pattern
+        self._last_vec: Tuple[str, np.ndarray] | None = None
+
+    @property
+    def emb(self) -> "EmbeddingClient":
+        if callable(self._emb):
+            self._emb = self._emb()
+        return self._emb
+
+    async def _embed(self, text: str) -> np.ndarray:
+        """Embedding of text, computed off the event loop."""
+        last = self._last_vec
+        if last is not None and last[0] == text:
+            return last[1]
+        vec = await asyncio.to_thread(self.emb.embed, text)
+        self._last_vec = (text, vec)
+        return vec
+
+    async def get(self, bucket: Tuple, text: str) -> Dict[str, Any] | None:
+        """Stored result for the most similar cached text in bucket, if similar enough."""
+        entries = self._buckets.get(bucket)
+        if not entries:
+            return None
+        self._buckets.move_to_end(bucket)
+        hit = entries.get(text)
+        now = time.monotonic()
+        if hit is not None and hit[1] > now:
+            return hit[2]
+
+        vec = await self._embed(text)
+        best, best_sim = None, self.threshold
+        for key, (cached_vec, expires_at, result) in list(entries.items()):
+            if expires_at <= now:
+                del entries[key]
+                self._size -= 1
+                continue
+            sim = cosine(vec, cached_vec, normalized=True)
+            if sim >= best_sim:
+                best, best_sim = result, sim
+        return best
+
+    async def put(self, bucket: Tuple, text: str, result: Dict[str, Any]):
+        """Store result for text in bucket."""
+        vec = await self._embed(text)
+        entries = self._buckets.setdefault(bucket, {})
+        self._buckets.move_to_end(bucket)
+        if text not in entries:
+            self._size += 1
+        entries[text] = (vec, time.monotonic() + self.ttl, result)
+        while self._size > self.MAX_ENTRIES:
+            oldest = next(iter(self._buckets))
+            old_entries = self._buckets[oldest]
+            if old_entries:
+                old_entries.pop(next(iter(old_entries)))
+                self._size -= 1
+            if not old_entries:
+                del self._buckets[oldest]
+
+
+# LLM prompt templates (fixed structure; optional blocks are pre-joined)
+_SYSTEM_PROMPT_TEMPLATE = (
+    'You are evaluating pattern matching for "{game_name}".{purpose}{vocabulary}\n'
+    "\nConsider:\n"
+    "1. Semantic similarity (do they mean the same thing?)\n"
+    "2. Vocabulary mappings (synonyms and related terms)\n"
+    "3. Conversation context (what makes sense given history?)\n"
+    "\nConfidence scale:\n"
+    "- 0.0-0.3: Very different meaning\n"
+    "- 0.3-0.5: Related but not matching\n"
+    "- 0.5-0.7: Likely match with ambiguity\n"
+    "- 0.7-0.9: Strong match with variation\n"
+    "- 0.9-1.0: Essentially same meaning"
+)
+
+_PATTERN_TASK_TEMPLATE = (
+    '\nPattern: "{pattern}"\n'
+    'User said: "{text}"\n'
+    "\nRate how well the user's input matches the pattern (0.0-1.0)."
+)
+
+_BATCH_TASK_TEMPLATE = (
+    "\nCandidate patterns:\n"
+    "{candidates}"
+    'User said: "{text}"\n'
+    "\nRate how well the user's input matches EACH candidate pattern "
+    "(0.0-1.0), independently."
+)
+
+
+@lru_cache(maxsize=None)
+def _batch_schema(n: int) -> Dict[str, Any]:
+    """Response schema for scoring n numbered patterns (shared, never mutated)."""
+    return {
+        "matches": {
+            "type": "array",
+            "description": (
+                "One object per candidate pattern: "
+                "{\"id\": candidate number, \"confidence\": 0.0-1.0, "
+                "\"reasoning\": brief explanation}"
+            ),
+            "minItems": n,
+            "maxItems": n,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                    "reasoning": {"type": "string"}
+                }
+            }
+        }
+    }
+
+
 class LLMSemanticMatcher:
     """Context-aware LLM semantic matcher using game vocabulary.
 
@@ -262,13 +1033,41 @@ class LLMSemanticMatcher:
     Latency: ~200ms per match
     """
 
-    def __init__(self, llm_client):
+    # Most candidate patterns scored by one batched LLM call
+    BATCH_SIZE = 25
+    # System prompts kept (least recently used evicted first)
+    SYSTEM_PROMPT_CACHE_SIZE = 64
+
+    # Response schema for single-pattern scoring (shared, never mutated)
+    RESPONSE_SCHEMA = {
+        "confidence": {
+            "type": "number",
+            "minimum": 0.0,
+            "maximum": 1.0,
+            "description": "How well user input matches pattern"
+        },
+        "reasoning": {
+            "type": "string",
+            "description": "Brief explanation (1-2 sentences)"
+        }
+    }
+
+    def __init__(self, llm_client, cache: SemanticCache = None, max_concurrency: int = 8):
         """Initialize LLM semantic matcher.
 
         Args:
             llm_client: LLMClient instance for completions
+            cache: Optional SemanticCache consulted before each LLM call
+            max_concurrency: Most LLM requests in flight at once (provider
+                rate limits)
         """
         self.llm = llm_client
+        self.cache = cache
+        self._limit = asyncio.Semaphore(max_concurrency)
+        # (game_name, description, id(vocabulary)) -> (vocabulary, system prompt)
+        self._system_prompts: "OrderedDict[Tuple, Tuple[Dict[str, List[str]], str]]" = OrderedDict()
+        # (context, vocabulary, key, prefix) for the last _turn_prefix call
+        self._turn_memo: Tuple | None = None
 
     async def match(
         self,
@@ -286,32 +1085,35 @@ class LLMSemanticMatcher:
         Returns:
             Dict with confidence, reasoning, and metadata
         """
+        bucket = None
+        if self.cache is not None:
+            vocab_terms = tuple(sorted(context.get_relevant_vocabulary(text)))
+            bucket = (context.game_name, pattern, vocab_terms)
+            cached = await self.cache.get(bucket, text)
+            if cached is not None:
+                return {**cached, "cost": 0.0, "stage": "llm_semantic_cached"}
+
         # Build context-rich prompt
-        prompt = self._build_prompt(text, pattern, context)
+        system_prompt, prompt = self._build_prompt(text, pattern, context)
 
         # Call LLM with structured output
         try:
-            result = await self.llm.complete(
+            result = await self._complete(
                 prompt=prompt,
-                response_schema={
-                    "confidence": {
-                        "type": "number",
-                        "minimum": 0.0,
-                        "maximum": 1.0,
-                        "description": "How well user input matches pattern"
-                    },
-                    "reasoning": {
-                        "type": "string",
-                        "description": "Brief explanation (1-2 sentences)"
-                    }
-                },
+                system_prompt=system_prompt,
+                response_schema=self.RESPONSE_SCHEMA,
                 max_tokens=100,
                 temperature=0.0
             )
 
+            confidence = result.content.get("confidence", 0.0)
+            reasoning = result.content.get("reasoning", "")
+            if bucket is not None:
+                await self.cache.put(bucket, text, {"confidence": confidence, "reasoning": reasoning})
+
             return {
-                "confidence": result.content.get("confidence", 0.0),
-                "reasoning": result.content.get("reasoning", ""),
+                "confidence": confidence,
+                "reasoning": reasoning,
                 "cost": result.cost,
                 "stage": "llm_semantic"
             }
@@ -325,12 +1127,120 @@ class LLMSemanticMatcher:
                 "stage": "llm_semantic_error"
             }
 
+    async def _complete(self, **kwargs):
+        """self.llm.complete, bounded by the concurrency limit."""
+        async with self._limit:
+            return await self.llm.complete(**kwargs)
+
+    async def match_batch(
+        self,
+        text: str,
+        patterns: List[str],
+        context: "MatchingContext"
+    ) -> List[Dict[str, Any]]:
+        """Match text against several patterns with batched LLM calls.
+
+        Candidates are numbered in the prompt and the LLM returns one
+        {id, confidence, reasoning} entry per candidate. Patterns answered
+        by the semantic cache are not sent; the rest go out in batches of
+        BATCH_SIZE, issued concurrently.
+
+        Args:
+            text: User input text
+            patterns: Patterns to match against
+            context: Rich matching context (vocabulary, history, etc.)
+
+        Returns:
+            One result dict per pattern (same shape as match()), in order
+        """
+        results: List[Dict[str, Any]] = [None] * len(patterns)
+        buckets = [None] * len(patterns)
+        if self.cache is not None:
+            vocab_terms = tuple(sorted(context.get_relevant_vocabulary(text)))
+            for i, pattern in enumerate(patterns):
+                buckets[i] = (context.game_name, pattern, vocab_terms)
+                cached = await self.cache.get(buckets[i], text)
+                if cached is not None:
+                    results[i] = {**cached, "cost": 0.0, "stage": "llm_semantic_cached"}
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        chunks = [
+            pending[start:start + self.BATCH_SIZE]
+            for start in range(0, len(pending), self.BATCH_SIZE)
+        ]
+        scored = await asyncio.gather(*(
+            self._score_batch(text, [patterns[i] for i in chunk], context)
+            for chunk in chunks
+        ))
+        for chunk, chunk_results in zip(chunks, scored):
+            for i, result in zip(chunk, chunk_results):
+                if buckets[i] is not None and result["stage"] == "llm_semantic":
+                    await self.cache.put(
+                        buckets[i], text,
+                        {"confidence": result["confidence"], "reasoning": result["reasoning"]}
+                    )
+                results[i] = result
+        return results
+
+    async def _score_batch(
+        self,
+        text: str,
+        patterns: List[str],
+        context: "MatchingContext"
+    ) -> List[Dict[str, Any]]:
+        """Score patterns against text with one LLM call (no caching)."""
+        system_prompt, prompt = self._build_batch_prompt(text, patterns, context)
+        try:
+            result = await self._complete(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                response_schema=_batch_schema(len(patterns)),
+                max_tokens=60 * len(patterns),
+                temperature=0.0
+            )
+        except Exception as e:
+            return [
+                {
+                    "confidence": 0.0,
+                    "reasoning": f"LLM error: {str(e)}",
+                    "cost": 0.0,
+                    "stage": "llm_semantic_error"
+                }
+                for _ in patterns
+            ]
+
+        by_id = {}
+        for entry in result.content.get("matches") or []:
+            if isinstance(entry, dict) and isinstance(entry.get("id"), int):
+                by_id[entry["id"]] = entry
+        # The call's cost is attributed to the first pattern
+        results = []
+        cost = result.cost
+        for n in range(1, len(patterns) + 1):
+            entry = by_id.get(n)
+            if entry is None:
+                results.append({
+                    "confidence": 0.0,
+                    "reasoning": "No score returned for pattern",
+                    "cost": cost,
+                    "stage": "llm_semantic_error"
+                })
+            else:
+                results.append({
+                    "confidence": float(entry.get("confidence", 0.0)),
+                    "reasoning": entry.get("reasoning", ""),
+                    "cost": cost,
+                    "stage": "llm_semantic"
+                })
+            cost = 0.0
+        return results
+
     def _build_prompt(
         self,
         text: str,
         pattern: str,
         context: "MatchingContext"
-    ) -> str:
+    ) -> Tuple[str, str]:
         """Build context-rich prompt for LLM matching.
 
         Args:
@@ -339,21 +1249,105 @@ class LLMSemanticMatcher:
             context: Matching context
 
         Returns:
-            Formatted prompt string
+            (system_prompt, user_prompt): the per-game static part and the
+            per-call part
         """
-        sections = []
+        # The matching task (the only part that varies per pattern)
+        task = _PATTERN_TASK_TEMPLATE.format(pattern=pattern, text=text)
+
+        return self._system_prompt(context), self._turn_prefix(text, context) + task
+
+    def _build_batch_prompt(
+        self,
+        text: str,
+        patterns: List[str],
+        context: "MatchingContext"
+    ) -> Tuple[str, str]:
+        """Build one prompt that asks for a score per numbered pattern.
+
+        Args:
+            text: User input
+            patterns: Candidate patterns (numbered from 1 in the prompt)
+            context: Matching context
+
+        Returns:
+            (system_prompt, user_prompt), as for _build_prompt
+        """
+        # The matching task
+        task = _BATCH_TASK_TEMPLATE.format(
+            candidates="".join(
+                f'  {n}. "{pattern}"\n' for n, pattern in enumerate(patterns, start=1)
+            ),
+            text=text
+        )
+
+        return self._system_prompt(context), self._turn_prefix(text, context) + task
+
+    def _system_prompt(self, context: "MatchingContext") -> str:
+        """Static prompt header for a game: identity, vocabulary and scoring scale.
+
+        It is identical on every call for a game, so providers can reuse their
+        prefix cache for it, and it is formatted once per game and vocabulary.
+        """
+        key = (context.game_name, context.game_description, id(context.vocabulary))
+        cached = self._system_prompts.get(key)
+        if cached is not None and cached[0] is context.vocabulary:
+            self._system_prompts.move_to_end(key)
+            return cached[1]
 
         # Game context
-        sections.append(f'You are evaluating pattern matching for "{context.game_name}".')
+        purpose = ""
         if context.game_description:
-            sections.append(f"Game purpose: {context.game_description}")
+            purpose = f"\nGame purpose: {context.game_description}"
+
+        # Vocabulary context (whole game vocabulary)
+        vocabulary = ""
+        if context.vocabulary:
+            vocabulary = "\n\nVocabulary:\n" + "\n".join(
+                f"  - '{term}' also means: {', '.join(synonyms)}"
+                for term, synonyms in context.vocabulary.items()
+            )
+
+        prompt = _SYSTEM_PROMPT_TEMPLATE.format(
+            game_name=context.game_name,
+            purpose=purpose,
+            vocabulary=vocabulary
+        )
+        self._system_prompts[key] = (context.vocabulary, prompt)
+        self._system_prompts.move_to_end(key)
+        if len(self._system_prompts) > self.SYSTEM_PROMPT_CACHE_SIZE:
+            self._system_prompts.popitem(last=False)
+        return prompt
+
+    def _turn_prefix(self, text: str, context: "MatchingContext") -> str:
+        """Per-turn part of the user prompt, ending in a newline if non-empty.
+
+        Every pattern scored in a turn shares the same input and context, so
+        the last prefix is memoized and reused until the input, history or
+        successful patterns change.
+        """
+        key = (
+            text,
+            tuple((turn["role"], turn["content"]) for turn in context.get_recent_history(max_turns=3)),
+            tuple(context.get_recent_patterns(max_patterns=3)),
+        )
+        memo = self._turn_memo
+        if memo is not None and memo[0] is context and memo[1] is context.vocabulary and memo[2] == key:
+            return memo[3]
+
+        sections = self._turn_sections(text, context)
+        prefix = "\n".join(sections) + "\n" if sections else ""
+        self._turn_memo = (context, context.vocabulary, key, prefix)
+        return prefix
+
+    def _turn_sections(self, text: str, context: "MatchingContext") -> List[str]:
+        """Per-call prompt sections: vocabulary hits and conversation state."""
+        sections = []
 
-        # Vocabulary context (only relevant terms)
+        # Vocabulary terms that occur in this input
         relevant_vocab = context.get_relevant_vocabulary(text)
         if relevant_vocab:
-            sections.append("\nVocabulary:")
-            for term, synonyms in relevant_vocab.items():
-                sections.append(f"  - '{term}' also means: {', '.join(synonyms)}")
+            sections.append(f"Vocabulary terms in this input: {', '.join(relevant_vocab)}")
 
         # Conversation history
         if context.has_history():
@@ -366,27 +1360,10 @@ class LLMSemanticMatcher:
         # Successful patterns
         if context.successful_patterns:
             sections.append("\nRecently successful patterns:")
-            for pat in context.successful_patterns[-3:]:
+            for pat in context.get_recent_patterns(max_patterns=3):
                 sections.append(f"  - \"{pat}\"")
 
-        # The matching task
-        sections.append(f'\nPattern: "{pattern}"')
-        sections.append(f'User said: "{text}"')
-
-        sections.append("\nRate how well the user's input matches the pattern (0.0-1.0).")
-        sections.append("Consider:")
-        sections.append("1. Semantic similarity (do they mean the same thing?)")
-        sections.append("2. Vocabulary mappings (synonyms and related terms)")
-        sections.append("3. Conversation context (what makes sense given history?)")
-
-        sections.append("\nConfidence scale:")
-        sections.append("- 0.0-0.3: Very different meaning")
-        sections.append("- 0.3-0.5: Related but not matching")
-        sections.append("- 0.5-0.7: Likely match with ambiguity")
-        sections.append("- 0.7-0.9: Strong match with variation")
-        sections.append("- 0.9-1.0: Essentially same meaning")
-
-        return "\n".join(sections)
+        return sections
 
 
 class CascadeMatcher:
@@ -407,6 +1384,13 @@ class CascadeMatcher:
     Average cost: ~$0.0015/turn (vs $0.01 if always using LLM)
     """
 
+    # When the input contains no vocabulary terms, only moves scoring at least
+    # this on stages 1-2 are sent to the LLM
+    LLM_GATE_SCORE = 0.5
+    # Games whose pattern matrix / lexical index are kept before each
+    # identity cache is reset
+    GAME_CACHE_SIZE = 16
+
     def __init__(self, config):
         """Initialize cascade matcher.
 
@@ -418,7 +1402,12 @@ class CascadeMatcher:
             ImportError: If LLM enabled but OpenAI package not installed
         """
         self.config = config
-        self.emb = EmbeddingClient()
+        self._emb = None  # built on first use (see emb)
+        # id(compiled_game) -> (game, {id(pattern): row}, (P, D) pattern matrix)
+        self._pattern_mats: Dict[int, Tuple[Dict[str, Any], Dict[int, int], np.ndarray]] = {}
+        # id(compiled_game) -> (game, live patterns, RE2 set or None,
+        #                      per-move (indexed union, live patterns) without RE2)
+        self._lexical_sets: Dict[int, Tuple] = {}
 
         # Initialize LLM matcher if enabled
         if config.enable_llm_semantic_matching:
@@ -437,7 +1426,14 @@ class CascadeMatcher:
                 model=config.openai_llm_model,
                 allow_mock_fallback=False  # Fail explicitly, no guessing
             )
-            self.llm_matcher = LLMSemanticMatcher(llm_client)
+            self.llm_matcher = LLMSemanticMatcher(
+                llm_client,
+                cache=SemanticCache(
+                    lambda: self.emb,  # keep the embedding client lazy
+                    threshold=config.llm_cache_similarity,
+                    ttl=config.llm_cache_ttl
+                )
+            )
 
             print(f"[LLM] Context-aware semantic matching ENABLED")
             print(f"[LLM] Model: {config.openai_llm_model}")
@@ -447,53 +1443,183 @@ class CascadeMatcher:
             self.llm_matcher = None
             print("[LLM] Context-aware semantic matching DISABLED (using embeddings only)")
 
+    @property
+    def emb(self) -> EmbeddingClient:
+        """Embedding client, created on first use.
+
+        Turns that stop at the lexical stage never touch embeddings, so
+        lexical-only workloads don't pay for the client or its cache.
+        """
+        if self._emb is None:
+            self._emb = EmbeddingClient()
+        return self._emb
+
     def _lexical_match(
         self,
         text: str,
-        move: Dict[str, Any]
+        move: Dict[str, Any],
+        hits: FrozenSet[int] = None
     ) -> Tuple[float, Dict[str, Any], str]:
         """Stage 1: Lexical (regex) matching.
 
         Args:
             text: User input
             move: Compiled move definition
+            hits: id()s of candidate patterns from _lexical_hits (found by
+                one scan of ``text``); only those are re-run for
+                parameters. None scans every pattern.
 
         Returns:
             (confidence, params, pattern_text)
         """
-        best = (0.0, {}, "")
-
         for trig in move["triggers"]:
             if trig["participant"] not in ("user", "assistant"):
                 continue
 
             for pat in trig["patterns"]:
+                if hits is not None and id(pat) not in hits:
+                    continue
                 m = pat["regex"].search(text)
                 if m:
                     params = {k: (v.strip() if v else v) for k, v in m.groupdict().items()}
-                    # Exact regex match gets high confidence
-                    confidence = 0.85 if m else 0.0
+                    # Every regex hit scores the same, so the first one wins
+                    return (0.85, params, pat["text"])
 
-                    if confidence > best[0]:
-                        best = (confidence, params, pat["text"])
+        return (0.0, {}, "")
 
-        return best
+    def _lexical_hits(
+        self,
+        text: str,
+        compiled_game: Dict[str, Any]
+    ) -> FrozenSet[int] | None:
+        """id()s of the live patterns _lexical_match needs to re-run on ``text``.
+
+        The game's patterns are compiled once into an RE2 set, so one scan of
+        the input replaces a regex search per pattern per move. Without RE2,
+        each move's patterns are compiled into one indexed union regex
+        instead; its search names the leftmost-matching pattern, and only the
+        patterns before it are re-checked, so the move's first matching
+        pattern (the one _lexical_match picks) is found without a search
+        per pattern when nothing matches.
+
+        Returns:
+            Frozenset of pattern id()s (with RE2 every hit, otherwise each
+            move's first hit), or None when neither index is available
+        """
+        cached = self._lexical_sets.get(id(compiled_game))
+        if cached is None or cached[0] is not compiled_game:
+            pats = [pat for move in compiled_game["moves"] for pat in _live_patterns(move)]
+            pset = pattern_set(pats)
+            unions = None
+            if pset is None:
+                unions = []
+                for move in compiled_game["moves"]:
+                    live = _live_patterns(move)
+                    unions.append((indexed_union_regex(live), live))
+            cached = (compiled_game, pats, pset, unions)
+            if len(self._lexical_sets) >= self.GAME_CACHE_SIZE:
+                self._lexical_sets.clear()  # reloaded games must not be pinned
+            self._lexical_sets[id(compiled_game)] = cached
+        _, pats, pset, unions = cached
+        if pset is not None:
+            # Match() returns None (not an empty list) when nothing matches
+            return frozenset(id(pats[i]) for i in (pset.Match(text) or ()))
+
+        hits = set()
+        for union, live in unions:
+            if union is None:
+                hits.update(id(pat) for pat in live)  # scan them all
+                continue
+            m = union.search(text)
+            if m is None:
+                continue
+            # An earlier pattern may still match further right in the text
+            j = int(m.lastgroup[1:])
+            first = next((pat for pat in live[:j] if pat["regex"].search(text)), live[j])
+            hits.add(id(first))
+        return frozenset(hits)
+
+    def _pattern_matrix(
+        self,
+        compiled_game: Dict[str, Any]
+    ) -> Tuple[Dict[int, int], np.ndarray] | None:
+        """L2-normalized embeddings of a game's live patterns, one row each.
+
+        Pattern texts are static, so they are embedded once per game (in one
+        batch) on first use and stacked into a (P, D) float32 matrix; a turn
+        then scores the input against every pattern with one GEMV.
+
+        Returns:
+            ({id(pattern): row}, matrix), or None while embeddings are
+            disabled or the game has no live patterns
+        """
+        if not self.emb.enabled:
+            return None
+        cached = self._pattern_mats.get(id(compiled_game))
+        if cached is not None and cached[0] is compiled_game:
+            return cached[1], cached[2]
+
+        pats = [pat for move in compiled_game["moves"] for pat in _live_patterns(move)]
+        if not pats:
+            return None
+        vecs = self.emb.embed_many([pat["text"] for pat in pats])
+        # A failed API call flips the client to offline mode mid-batch
+        if not self.emb.enabled:
+            return None
+        matrix = np.vstack([_l2_normalize(vec) for vec in vecs])
+        row_of = {id(pat): row for row, pat in enumerate(pats)}
+        if len(self._pattern_mats) >= self.GAME_CACHE_SIZE:
+            self._pattern_mats.clear()  # reloaded games must not be pinned
+        self._pattern_mats[id(compiled_game)] = (compiled_game, row_of, matrix)
+        return row_of, matrix
+
+    def _embed_input(
+        self,
+        text: str,
+        compiled_game: Dict[str, Any]
+    ) -> Tuple[np.ndarray, Dict[int, float] | None]:
+        """Embed the input and score it against every pattern of the game.
+
+        Blocking (API call, SQLite cache), so match() runs it in a worker
+        thread.
+
+        Returns:
+            (text_vec, sims) where sims maps id(pattern) to its clipped
+            cosine similarity, or is None without a pattern matrix
+        """
+        plan = self._pattern_matrix(compiled_game)
+        text_vec = self.emb.embed(text)
+        sims = None
+        if plan is not None and self.emb.enabled:
+            # One GEMV scores the input against every pattern
+            row_of, matrix = plan
+            scores = np.clip(matrix @ _l2_normalize(text_vec), 0.0, 1.0).tolist()
+            sims = {pat_id: scores[row] for pat_id, row in row_of.items()}
+        return text_vec, sims
 
     def _embedding_match(
         self,
         text: str,
-        move: Dict[str, Any]
+        move: Dict[str, Any],
+        text_vec: np.ndarray = None,
+        sims: Dict[int, float] = None
     ) -> Tuple[float, Dict[str, Any], str]:
         """Stage 2: Embedding-based semantic matching.
 
         Args:
             text: User input
             move: Compiled move definition
+            text_vec: Embedding of text, if the caller already has it
+            sims: Precomputed input-vs-pattern similarities by id(pattern)
+                (see match()); other patterns are embedded on demand
 
         Returns:
             (confidence, params, pattern_text)
         """
         best = (0.0, {}, "")
+        text_tokens = None
+        if text_vec is None and self.emb.enabled and sims is None:
+            text_vec = self.emb.embed(text)
 
         for trig in move["triggers"]:
             if trig["participant"] not in ("user", "assistant"):
@@ -508,59 +1634,23 @@ class CascadeMatcher:
 
                 # Semantic similarity via embeddings
                 if self.emb.enabled:
-                    sim = cosine(self.emb.embed(text), self.emb.embed(pat["text"]))
+                    sim = sims.get(id(pat)) if sims is not None else None
+                    if sim is None:
+                        if text_vec is None:
+                            text_vec = self.emb.embed(text)
+                        sim = cosine(text_vec, self.emb.embed(pat["text"]), normalized=True)
                     confidence = min(1.0, 0.4 + 0.6 * sim)
                 else:
                     # Fallback to token overlap
-                    confidence = token_overlap(text, pat["text"])
+                    if text_tokens is None:
+                        text_tokens = _tokens(text)
+                    confidence = _token_set_overlap(text_tokens, _pattern_tokens(pat))
 
                 if confidence > best[0]:
                     best = (confidence, params, pat["text"])
 
         return best
 
-    async def _llm_match(
-        self,
-        text: str,
-        move: Dict[str, Any],
-        context: "MatchingContext"
-    ) -> Tuple[float, Dict[str, Any], str, str]:
-        """Stage 3: LLM semantic matching with context.
-
-        Args:
-            text: User input
-            move: Compiled move definition
-            context: Rich matching context
-
-        Returns:
-            (confidence, params, pattern_text, reasoning)
-        """
-        if not self.llm_matcher:
-            return (0.0, {}, "", "LLM matcher not initialized")
-
-        best = (0.0, {}, "", "")
-
-        for trig in move["triggers"]:
-            if trig["participant"] not in ("user", "assistant"):
-                continue
-
-            for pat in trig["patterns"]:
-                # Try regex for parameter extraction
-                m = pat["regex"].search(text)
-                params = {}
-                if m:
-                    params = {k: (v.strip() if v else v) for k, v in m.groupdict().items()}
-
-                # LLM semantic match with context
-                result = await self.llm_matcher.match(text, pat["text"], context)
-                confidence = result.get("confidence", 0.0)
-                reasoning = result.get("reasoning", "")
-
-                if confidence > best[0]:
-                    best = (confidence, params, pat["text"], reasoning)
-
-        return best
-
     async def match(
         self,
         text: str,
@@ -584,11 +1674,15 @@ class CascadeMatcher:
         """
         best_overall = None
         provenance = []
+        text_vec = None  # embedded once, on the first move that reaches stage 2
+        sims = None
+        hits = self._lexical_hits(text, compiled_game)
+        move_scores: Dict[int, float] = {}  # id(move) -> best stage 1/2 score
 
         # Try each move
         for move in compiled_game["moves"]:
             # Stage 1: Lexical matching
-            lex_conf, lex_params, lex_pattern = self._lexical_match(text, move)
+            lex_conf, lex_params, lex_pattern = self._lexical_match(text, move, hits)
             provenance.append(f"lexical:{move['id']}={lex_conf:.2f}")
 
             # Short-circuit if lexical is confident enough
@@ -603,7 +1697,12 @@ class CascadeMatcher:
                 }
 
             # Stage 2: Embedding matching
-            emb_conf, emb_params, emb_pattern = self._embedding_match(text, move)
+            if text_vec is None and self.emb.enabled:
+                # Embedding may block on the API; keep the event loop free
+                text_vec, sims = await asyncio.to_thread(self._embed_input, text, compiled_game)
+            emb_conf, emb_params, emb_pattern = self._embedding_match(
+                text, move, text_vec, sims
+            )
             provenance.append(f"embedding:{move['id']}={emb_conf:.2f}")
 
             # Short-circuit if embedding is confident enough
@@ -619,6 +1718,7 @@ class CascadeMatcher:
 
             # Track best so far
             best_conf = max(lex_conf, emb_conf)
+            move_scores[id(move)] = best_conf
             if not best_overall or best_conf > best_overall["score"]:
                 best_overall = {
                     "move": move,
@@ -633,13 +1733,40 @@ class CascadeMatcher:
         llm_threshold = 0.85  # If we have 0.85+ confidence from embedding, skip LLM
 
         if self.llm_matcher and context and (not best_overall or best_overall["score"] < llm_threshold):
-            for move in compiled_game["moves"]:
-                llm_conf, llm_params, llm_pattern, llm_reasoning = await self._llm_match(
-                    text, move, context
+            # Without vocabulary in the input to ground it, the LLM rarely
+            # promotes a move that scored low on stages 1-2; don't pay for it
+            if context.get_relevant_vocabulary(text):
+                gated = compiled_game["moves"]
+            else:
+                gated = [
+                    move for move in compiled_game["moves"]
+                    if move_scores.get(id(move), 0.0) >= self.LLM_GATE_SCORE
+                ]
+
+            # Score every candidate pattern of every gated move in one LLM call
+            candidates = [
+                (move, pat)
+                for move in gated
+                for pat in _live_patterns(move)
+            ]
+            results = await self.llm_matcher.match_batch(
+                text, [pat["text"] for _, pat in candidates], context
+            ) if candidates else []
+            per_move: Dict[int, Tuple[float, Dict[str, Any], str, str]] = {}
+            for (move, pat), result in zip(candidates, results):
+                confidence = result.get("confidence", 0.0)
+                if confidence > per_move.get(id(move), (0.0,))[0]:
+                    m = pat["regex"].search(text)
+                    params = {k: (v.strip() if v else v) for k, v in m.groupdict().items()} if m else {}
+                    per_move[id(move)] = (confidence, params, pat["text"], result.get("reasoning", ""))
+
+            for move in gated:
+                llm_conf, llm_params, llm_pattern, llm_reasoning = per_move.get(
+                    id(move), (0.0, {}, "", "")
                 )
                 provenance.append(f"llm:{move['id']}={llm_conf:.2f}")
 
-                if llm_conf > best_overall["score"]:
+                if llm_conf > (best_overall["score"] if best_overall else 0.0):
                     best_overall = {
                         "move": move,
                         "score": llm_conf,
@@ -649,7 +1776,7 @@ class CascadeMatcher:
                         "reasoning": llm_reasoning
                     }
 
-                    # Early exit if we get very confident match
+                    # First very confident move wins (as when scored move by move)
                     if llm_conf >= 0.90:
                         break
 
@@ -5,11 +5,80 @@ Provides rich contextual information to semantic matchers for grounded matching.
 Includes game vocabulary, conversation history, filled slots, and successful patterns.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
-
-
-@dataclass
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional
+
+# Optional Aho-Corasick automaton for vocabulary lookup (one pass over the text)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Turns / successful patterns retained by add_turn and add_successful_pattern
+MAX_RECENT = 10
+
+# Vocabularies whose lookup index is kept before the identity cache is reset
+VOCAB_INDEX_CACHE_SIZE = 64
+
+# id(vocabulary) -> (vocabulary, index, memo); shared by every context over
+# the same vocabulary (a compiled game's), since contexts are rebuilt per turn.
+# memo is [text, relevant] from the last get_relevant_vocabulary call.
+_vocab_indexes: Dict[int, tuple] = {}
+
+
+def _vocabulary_index(vocabulary: Dict[str, List[str]]):
+    """Lowercased vocabulary words, plus an Aho-Corasick automaton over them.
+
+    Built once per vocabulary object and shared through _vocab_indexes
+    (the entry holds the vocabulary, so its id is not reused while cached).
+    With pyahocorasick installed, each word maps to the vocabulary positions
+    of the terms it belongs to.
+
+    Returns:
+        ((lowered, automaton, always, words), memo): [(term, lowercased
+        words)] in vocabulary order, the automaton (None without
+        pyahocorasick or words), positions of terms that always match, the
+        distinct lowercased words of all terms as one frozenset, and the
+        vocabulary's [text, relevant] memo
+    """
+    cached = _vocab_indexes.get(id(vocabulary))
+    if cached is not None and cached[0] is vocabulary:
+        return cached[1], cached[2]
+
+    lowered = [
+        (term, tuple(word.lower() for word in [term, *synonyms]))
+        for term, synonyms in vocabulary.items()
+    ]
+    automaton = None
+    always = []
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for i, (_, words) in enumerate(lowered):
+            for word in words:
+                if not word:
+                    always.append(i)  # "" occurs in every text
+                    continue
+                positions = automaton.get(word, ())
+                if i not in positions:
+                    automaton.add_word(word, positions + (i,))
+        if len(automaton):
+            automaton.make_automaton()
+        else:
+            automaton = None
+
+    words = frozenset(word for _, term_words in lowered for word in term_words)
+    index = (lowered, automaton, always, words)
+    memo = [None, None]
+    if len(_vocab_indexes) >= VOCAB_INDEX_CACHE_SIZE:
+        _vocab_indexes.clear()  # vocabularies of replaced games must not pile up
+    _vocab_indexes[id(vocabulary)] = (vocabulary, index, memo)
+    return index, memo
+
+
+@dataclass(slots=True)
 class MatchingContext:
     """Rich context for context-aware pattern matching.
 
@@ -52,11 +121,12 @@ class MatchingContext:
     Used by LLM to understand domain-specific terminology and slang.
     """
 
-    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    conversation_history: Deque[Dict[str, str]] = field(default_factory=deque)
     """Recent conversation turns for multi-turn context.
 
     Format: [{"role": "user"/"assistant", "content": "text"}, ...]
     Limited to last N turns (typically 5) to control prompt size.
+    Stored as a deque bounded to MAX_RECENT turns (lists are converted).
 
     Helps LLM understand conversational flow and references.
     """
@@ -73,15 +143,20 @@ class MatchingContext:
     current_move: Optional[str] = None
     """ID of the current move being evaluated, if any"""
 
-    successful_patterns: List[str] = field(default_factory=list)
+    successful_patterns: Deque[str] = field(default_factory=deque)
     """Recently successful pattern matches.
 
     These are patterns that led to successful task completion.
     Helps LLM learn from what has worked in the past.
 
-    Limited to last N successful patterns (typically 10).
+    Stored as a deque bounded to the last MAX_RECENT patterns.
     """
 
+    def __post_init__(self):
+        # Bounded deques evict the oldest entry on append (no slice rewrites)
+        self.conversation_history = deque(self.conversation_history, maxlen=MAX_RECENT)
+        self.successful_patterns = deque(self.successful_patterns, maxlen=MAX_RECENT)
+
     @classmethod
     def from_state(
         cls,
@@ -180,25 +255,43 @@ class MatchingContext:
         Filters vocabulary to only include terms/synonyms that appear in the text.
         This reduces prompt size for LLM calls.
 
+        The result for the most recent text is memoized per vocabulary object
+        (a turn asks for it from several places), so treat the returned dict
+        as read-only and the vocabulary as fixed once matching starts.
+
         Args:
             text: User input text to check against
 
         Returns:
             Dictionary of relevant vocabulary entries
         """
+        if not self.vocabulary:
+            return {}
+
+        (lowered, automaton, always, words), memo = _vocabulary_index(self.vocabulary)
+        if memo[0] == text:
+            return memo[1]
+
         text_lower = text.lower()
         relevant = {}
 
-        for term, synonyms in self.vocabulary.items():
-            # Check if term or any synonym appears in text
-            if term.lower() in text_lower:
-                relevant[term] = synonyms
-            else:
-                for syn in synonyms:
-                    if syn.lower() in text_lower:
-                        relevant[term] = synonyms
-                        break
-
+        if AHOCORASICK_AVAILABLE:
+            hits = set(always)
+            if automaton is not None:
+                for _, order in automaton.iter(text_lower):
+                    hits.update(order)
+            for i in sorted(hits):
+                term = lowered[i][0]
+                relevant[term] = self.vocabulary[term]
+        elif any(word in text_lower for word in words):
+            # Some word occurs (the common no-hit case ends above after
+            # one pass over the distinct words); attribute it to terms
+            for term, term_words in lowered:
+                # Check if term or any synonym appears in text
+                if any(word in text_lower for word in term_words):
+                    relevant[term] = self.vocabulary[term]
+
+        memo[:] = (text, relevant)
         return relevant
 
     def get_recent_history(self, max_turns: int = 3) -> List[Dict[str, str]]:
@@ -210,7 +303,20 @@ class MatchingContext:
         Returns:
             List of recent turns (most recent last)
         """
-        return self.conversation_history[-max_turns:]
+        history = self.conversation_history
+        return list(islice(history, max(0, len(history) - max_turns), None))
+
+    def get_recent_patterns(self, max_patterns: int = 3) -> List[str]:
+        """Get most recent successful patterns.
+
+        Args:
+            max_patterns: Maximum number of recent patterns to return
+
+        Returns:
+            List of recent patterns (most recent last)
+        """
+        patterns = self.successful_patterns
+        return list(islice(patterns, max(0, len(patterns) - max_patterns), None))
 
     def add_turn(self, role: str, content: str):
         """Add a turn to conversation history.
@@ -224,10 +330,6 @@ class MatchingContext:
             "content": content
         })
 
-        # Keep only last 10 turns to control memory
-        if len(self.conversation_history) > 10:
-            self.conversation_history = self.conversation_history[-10:]
-
     def add_filled_slot(self, slot_name: str, value: Any):
         """Add a filled slot to context.
 
@@ -245,10 +347,6 @@ class MatchingContext:
         """
         self.successful_patterns.append(pattern)
 
-        # Keep only last 10 successful patterns
-        if len(self.successful_patterns) > 10:
-            self.successful_patterns = self.successful_patterns[-10:]
-
     def to_summary(self) -> str:
         """Get human-readable summary of context.
 
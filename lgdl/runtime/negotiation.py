@@ -10,12 +10,15 @@ with three stop conditions:
 Copyright (c) 2025 Graziano Labs Corp.
 """
 
+import asyncio
+import inspect
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Callable
+from types import MappingProxyType
+from typing import Dict, Any, List, Callable, Mapping, Tuple
 from ..errors import RuntimeError as LGDLRuntimeError
 
 
-@dataclass
+@dataclass(slots=True)
 class NegotiationState:
     """
     Tracks negotiation/clarification loop progress.
@@ -59,7 +62,8 @@ class NegotiationState:
         confidence: float,
         threshold: float,
         max_rounds: int = 3,
-        stagnation_epsilon: float = 0.05
+        stagnation_epsilon: float = 0.05,
+        stagnation_window: int = 2
     ) -> tuple[bool, str | None]:
         """
         Check if negotiation should stop.
@@ -69,12 +73,14 @@ class NegotiationState:
             threshold: Target confidence threshold
             max_rounds: Maximum clarification rounds allowed
             stagnation_epsilon: Minimum delta to consider progress
+            stagnation_window: Consecutive low-delta rounds (>= 1) that
+                count as stagnation
 
         Returns:
             (should_stop, reason) where reason is:
             - "threshold_met": Confidence crossed threshold
             - "max_rounds": Hit maximum rounds
-            - "stagnation": No progress for 2 consecutive rounds
+            - "stagnation": No progress for stagnation_window consecutive rounds
             - None: Continue negotiation
         """
         # Stop condition 1: Confidence crosses threshold
@@ -85,10 +91,15 @@ class NegotiationState:
         if self.round >= max_rounds:
             return True, "max_rounds"
 
-        # Stop condition 3: Stagnation (2 consecutive low deltas)
-        if len(self.deltas) >= 2:
-            recent_deltas = self.deltas[-2:]
-            if all(abs(delta) < stagnation_epsilon for delta in recent_deltas):
+        # Stop condition 3: Stagnation (stagnation_window consecutive low
+        # deltas), checked newest first by index: no slice, stops at the
+        # first meaningful change
+        deltas = self.deltas
+        if len(deltas) >= stagnation_window:
+            for i in range(1, stagnation_window + 1):
+                if abs(deltas[-i]) >= stagnation_epsilon:
+                    break
+            else:
                 return True, "stagnation"
 
         return False, None
@@ -118,7 +129,8 @@ class NegotiationRound:
         round_num: Round number (1-indexed)
         question: Clarification question asked
         user_response: User's response to clarification
-        updated_params: Parameters dict after update
+        updated_params: Read-only parameters snapshot after update (rounds
+            that change nothing share the previous round's snapshot)
         confidence_before: Confidence before this round (∈ [0,1])
         confidence_after: Confidence after this round (∈ [0,1])
         feature_deltas: Feature contribution changes (for provenance)
@@ -126,7 +138,7 @@ class NegotiationRound:
     round_num: int
     question: str
     user_response: str
-    updated_params: Dict[str, Any]
+    updated_params: Mapping[str, Any]
     confidence_before: float
     confidence_after: float
     feature_deltas: Dict[str, float] = field(default_factory=dict)
@@ -151,6 +163,93 @@ class NegotiationResult:
     reason: str
 
 
+class MatcherBatcher:
+    """
+    Coalesces concurrent re-match requests into batched matcher calls.
+
+    Negotiation rounds from concurrent sessions submit their enriched input
+    here; requests pending within max_wait seconds (or max_batch of them)
+    are matched together with matcher.match_batch, so the inputs are
+    embedded in one call. The batch runs in a worker thread, so embedding
+    I/O never blocks other turns. Matchers without match_batch (e.g. the
+    async CascadeMatcher) are called directly, awaiting coroutine results.
+    """
+
+    def __init__(self, max_batch: int = 16, max_wait: float = 0.005):
+        """
+        Initialize batcher.
+
+        Args:
+            max_batch: Pending requests that trigger an immediate flush
+            max_wait: Seconds to wait for more requests before flushing
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Any, str, dict, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Running batch tasks (referenced so they are not garbage collected)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, matcher, text: str, compiled_game: dict) -> dict:
+        """
+        Match text against compiled_game, batched with other pending requests.
+
+        Args:
+            matcher: Matcher instance (batched if it has match_batch)
+            text: Input to match
+            compiled_game: Compiled game IR
+
+        Returns:
+            The matcher's result for text
+        """
+        if not hasattr(matcher, "match_batch"):
+            result = matcher.match(text, compiled_game)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((matcher, text, compiled_game, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        """Start matching every pending request, one batch task per (matcher, game)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+
+        groups: Dict[Tuple[int, int], List[Tuple[Any, str, dict, asyncio.Future]]] = {}
+        for item in pending:
+            groups.setdefault((id(item[0]), id(item[2])), []).append(item)
+
+        for items in groups.values():
+            task = asyncio.get_running_loop().create_task(self._run_batch(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, items: List[Tuple[Any, str, dict, asyncio.Future]]):
+        """Run one match_batch call off the event loop and resolve its futures."""
+        matcher, _, compiled_game, _ = items[0]
+        try:
+            results = await asyncio.to_thread(
+                matcher.match_batch, [text for _, text, _, _ in items], compiled_game
+            )
+        except Exception as e:
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (*_, future), result in zip(items, results):
+            if not future.done():  # submitter may have been cancelled
+                future.set_result(result)
+
+
 class NegotiationLoop:
     """
     Implements clarification loop with confidence re-evaluation.
@@ -161,6 +260,9 @@ class NegotiationLoop:
     3. No information gain (Δconf < epsilon for 2 consecutive rounds) → failure
     """
 
+    # Moves whose clarify action is kept before the identity cache is reset
+    CLARIFY_CACHE_SIZE = 1024
+
     def __init__(self, max_rounds: int = 3, epsilon: float = 0.05):
         """
         Initialize negotiation loop.
@@ -171,6 +273,10 @@ class NegotiationLoop:
         """
         self.max_rounds = max_rounds
         self.epsilon = epsilon
+        # id(move) -> (move, clarify action data or None); move IR is immutable
+        self._clarify_cache: Dict[int, Tuple[dict, dict | None]] = {}
+        # Re-matches from concurrent negotiations share embedding calls
+        self.batcher = MatcherBatcher()
 
     async def clarify_until_confident(
         self,
@@ -188,7 +294,7 @@ class NegotiationLoop:
             move: Move IR with clarify action
             initial_input: Original user input
             initial_match: Initial match result from matcher
-            matcher: TwoStageMatcher instance for re-matching
+            matcher: Matcher for re-matching (TwoStageMatcher or CascadeMatcher)
             compiled_game: Compiled game IR
             ask_user: Async function to prompt user (question, options) -> response
 
@@ -198,45 +304,43 @@ class NegotiationLoop:
         Raises:
             LGDLRuntimeError: If no clarify action found (E200)
         """
-        state = NegotiationState()
         rounds = []
         params = initial_match["params"].copy()
+        snapshot = MappingProxyType(dict(params))
         confidence = initial_match["score"]
         threshold = move["threshold"]
         no_gain_count = 0  # Track consecutive rounds with no gain
 
-        for round_num in range(1, self.max_rounds + 1):
-            state.round = round_num
-
-            # Extract clarification action from move
-            clarify_action = self._find_clarify_action(move)
-            if not clarify_action:
-                raise LGDLRuntimeError(
-                    code="E200",
-                    message=f"Negotiation requested but no clarify action found in move '{move['id']}'",
-                    hint="Add 'if uncertain {{ ask for clarification: \"...\" }}' block to move"
-                )
+        # Extract clarification action from move (same for every round)
+        clarify_action = self._find_clarify_action(move)
+        if not clarify_action:
+            raise LGDLRuntimeError(
+                code="E200",
+                message=f"Negotiation requested but no clarify action found in move '{move['id']}'",
+                hint="Add 'if uncertain {{ ask for clarification: \"...\" }}' block to move"
+            )
 
-            question = clarify_action.get("question", "Can you clarify?")
-            options = clarify_action.get("options", [])
-            param_name = clarify_action.get("param_name")
+        question = clarify_action.get("question", "Can you clarify?")
+        options = clarify_action.get("options", [])
+        param_name = clarify_action.get("param_name")
 
+        for round_num in range(1, self.max_rounds + 1):
             # Ask user
             user_response = await ask_user(question, options)
-            state.history.append((question, user_response))
 
             # Record confidence before update
             confidence_before = confidence
 
             # Update parameters
-            if param_name:
+            if param_name and (param_name not in snapshot or snapshot[param_name] != user_response):
                 params[param_name] = user_response
+                snapshot = MappingProxyType({**snapshot, param_name: user_response})
 
             # Reconstruct enriched input
             enriched_input = self._enrich_input(initial_input, params)
 
             # Re-run matcher on enriched input
-            new_match = matcher.match(enriched_input, compiled_game)
+            new_match = await self.batcher.submit(matcher, enriched_input, compiled_game)
             confidence_after = new_match["score"]
 
             # Calculate feature deltas (if provenance available)
@@ -250,7 +354,7 @@ class NegotiationLoop:
                 round_num=round_num,
                 question=question,
                 user_response=user_response,
-                updated_params=params.copy(),
+                updated_params=snapshot,
                 confidence_before=confidence_before,
                 confidence_after=confidence_after,
                 feature_deltas=feature_deltas
@@ -271,24 +375,19 @@ class NegotiationLoop:
             # Track delta for stagnation detection
             delta = confidence_after - confidence_before
 
-            # Negative delta = harmful info, reset stagnation counter
-            if delta < 0:
-                no_gain_count = 0
-            # Tiny positive delta = no meaningful gain
-            elif delta < self.epsilon:
-                no_gain_count += 1
-                # STOP CONDITION 3: Stagnation (2 consecutive low deltas)
-                if no_gain_count >= 2:
-                    return NegotiationResult(
-                        success=False,
-                        rounds=rounds,
-                        final_confidence=confidence,
-                        final_params=params,
-                        reason="no_information_gain"
-                    )
-            # Meaningful gain, reset counter
-            else:
-                no_gain_count = 0
+            # Tiny non-negative delta = no meaningful gain, count it; a negative
+            # delta (harmful info) or a meaningful gain resets the counter
+            no_gain_count = (no_gain_count + 1) * (0 <= delta < self.epsilon)
+
+            # STOP CONDITION 3: Stagnation (2 consecutive low deltas)
+            if no_gain_count >= 2:
+                return NegotiationResult(
+                    success=False,
+                    rounds=rounds,
+                    final_confidence=confidence,
+                    final_params=params,
+                    reason="no_information_gain"
+                )
 
         # STOP CONDITION 2: Max rounds exceeded
         return NegotiationResult(
@@ -309,12 +408,24 @@ class NegotiationLoop:
         Returns:
             Clarify action data dict or None
         """
+        cached = self._clarify_cache.get(id(move))
+        if cached is not None and cached[0] is move:
+            return cached[1]
+
+        found = None
         for block in move.get("blocks", []):
             if block.get("condition", {}).get("special") == "uncertain":
                 for action in block.get("actions", []):
                     if action.get("type") in ("ask_clarification", "clarify"):
-                        return action.get("data", {})
-        return None
+                        found = action.get("data", {})
+                        break
+                if found is not None:
+                    break
+
+        if len(self._clarify_cache) >= self.CLARIFY_CACHE_SIZE:
+            self._clarify_cache.clear()  # recompiled moves must not pile up
+        self._clarify_cache[id(move)] = (move, found)
+        return found
 
     def _enrich_input(self, original: str, params: Dict[str, Any]) -> str:
         """
@@ -322,9 +433,10 @@ class NegotiationLoop:
 
         Strategy: Append new information to original input.
         Safeguards:
-        - No duplicate appends (track in set)
-        - Whitespace normalization
-        - Length cap (2KB max)
+        - No duplicate appends (values already in the enriched text are skipped)
+        - Whitespace normalization of appended values (the original input
+          is returned untouched, and as-is when nothing is appended)
+        - Length cap (2KB max, checked before each append)
 
         Example:
             original = "I need to see a doctor"
@@ -339,8 +451,9 @@ class NegotiationLoop:
             Enriched input string
         """
         MAX_ENRICHED_LENGTH = 2048
-        enriched = original
-        appended = set()
+        parts = [original]
+        total_len = len(original)
+        enriched_lower = original.lower()  # lowercased once, extended per append
 
         for key, val in params.items():
             if not val:
@@ -349,19 +462,23 @@ class NegotiationLoop:
             val_lower = val_str.lower()
 
             # Skip if already in original or already appended
-            if val_lower in original.lower() or val_lower in appended:
+            if val_lower in enriched_lower:
                 continue
 
-            enriched += f" {val_str}"
-            appended.add(val_lower)
-
             # Length cap
-            if len(enriched) > MAX_ENRICHED_LENGTH:
+            add = len(val_str) + 1
+            if total_len + add > MAX_ENRICHED_LENGTH:
                 break
 
-        # Normalize whitespace
-        enriched = " ".join(enriched.split())
-        return enriched
+            parts.append(val_str)
+            total_len += add
+            enriched_lower += f" {val_lower}"
+
+        if len(parts) == 1:
+            return original
+
+        # Normalize whitespace of the appended values only
+        return f"{original} {' '.join(' '.join(parts[1:]).split())}"
 
 
 class NegotiationManager:
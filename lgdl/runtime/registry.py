@@ -8,8 +8,9 @@ Copyright (c) 2025 Graziano Labs Corp.
 """
 
 import hashlib
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from ..parser.parser import parse_lgdl
 from ..parser.ir import compile_game
@@ -26,8 +27,22 @@ class GameRegistry:
     - Compiled IR and metadata
     - Dedicated runtime instance
     - File hash for cache invalidation
+
+    Registration, reload and lookups are guarded by a re-entrant lock so a
+    web server can hot-reload one game while serving others.
     """
 
+    # absolute path -> (mtime_ns, size, SHA-256 digest) of its latest version,
+    # shared by all registries
+    _hash_cache: Dict[str, Tuple[int, int, str]] = {}
+
+    # SHA-256 digest -> compiled IR, so identical game files compile once per
+    # process. Registered games share these dicts; the runtime never mutates them.
+    _compiled_cache: Dict[str, Dict[str, Any]] = {}
+    # Compiled games kept before that cache is reset (registered games keep
+    # their own reference; edited-and-reloaded versions must not pile up)
+    COMPILED_CACHE_SIZE = 32
+
     def __init__(self, state_manager: Optional[StateManager] = None):
         """
         Initialize empty registry.
@@ -39,6 +54,7 @@ class GameRegistry:
         self.games: Dict[str, Dict[str, Any]] = {}
         self.runtimes: Dict[str, LGDLRuntime] = {}
         self.state_manager = state_manager
+        self._lock = threading.RLock()
 
     def register(self, game_id: str, path: str, version: str = "0.1"):
         """
@@ -58,20 +74,38 @@ class GameRegistry:
             Automatically locates capability_contract.json in the same directory
             as the .lgdl file. If found, enables per-game capabilities.
         """
-        if game_id in self.games:
-            raise ValueError(f"Game '{game_id}' already registered")
+        with self._lock:
+            if game_id in self.games:
+                raise ValueError(f"Game '{game_id}' already registered")
+
+        meta, runtime = self._load(path, version)
 
+        with self._lock:
+            if game_id in self.games:
+                raise ValueError(f"Game '{game_id}' already registered")
+            self.games[game_id] = meta
+            self.runtimes[game_id] = runtime
+
+    def _load(self, path: str, version: str) -> Tuple[Dict[str, Any], LGDLRuntime]:
+        """Compile a game file into its metadata and runtime without registering it."""
         path_obj = Path(path)
         if not path_obj.exists():
             raise FileNotFoundError(f"Game file not found: {path}")
 
-        # Compute file hash for cache invalidation
-        content = path_obj.read_text()
-        file_hash = hashlib.sha256(content.encode()).hexdigest()[:8]
-
-        # Parse and compile
-        game_ast = parse_lgdl(path)
-        compiled = compile_game(game_ast)
+        # Compute file hash for cache invalidation (skipped if the file's
+        # mtime and size are unchanged since it was last hashed)
+        st = path_obj.stat()
+        digest = self._file_digest(path_obj, st)
+        file_hash = digest[:8]
+
+        # Parse and compile (once per distinct file contents)
+        compiled = self._compiled_cache.get(digest)
+        if compiled is None:
+            game_ast = parse_lgdl(path)
+            compiled = compile_game(game_ast)
+            if len(self._compiled_cache) >= self.COMPILED_CACHE_SIZE:
+                self._compiled_cache.clear()
+            self._compiled_cache[digest] = compiled
 
         # Auto-locate capability_contract.json in same directory
         contract_path = path_obj.parent / "capability_contract.json"
@@ -79,22 +113,34 @@ class GameRegistry:
         if contract_path.exists():
             capability_contract_path = str(contract_path.absolute())
 
-        self.games[game_id] = {
+        meta = {
             "path": str(path_obj.absolute()),
             "version": version,
             "compiled": compiled,
             "name": compiled["name"],
             "file_hash": file_hash,
-            "last_compiled": path_obj.stat().st_mtime,
+            "last_compiled": st.st_mtime,
             "capability_contract_path": capability_contract_path
         }
 
         # Create per-game runtime with auto-extracted allowlist, capability contract, and state manager
-        self.runtimes[game_id] = LGDLRuntime(
+        runtime = LGDLRuntime(
             compiled=compiled,
             capability_contract_path=capability_contract_path,
             state_manager=self.state_manager
         )
+        return meta, runtime
+
+    @classmethod
+    def _file_digest(cls, path_obj: Path, st) -> str:
+        """SHA-256 of the file's bytes, reused while its mtime and size are unchanged."""
+        path = str(path_obj.absolute())
+        cached = cls._hash_cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        digest = hashlib.sha256(path_obj.read_bytes()).hexdigest()
+        cls._hash_cache[path] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
 
     def get_runtime(self, game_id: str) -> LGDLRuntime:
         """
@@ -109,12 +155,13 @@ class GameRegistry:
         Raises:
             KeyError: If game not found
         """
-        if game_id not in self.runtimes:
-            available = list(self.runtimes.keys())
-            raise KeyError(
-                f"Game '{game_id}' not found. Available: {available}"
-            )
-        return self.runtimes[game_id]
+        with self._lock:
+            if game_id not in self.runtimes:
+                available = list(self.runtimes.keys())
+                raise KeyError(
+                    f"Game '{game_id}' not found. Available: {available}"
+                )
+            return self.runtimes[game_id]
 
     def get_metadata(self, game_id: str) -> dict:
         """
@@ -129,9 +176,10 @@ class GameRegistry:
         Raises:
             KeyError: If game not found
         """
-        if game_id not in self.games:
-            raise KeyError(f"Game '{game_id}' not found")
-        meta = self.games[game_id]
+        with self._lock:
+            if game_id not in self.games:
+                raise KeyError(f"Game '{game_id}' not found")
+            meta = self.games[game_id]
         return {
             "id": game_id,
             "name": meta["name"],
@@ -142,7 +190,8 @@ class GameRegistry:
 
     def list_games(self) -> list[dict]:
         """List all registered games with metadata."""
-        return [self.get_metadata(gid) for gid in self.games.keys()]
+        with self._lock:
+            return [self.get_metadata(gid) for gid in self.games.keys()]
 
     def reload(self, game_id: str):
         """
@@ -155,14 +204,15 @@ class GameRegistry:
             KeyError: If game not registered
             CompileError: If reload fails
         """
-        if game_id not in self.games:
-            raise KeyError(f"Game '{game_id}' not found")
-
-        meta = self.games[game_id]
-        path = meta["path"]
-        version = meta["version"]
-
-        # Re-register (will overwrite)
-        del self.games[game_id]
-        del self.runtimes[game_id]
-        self.register(game_id, path, version)
+        with self._lock:
+            if game_id not in self.games:
+                raise KeyError(f"Game '{game_id}' not found")
+            meta = self.games[game_id]
+
+        # Compile first; the old game keeps serving until the swap, and
+        # stays registered if the reload fails
+        new_meta, runtime = self._load(meta["path"], meta["version"])
+
+        with self._lock:
+            self.games[game_id] = new_meta
+            self.runtimes[game_id] = runtime
@@ -9,12 +9,16 @@ Copyright (c) 2025 Graziano Labs Corp.
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from enum import Enum
 import logging
 
 logger = logging.getLogger(__name__)
 
+# A question sentence: text since the previous sentence boundary, up to "?"
+_Q_SENT = re.compile(r'[^.!?]*\?')
+
 
 class QuestionType(Enum):
     """Types of questions for enrichment hints"""
@@ -29,12 +33,12 @@ class QuestionType(Enum):
     UNKNOWN = "unknown"      # Couldn't classify
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedResponse:
-    """Result of parsing a system response"""
+    """Result of parsing a system response (immutable; parses are cached and shared)"""
     original_response: str
     has_questions: bool
-    questions: List[str]                    # All detected questions
+    questions: Tuple[str, ...]              # All detected questions
     primary_question: Optional[str]         # First/main question
     question_type: Optional[QuestionType]   # Type of primary question
     awaiting_response: bool                 # Should we expect an answer?
@@ -43,19 +47,22 @@ class ParsedResponse:
 class ResponseParser:
     """Parses system responses to detect questions and update conversation state"""
 
-    # Question word patterns for classification
+    # Question word patterns for classification (lowercase; matched against
+    # the lowercased question, so no per-scan case folding)
     QUESTION_PATTERNS = {
-        QuestionType.WHERE: re.compile(r'\b(where|which\s+(?:part|area|location))\b', re.IGNORECASE),
-        QuestionType.WHEN: re.compile(r'\b(when|what\s+time|which\s+day|how\s+long\s+ago)\b', re.IGNORECASE),
-        QuestionType.HOW: re.compile(r'\b(how\s+(?:much|many|severe|bad|long|often))\b', re.IGNORECASE),
-        QuestionType.WHAT: re.compile(r'\b(what|which)\b', re.IGNORECASE),
-        QuestionType.WHO: re.compile(r'\b(who|which\s+(?:doctor|provider))\b', re.IGNORECASE),
-        QuestionType.WHY: re.compile(r'\bwhy\b', re.IGNORECASE),
+        QuestionType.WHERE: re.compile(r'\b(where|which\s+(?:part|area|location))\b'),
+        QuestionType.WHEN: re.compile(r'\b(when|what\s+time|which\s+day|how\s+long\s+ago)\b'),
+        QuestionType.HOW: re.compile(r'\b(how\s+(?:much|many|severe|bad|long|often))\b'),
+        QuestionType.WHAT: re.compile(r'\b(what|which)\b'),
+        QuestionType.WHO: re.compile(r'\b(who|which\s+(?:doctor|provider))\b'),
+        QuestionType.WHY: re.compile(r'\bwhy\b'),
     }
 
-    def __init__(self):
-        """Initialize response parser"""
-        self.question_marker = re.compile(r'\?')
+    # Yes/no questions typically start with is/are/do/does/can/will
+    YES_NO_PATTERN = re.compile(r'^\s*(is|are|do|does|did|can|could|will|would|has|have|had)\b')
+
+    # Choice questions contain "or"
+    CHOICE_PATTERN = re.compile(r'\bor\b')
 
     def parse_response(self, response: str) -> ParsedResponse:
         """
@@ -77,44 +84,7 @@ class ResponseParser:
             >>> result.question_type
             QuestionType.WHERE
         """
-        # Check if response contains any questions
-        has_questions = bool(self.question_marker.search(response))
-
-        if not has_questions:
-            return ParsedResponse(
-                original_response=response,
-                has_questions=False,
-                questions=[],
-                primary_question=None,
-                question_type=None,
-                awaiting_response=False
-            )
-
-        # Extract all questions
-        questions = self._extract_questions(response)
-
-        # Get primary (first) question
-        primary_question = questions[0] if questions else None
-
-        # Classify primary question type
-        question_type = self._classify_question(primary_question) if primary_question else None
-
-        # We're awaiting response if we found questions
-        awaiting_response = has_questions
-
-        logger.debug(
-            f"Parsed response: {len(questions)} question(s), "
-            f"primary='{primary_question}', type={question_type}"
-        )
-
-        return ParsedResponse(
-            original_response=response,
-            has_questions=has_questions,
-            questions=questions,
-            primary_question=primary_question,
-            question_type=question_type,
-            awaiting_response=awaiting_response
-        )
+        return _parse_response_cached(response)
 
     def _extract_questions(self, response: str) -> List[str]:
         """
@@ -131,27 +101,7 @@ class ResponseParser:
             >>> parser._extract_questions("Where? How? When?")
             ["Where?", "How?", "When?"]
         """
-        # Split by sentence boundaries (., !, ?) but keep the delimiter
-        sentences = re.split(r'([.!?])', response)
-
-        # Reconstruct sentences with their delimiters
-        reconstructed = []
-        i = 0
-        while i < len(sentences):
-            if i + 1 < len(sentences):
-                sentence = (sentences[i] + sentences[i + 1]).strip()
-                if sentence:
-                    reconstructed.append(sentence)
-                i += 2
-            else:
-                if sentences[i].strip():
-                    reconstructed.append(sentences[i].strip())
-                i += 1
-
-        # Filter to only sentences ending with ?
-        questions = [s for s in reconstructed if s.endswith('?')]
-
-        return questions
+        return _extract_questions(response)
 
     def extract_primary_question(self, response: str) -> Optional[str]:
         """
@@ -195,24 +145,7 @@ class ResponseParser:
             >>> parser._classify_question("Where does it hurt?")
             QuestionType.WHERE
         """
-        if not question:
-            return QuestionType.UNKNOWN
-
-        # Check for yes/no questions (typically start with is/are/do/does/can/will)
-        if re.match(r'^\s*(is|are|do|does|did|can|could|will|would|has|have|had)\b', question, re.IGNORECASE):
-            return QuestionType.YES_NO
-
-        # Check for choice questions (contains "or")
-        if re.search(r'\bor\b', question, re.IGNORECASE):
-            return QuestionType.CHOICE
-
-        # Match against question word patterns
-        for qtype, pattern in self.QUESTION_PATTERNS.items():
-            if pattern.search(question):
-                return qtype
-
-        # Default to unknown if no pattern matches
-        return QuestionType.UNKNOWN
+        return _classify_question(question)
 
     def should_await_response(self, response: str) -> bool:
         """
@@ -231,4 +164,94 @@ class ResponseParser:
             >>> parser.should_await_response("OK, got it.")
             False
         """
-        return bool(self.question_marker.search(response))
+        return '?' in response
+
+
+def _build_classifier() -> re.Pattern:
+    """Fuse the classification rules into one regex, preserving their priority.
+
+    Each rule becomes a lookahead from the start of the question, wrapped in
+    a group named after its QuestionType. Alternatives are tried in rule
+    order, so the highest-priority rule that matches anywhere in the
+    question wins (not the leftmost match), exactly as when searching the
+    patterns one by one.
+    """
+    rules = [
+        (QuestionType.YES_NO, ResponseParser.YES_NO_PATTERN.pattern.lstrip('^')),
+        (QuestionType.CHOICE, '.*?' + ResponseParser.CHOICE_PATTERN.pattern),
+    ]
+    rules += [
+        (qtype, '.*?' + pattern.pattern)
+        for qtype, pattern in ResponseParser.QUESTION_PATTERNS.items()
+    ]
+    return re.compile(
+        "|".join(f"(?=(?P<{qtype.name}>{source}))" for qtype, source in rules),
+        re.DOTALL
+    )
+
+
+_CLASSIFIER = _build_classifier()
+
+
+def _extract_questions(response: str) -> List[str]:
+    """Question sentences in response (see ResponseParser._extract_questions)."""
+    # Sentences end at ., ! or ?; only those ending in ? are matched
+    return [s.strip() for s in _Q_SENT.findall(response)]
+
+
+def _classify_question(question: str) -> QuestionType:
+    """QuestionType of question (see ResponseParser._classify_question)."""
+    if not question:
+        return QuestionType.UNKNOWN
+
+    # One scan: the first rule (yes/no, choice, then QUESTION_PATTERNS
+    # order) that matches names its group; UNKNOWN if none matches
+    m = _CLASSIFIER.match(question.lower())
+    return QuestionType[m.lastgroup] if m else QuestionType.UNKNOWN
+
+
+@lru_cache(maxsize=1024)
+def _parse_response_cached(response: str) -> ParsedResponse:
+    """ResponseParser.parse_response, memoized on the response text.
+
+    Module-level so the cache is shared by every parser and holds no
+    reference to one (results are frozen, so sharing them is safe).
+    """
+    # Check if response contains any questions
+    has_questions = '?' in response
+
+    if not has_questions:
+        return ParsedResponse(
+            original_response=response,
+            has_questions=False,
+            questions=(),
+            primary_question=None,
+            question_type=None,
+            awaiting_response=False
+        )
+
+    # Extract all questions
+    questions = tuple(_extract_questions(response))
+
+    # Get primary (first) question
+    primary_question = questions[0] if questions else None
+
+    # Classify primary question type
+    question_type = _classify_question(primary_question) if primary_question else None
+
+    # We're awaiting response if we found questions
+    awaiting_response = has_questions
+
+    logger.debug(
+        f"Parsed response: {len(questions)} question(s), "
+        f"primary='{primary_question}', type={question_type}"
+    )
+
+    return ParsedResponse(
+        original_response=response,
+        has_questions=has_questions,
+        questions=questions,
+        primary_question=primary_question,
+        question_type=question_type,
+        awaiting_response=awaiting_response
+    )
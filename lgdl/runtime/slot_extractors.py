@@ -9,20 +9,33 @@ Provides flexible slot extraction with multiple strategies:
 Phase 2: Semantic Slot Extraction
 """
 
+import asyncio
 import re
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Optional, Dict, List, Tuple
-from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional, Dict, List, Tuple, TYPE_CHECKING
+from datetime import date
+
+if TYPE_CHECKING:
+    from ..config import LGDLConfig
+
+# Optional Aho-Corasick automaton for the timeframe phrase scan (one pass over the text)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 
 # ============================================================================
 # Result Types
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExtractionResult:
-    """Result from slot extraction.
+    """Result from slot extraction (immutable; derive variants with _retag).
 
     Attributes:
         success: Whether extraction succeeded
@@ -40,6 +53,165 @@ class ExtractionResult:
     alternatives: Optional[List[Any]] = None
 
 
+def _retag(result: ExtractionResult, strategy_used: str) -> ExtractionResult:
+    """Copy of result credited to another strategy (cheaper than dataclasses.replace)."""
+    return ExtractionResult(
+        result.success,
+        result.value,
+        result.confidence,
+        strategy_used,
+        result.reasoning,
+        result.alternatives
+    )
+
+
+# Shared result for the common regex miss (results are frozen, so safe to reuse)
+_NO_NUMBER = ExtractionResult(
+    success=False,
+    value=None,
+    confidence=0.0,
+    strategy_used="regex",
+    reasoning="No number found in input"
+)
+
+
+@lru_cache(maxsize=256)
+def _slot_schema(slot_type: str, slot_name: str, enum_values: Tuple[str, ...]) -> Dict[str, Any]:
+    """Response schema for extracting one slot (shared, never mutated)."""
+    schema = {
+        "value": {
+            "description": f"The extracted {slot_name}"
+        },
+        "confidence": {
+            "type": "number",
+            "minimum": 0.0,
+            "maximum": 1.0,
+            "description": "Confidence in extraction (0.0-1.0)"
+        },
+        "reasoning": {
+            "type": "string",
+            "description": "Brief explanation of extraction"
+        },
+        "alternatives": {
+            "type": "array",
+            "description": "Other possible values if ambiguous"
+        }
+    }
+
+    # Customize value type
+    if slot_type in ("number", "range"):
+        schema["value"]["type"] = "number"
+    elif slot_type == "enum":
+        schema["value"]["type"] = "string"
+        if enum_values:
+            schema["value"]["enum"] = list(enum_values)
+    else:
+        schema["value"]["type"] = "string"
+
+    return schema
+
+
+@lru_cache(maxsize=32)
+def _batch_slot_schema(n: int) -> Dict[str, Any]:
+    """Response schema for extracting n numbered slots (shared, never mutated)."""
+    return {
+        "slots": {
+            "type": "array",
+            "description": (
+                "One object per slot: "
+                "{\"id\": slot number, \"value\": extracted value, "
+                "\"confidence\": 0.0-1.0, \"reasoning\": brief explanation, "
+                "\"alternatives\": other possible values}"
+            ),
+            "minItems": n,
+            "maxItems": n,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "value": {"description": "The extracted value"},
+                    "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
+                    "reasoning": {"type": "string"},
+                    "alternatives": {"type": "array"}
+                }
+            }
+        }
+    }
+
+
+def _phrase_automaton(phrases: Tuple[str, ...]):
+    """Aho-Corasick automaton over phrases, or None without pyahocorasick."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=1024)
+def _enum_index(
+    enum_values: Tuple[str, ...]
+) -> Tuple[Dict[str, ExtractionResult], Tuple[Tuple[str, ExtractionResult], ...]]:
+    """Lowercased lookups for an enum vocabulary, built once per distinct tuple.
+
+    The success results for each value are built here too and shared by
+    every extraction that hits them.
+
+    Returns (lowercase -> exact-match result of the first such value,
+    ((lowercase, partial-match result), ...)).
+    """
+    exact: Dict[str, ExtractionResult] = {}
+    partial = []
+    for value in enum_values:
+        lowered = value.lower()
+        if lowered not in exact:
+            exact[lowered] = ExtractionResult(
+                success=True,
+                value=value,
+                confidence=1.0,  # Perfect match
+                strategy_used="regex"
+            )
+        partial.append((lowered, ExtractionResult(
+            success=True,
+            value=value,
+            confidence=0.8,  # Good match
+            strategy_used="regex"
+        )))
+    return exact, tuple(partial)
+
+
+@dataclass(slots=True, frozen=True)
+class SlotPlan:
+    """The parts of a slot definition regex extraction reads, resolved once.
+
+    Attributes:
+        type: Slot type ("number", "range", "enum", "date", "timeframe", "string")
+        min: Lower bound for range slots (None if unbounded)
+        max: Upper bound for range slots (None if unbounded)
+        enum_values: Enum values as given in the slot definition
+        enum_index: Prebuilt enum lookups (see _enum_index), None without values
+    """
+    type: str
+    min: Optional[float]
+    max: Optional[float]
+    enum_values: Any
+    enum_index: Optional[Tuple[Dict[str, ExtractionResult], Tuple[Tuple[str, ExtractionResult], ...]]]
+
+    @classmethod
+    def from_slot_def(cls, slot_def: dict) -> "SlotPlan":
+        """Resolve a slot definition dict into a plan."""
+        enum_values = slot_def.get("enum_values", [])
+        return cls(
+            type=slot_def.get("type", "string"),
+            min=slot_def.get("min"),
+            max=slot_def.get("max"),
+            enum_values=enum_values,
+            enum_index=_enum_index(tuple(enum_values)) if enum_values else None
+        )
+
+
 # ============================================================================
 # Abstract Base
 # ============================================================================
@@ -82,16 +254,59 @@ class RegexSlotExtractor(SlotExtractor):
     - Fixed enum values
     - Structured date/time formats
     - Exact string matches
+
+    Slot definitions are resolved into SlotPlans once per dict (by identity),
+    so they must not be mutated after their first extraction.
     """
 
+    # Resolved plans kept before the identity cache is reset
+    PLAN_CACHE_SIZE = 1024
+
+    _NUMBER_RE = re.compile(r'-?\d+\.?\d*')
+    _ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+    _US_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+    # "N <unit>" on lowercased input; the leftmost quantity wins
+    _TIMEFRAME_RE = re.compile(r'(\d+)\s*(hour|day|week|month|year)')
+    # Common relative phrases, matched as substrings of lowercased input
+    _TIMEFRAME_PHRASES = (
+        'yesterday', 'today', 'this morning', 'last night',
+        'this week', 'last week', 'ago', 'recently', 'just now'
+    )
+    _PHRASE_AC = _phrase_automaton(_TIMEFRAME_PHRASES)
+    _PHRASE_RE = re.compile("|".join(map(re.escape, _TIMEFRAME_PHRASES)))
+
+    def __init__(self):
+        """Initialize regex extractor with its slot type dispatch table."""
+        self._dispatch = {
+            "number": self._extract_number,
+            "range": self._extract_number,
+            "enum": self._extract_enum,
+            "date": self._extract_date,
+            "timeframe": self._extract_timeframe,
+        }
+        # id(slot_def) -> (slot_def, SlotPlan)
+        self._plans: Dict[int, Tuple[dict, SlotPlan]] = {}
+
     async def extract(
         self,
         user_input: str,
         slot_def: dict,
         context: dict
+    ) -> ExtractionResult:
+        """Extract using regex patterns (see extract_sync)."""
+        return self.extract_sync(user_input, slot_def, context)
+
+    def extract_sync(
+        self,
+        user_input: str,
+        slot_def: dict,
+        context: dict
     ) -> ExtractionResult:
         """Extract using regex patterns.
 
+        Pure CPU work, so callers already inside a coroutine can call this
+        directly instead of awaiting extract().
+
         Args:
             user_input: User's input
             slot_def: Slot definition
@@ -100,23 +315,28 @@ class RegexSlotExtractor(SlotExtractor):
         Returns:
             ExtractionResult with extracted value
         """
-        slot_type = slot_def.get("type", "string")
+        plan = self._plan(slot_def)
 
-        if slot_type == "number" or slot_type == "range":
-            return self._extract_number(user_input, slot_def)
-        elif slot_type == "enum":
-            return self._extract_enum(user_input, slot_def)
-        elif slot_type == "date":
-            return self._extract_date(user_input, slot_def)
-        elif slot_type == "timeframe":
-            return self._extract_timeframe(user_input, slot_def)
-        else:  # string or unknown
-            return self._extract_string(user_input, slot_def)
+        # string or unknown types accept the input as-is
+        handler = self._dispatch.get(plan.type, self._extract_string)
+        return handler(user_input, plan)
+
+    def _plan(self, slot_def: dict) -> SlotPlan:
+        """SlotPlan for slot_def, cached by identity."""
+        cached = self._plans.get(id(slot_def))
+        if cached is not None and cached[0] is slot_def:
+            return cached[1]
+
+        plan = SlotPlan.from_slot_def(slot_def)
+        if len(self._plans) >= self.PLAN_CACHE_SIZE:
+            self._plans.clear()  # ad-hoc dicts (e.g. per-call defs) must not pile up
+        self._plans[id(slot_def)] = (slot_def, plan)
+        return plan
 
     def _extract_number(
         self,
         text: str,
-        slot_def: dict
+        plan: SlotPlan
     ) -> ExtractionResult:
         """Extract numeric value with regex.
 
@@ -125,16 +345,16 @@ class RegexSlotExtractor(SlotExtractor):
         Returns:
             ExtractionResult with float value or failure
         """
-        match = re.search(r'-?\d+\.?\d*', text)
+        match = self._NUMBER_RE.search(text)
 
         if match:
             try:
                 value = float(match.group())
 
                 # Validate range if specified
-                if slot_def.get("type") == "range":
-                    min_val = slot_def.get("min")
-                    max_val = slot_def.get("max")
+                if plan.type == "range":
+                    min_val = plan.min
+                    max_val = plan.max
 
                     if min_val is not None and value < min_val:
                         return ExtractionResult(
@@ -166,18 +386,12 @@ class RegexSlotExtractor(SlotExtractor):
                 pass
 
         # No number found
-        return ExtractionResult(
-            success=False,
-            value=None,
-            confidence=0.0,
-            strategy_used="regex",
-            reasoning="No number found in input"
-        )
+        return _NO_NUMBER
 
     def _extract_enum(
         self,
         text: str,
-        slot_def: dict
+        plan: SlotPlan
     ) -> ExtractionResult:
         """Extract enum value with exact/partial matching.
 
@@ -191,10 +405,8 @@ class RegexSlotExtractor(SlotExtractor):
         Returns:
             ExtractionResult with matched enum value or raw input
         """
-        enum_values = slot_def.get("enum_values", [])
-
         # Backward compatibility: if no enum values, accept input for later validation
-        if not enum_values:
+        if plan.enum_index is None:
             return ExtractionResult(
                 success=True,
                 value=text.strip(),
@@ -203,26 +415,17 @@ class RegexSlotExtractor(SlotExtractor):
             )
 
         text_lower = text.lower()
+        exact, partial = plan.enum_index
 
         # Try exact match
-        for value in enum_values:
-            if value.lower() == text_lower:
-                return ExtractionResult(
-                    success=True,
-                    value=value,
-                    confidence=1.0,  # Perfect match
-                    strategy_used="regex"
-                )
+        result = exact.get(text_lower)
+        if result is not None:
+            return result
 
         # Try partial match
-        for value in enum_values:
-            if value.lower() in text_lower or text_lower in value.lower():
-                return ExtractionResult(
-                    success=True,
-                    value=value,
-                    confidence=0.8,  # Good match
-                    strategy_used="regex"
-                )
+        for value_lower, result in partial:
+            if value_lower in text_lower or text_lower in value_lower:
+                return result
 
         # No match
         return ExtractionResult(
@@ -230,13 +433,13 @@ class RegexSlotExtractor(SlotExtractor):
             value=None,
             confidence=0.0,
             strategy_used="regex",
-            reasoning=f"No match for enum values: {enum_values}"
+            reasoning=f"No match for enum values: {plan.enum_values}"
         )
 
     def _extract_date(
         self,
         text: str,
-        slot_def: dict
+        plan: SlotPlan
     ) -> ExtractionResult:
         """Extract date with multiple format support.
 
@@ -249,17 +452,13 @@ class RegexSlotExtractor(SlotExtractor):
             ExtractionResult with ISO date string or fallback to raw text
         """
         # Try ISO format: YYYY-MM-DD
-        iso_match = re.search(r'(\d{4})-(\d{2})-(\d{2})', text)
+        iso_match = self._ISO_DATE_RE.search(text)
         if iso_match:
             try:
-                date = datetime(
-                    int(iso_match.group(1)),
-                    int(iso_match.group(2)),
-                    int(iso_match.group(3))
-                )
+                year, month, day = iso_match.groups()
                 return ExtractionResult(
                     success=True,
-                    value=date.isoformat()[:10],
+                    value=date(int(year), int(month), int(day)).isoformat(),
                     confidence=0.95,
                     strategy_used="regex"
                 )
@@ -267,17 +466,13 @@ class RegexSlotExtractor(SlotExtractor):
                 pass
 
         # Try US format: MM/DD/YYYY
-        us_match = re.search(r'(\d{1,2})/(\d{1,2})/(\d{4})', text)
+        us_match = self._US_DATE_RE.search(text)
         if us_match:
             try:
-                date = datetime(
-                    int(us_match.group(3)),
-                    int(us_match.group(1)),
-                    int(us_match.group(2))
-                )
+                month, day, year = us_match.groups()
                 return ExtractionResult(
                     success=True,
-                    value=date.isoformat()[:10],
+                    value=date(int(year), int(month), int(day)).isoformat(),
                     confidence=0.85,
                     strategy_used="regex"
                 )
@@ -296,7 +491,7 @@ class RegexSlotExtractor(SlotExtractor):
     def _extract_timeframe(
         self,
         text: str,
-        slot_def: dict
+        plan: SlotPlan
     ) -> ExtractionResult:
         """Extract timeframe with pattern matching.
 
@@ -309,34 +504,26 @@ class RegexSlotExtractor(SlotExtractor):
             ExtractionResult with timeframe string
         """
         value_str = text.strip()
+        text_lower = value_str.lower()
 
         # Common timeframe patterns
-        patterns = [
-            (r'(\d+)\s*hour', 'hours'),
-            (r'(\d+)\s*day', 'days'),
-            (r'(\d+)\s*week', 'weeks'),
-            (r'(\d+)\s*month', 'months'),
-            (r'(\d+)\s*year', 'years'),
-        ]
-
-        for pattern, unit in patterns:
-            match = re.search(pattern, text.lower())
-            if match:
-                num = match.group(1)
-                return ExtractionResult(
-                    success=True,
-                    value=f"{num} {unit}",
-                    confidence=0.9,
-                    strategy_used="regex"
-                )
+        match = self._TIMEFRAME_RE.search(text_lower)
+        if match:
+            num, unit = match.groups()
+            return ExtractionResult(
+                success=True,
+                value=f"{num} {unit}s",
+                confidence=0.9,
+                strategy_used="regex"
+            )
 
-        # Check for common phrases
-        phrases = [
-            'yesterday', 'today', 'this morning', 'last night',
-            'this week', 'last week', 'ago', 'recently', 'just now'
-        ]
+        # Check for common phrases (one pass: automaton, else regex alternation)
+        if self._PHRASE_AC is not None:
+            has_phrase = next(self._PHRASE_AC.iter(text_lower), None) is not None
+        else:
+            has_phrase = self._PHRASE_RE.search(text_lower) is not None
 
-        if any(phrase in value_str.lower() for phrase in phrases):
+        if has_phrase:
             return ExtractionResult(
                 success=True,
                 value=value_str,
@@ -355,7 +542,7 @@ class RegexSlotExtractor(SlotExtractor):
     def _extract_string(
         self,
         text: str,
-        slot_def: dict
+        plan: SlotPlan
     ) -> ExtractionResult:
         """Extract string (accepts anything).
 
@@ -390,8 +577,13 @@ class SemanticSlotExtractor(SlotExtractor):
     - Complex entities (locations, medical terms)
     - Natural language descriptions
     - When vocabulary/synonyms matter
+
+    Successful extractions are memoized in an LRU keyed by the full prompt
+    (input, slot definition and context), so exact repeats skip the LLM.
     """
 
+    CACHE_SIZE = 2048
+
     def __init__(self, llm_client):
         """Initialize semantic extractor.
 
@@ -399,6 +591,7 @@ class SemanticSlotExtractor(SlotExtractor):
             llm_client: LLMClient instance for completions
         """
         self.llm = llm_client
+        self._cache: "OrderedDict[str, ExtractionResult]" = OrderedDict()
 
     async def extract(
         self,
@@ -419,6 +612,11 @@ class SemanticSlotExtractor(SlotExtractor):
         # Build rich prompt
         prompt = self._build_prompt(user_input, slot_def, context)
 
+        cached = self._cache.get(prompt)
+        if cached is not None:
+            self._cache.move_to_end(prompt)
+            return cached
+
         # Define response schema
         response_schema = self._get_response_schema(slot_def)
 
@@ -431,32 +629,93 @@ class SemanticSlotExtractor(SlotExtractor):
                 temperature=0.0
             )
 
-            extracted_value = result.content.get("value")
-            confidence = result.content.get("confidence", 0.0)
-            reasoning = result.content.get("reasoning", "")
-            alternatives = result.content.get("alternatives", [])
+            extraction = self._to_result(result.content, slot_def)
+
+        except Exception as e:
+            # Fallback on error (not cached, so a retry reaches the LLM)
+            return self._error_result(e)
 
-            # Validate extracted value
-            valid, validated_value = self._validate_value(extracted_value, slot_def)
+        self._cache[prompt] = extraction
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return extraction
 
-            return ExtractionResult(
-                success=valid,
-                value=validated_value if valid else extracted_value,
-                confidence=confidence,
-                strategy_used="semantic",
-                reasoning=reasoning,
-                alternatives=alternatives
-            )
+    async def extract_batch(
+        self,
+        user_input: str,
+        slot_defs: List[dict],
+        context: dict
+    ) -> List[ExtractionResult]:
+        """Extract several slots from one input with a single LLM call.
+
+        Args:
+            user_input: User's input text
+            slot_defs: Slot definitions, answered by 1-based position
+            context: Conversation history, filled slots
 
+        Returns:
+            One ExtractionResult per slot_def, in order
+        """
+        if len(slot_defs) == 1:
+            return [await self.extract(user_input, slot_defs[0], context)]
+
+        prompt = self._build_batch_prompt(user_input, slot_defs, context)
+
+        try:
+            result = await self.llm.complete(
+                prompt=prompt,
+                response_schema=_batch_slot_schema(len(slot_defs)),
+                max_tokens=150 * len(slot_defs),
+                temperature=0.0
+            )
         except Exception as e:
-            # Fallback on error
-            return ExtractionResult(
+            return [self._error_result(e)] * len(slot_defs)
+
+        entries = {
+            entry.get("id"): entry
+            for entry in result.content.get("slots", [])
+            if isinstance(entry, dict)
+        }
+        return [
+            self._to_result(entries[i], slot_def) if i in entries else ExtractionResult(
                 success=False,
                 value=None,
                 confidence=0.0,
                 strategy_used="semantic",
-                reasoning=f"LLM extraction error: {str(e)}"
+                reasoning="LLM returned no value for this slot"
             )
+            for i, slot_def in enumerate(slot_defs, 1)
+        ]
+
+    def _to_result(self, content: Dict[str, Any], slot_def: dict) -> ExtractionResult:
+        """Turn one LLM answer ({value, confidence, ...}) into a validated result."""
+        extracted_value = content.get("value")
+        confidence = content.get("confidence", 0.0)
+        reasoning = content.get("reasoning", "")
+        alternatives = content.get("alternatives", [])
+
+        # Validate extracted value
+        valid, validated_value = self._validate_value(extracted_value, slot_def)
+
+        return ExtractionResult(
+            success=valid,
+            value=validated_value if valid else extracted_value,
+            confidence=confidence,
+            strategy_used="semantic",
+            reasoning=reasoning,
+            alternatives=alternatives
+        )
+
+    @staticmethod
+    def _error_result(error: Exception) -> ExtractionResult:
+        """Failure result for an LLM call that raised."""
+        return ExtractionResult(
+            success=False,
+            value=None,
+            confidence=0.0,
+            strategy_used="semantic",
+            reasoning=f"LLM extraction error: {str(error)}"
+        )
 
     def _build_prompt(
         self,
@@ -474,14 +733,45 @@ class SemanticSlotExtractor(SlotExtractor):
         Returns:
             Formatted prompt string
         """
+        slot_name = slot_def.get("name", "unknown")
+        sections = [f'You are extracting the "{slot_name}" slot.']
+        sections += self._slot_sections(slot_def)
+        sections += self._context_sections(context)
+
+        # The extraction task
+        sections.append(f'\nUser said: "{user_input}"')
+        sections.append(f"\nExtract the {slot_name} from the user's input.")
+        sections += self._task_sections()
+
+        return "\n".join(sections)
+
+    def _build_batch_prompt(
+        self,
+        user_input: str,
+        slot_defs: List[dict],
+        context: dict
+    ) -> str:
+        """Build one prompt asking for several numbered slots at once."""
+        sections = [f"You are extracting {len(slot_defs)} slots from the same user input."]
+        for i, slot_def in enumerate(slot_defs, 1):
+            sections.append(f'\nSlot {i}: "{slot_def.get("name", "unknown")}"')
+            sections += self._slot_sections(slot_def)
+        sections += self._context_sections(context)
+
+        sections.append(f'\nUser said: "{user_input}"')
+        sections.append("\nExtract every slot from the user's input, one entry per slot number.")
+        sections += self._task_sections()
+
+        return "\n".join(sections)
+
+    def _slot_sections(self, slot_def: dict) -> List[str]:
+        """Prompt lines describing one slot (type, context, vocabulary, constraints)."""
         sections = []
 
         # Slot metadata
-        slot_name = slot_def.get("name", "unknown")
         slot_type = slot_def.get("type", "string")
         semantic_context = slot_def.get("semantic_context", "")
 
-        sections.append(f'You are extracting the "{slot_name}" slot.')
         sections.append(f"Slot type: {slot_type}")
 
         if semantic_context:
@@ -506,6 +796,12 @@ class SemanticSlotExtractor(SlotExtractor):
             if min_val is not None and max_val is not None:
                 sections.append(f"\nValue must be between {min_val} and {max_val} (inclusive)")
 
+        return sections
+
+    def _context_sections(self, context: dict) -> List[str]:
+        """Prompt lines for the conversation context shared by all slots."""
+        sections = []
+
         # Conversation history
         conversation_history = context.get("conversation_history", [])
         if conversation_history:
@@ -522,20 +818,21 @@ class SemanticSlotExtractor(SlotExtractor):
             for name, value in filled_slots.items():
                 sections.append(f"  {name}: {value}")
 
-        # The extraction task
-        sections.append(f'\nUser said: "{user_input}"')
-        sections.append(f"\nExtract the {slot_name} from the user's input.")
-        sections.append("Consider:")
-        sections.append("1. Semantic meaning (what did they intend?)")
-        sections.append("2. Vocabulary mappings (synonyms)")
-        sections.append("3. Conversation context")
-        sections.append("4. Previously filled slots")
-
-        sections.append("\nIf value not clearly present:")
-        sections.append("- Provide best guess with low confidence (<0.5)")
-        sections.append("- Suggest alternatives if ambiguous")
-
-        return "\n".join(sections)
+        return sections
+
+    @staticmethod
+    def _task_sections() -> List[str]:
+        """Closing extraction instructions."""
+        return [
+            "Consider:",
+            "1. Semantic meaning (what did they intend?)",
+            "2. Vocabulary mappings (synonyms)",
+            "3. Conversation context",
+            "4. Previously filled slots",
+            "\nIf value not clearly present:",
+            "- Provide best guess with low confidence (<0.5)",
+            "- Suggest alternatives if ambiguous",
+        ]
 
     def _get_response_schema(self, slot_def: dict) -> Dict[str, Any]:
         """Get JSON schema for LLM response.
@@ -544,41 +841,13 @@ class SemanticSlotExtractor(SlotExtractor):
             slot_def: Slot definition
 
         Returns:
-            JSON schema for structured output
+            JSON schema for structured output (shared; do not mutate)
         """
-        slot_type = slot_def.get("type", "string")
-
-        schema = {
-            "value": {
-                "description": f"The extracted {slot_def.get('name', 'value')}"
-            },
-            "confidence": {
-                "type": "number",
-                "minimum": 0.0,
-                "maximum": 1.0,
-                "description": "Confidence in extraction (0.0-1.0)"
-            },
-            "reasoning": {
-                "type": "string",
-                "description": "Brief explanation of extraction"
-            },
-            "alternatives": {
-                "type": "array",
-                "description": "Other possible values if ambiguous"
-            }
-        }
-
-        # Customize value type
-        if slot_type in ("number", "range"):
-            schema["value"]["type"] = "number"
-        elif slot_type == "enum":
-            schema["value"]["type"] = "string"
-            if slot_def.get("enum_values"):
-                schema["value"]["enum"] = slot_def["enum_values"]
-        else:
-            schema["value"]["type"] = "string"
-
-        return schema
+        return _slot_schema(
+            slot_def.get("type", "string"),
+            slot_def.get("name", "value"),
+            tuple(slot_def.get("enum_values") or ())
+        )
 
     def _validate_value(
         self,
@@ -673,23 +942,20 @@ class HybridSlotExtractor(SlotExtractor):
             Best ExtractionResult from either strategy
         """
         # Try regex first (fast, free)
-        regex_result = await self.regex.extract(user_input, slot_def, context)
+        regex_result = self.regex.extract_sync(user_input, slot_def, context)
 
         # If regex succeeded with good confidence, use it
         if regex_result.success and regex_result.confidence >= 0.7:
-            regex_result.strategy_used = "hybrid(regex)"
-            return regex_result
+            return _retag(regex_result, "hybrid(regex)")
 
         # Regex failed or low confidence, try semantic
         semantic_result = await self.semantic.extract(user_input, slot_def, context)
 
         # Return better result
         if semantic_result.confidence > regex_result.confidence:
-            semantic_result.strategy_used = "hybrid(semantic)"
-            return semantic_result
+            return _retag(semantic_result, "hybrid(semantic)")
         else:
-            regex_result.strategy_used = "hybrid(regex)"
-            return regex_result
+            return _retag(regex_result, "hybrid(regex)")
 
 
 # ============================================================================
@@ -703,19 +969,18 @@ class SlotExtractionEngine:
     Handles graceful degradation if semantic extraction unavailable.
     """
 
-    def __init__(self, config, state_manager=None):
+    def __init__(self, config: "LGDLConfig", state_manager=None):
         """Initialize extraction engine.
 
         Args:
-            config: LGDLConfig with feature flags
+            config: LGDLConfig with feature flags (use from_env() to load
+                one from the environment)
             state_manager: Optional StateManager for persistence
 
         Raises:
             ValueError: If semantic enabled but no API key
         """
-        from ..config import LGDLConfig
-
-        self.config = config if isinstance(config, LGDLConfig) else LGDLConfig.from_env()
+        self.config = config
         self.state_manager = state_manager
 
         # Always have regex extractor
@@ -747,6 +1012,13 @@ class SlotExtractionEngine:
             self.hybrid = None
             print(f"[Slots] Semantic slot extraction DISABLED (regex only)")
 
+    @classmethod
+    def from_env(cls, state_manager=None) -> "SlotExtractionEngine":
+        """Create an engine configured from environment variables."""
+        from ..config import LGDLConfig
+
+        return cls(LGDLConfig.from_env(), state_manager)
+
     async def extract_slot(
         self,
         user_input: str,
@@ -763,21 +1035,89 @@ class SlotExtractionEngine:
         Returns:
             ExtractionResult from appropriate extractor
         """
+        result = self.extract_slot_sync(user_input, slot_def, context)
+        if result is not None:
+            return result
+
+        # Route to the LLM-backed extractor
+        if slot_def.get("extraction_strategy") == "semantic":
+            return await self.semantic.extract(user_input, slot_def, context)
+        return await self.hybrid.extract(user_input, slot_def, context)
+
+    def extract_slot_sync(
+        self,
+        user_input: str,
+        slot_def: dict,
+        context: dict
+    ) -> Optional[ExtractionResult]:
+        """Extract slot without awaiting, when no LLM call is needed.
+
+        Regex slots, and semantic/hybrid slots while semantic extraction is
+        disabled, are pure CPU work and are answered here directly.
+
+        Args:
+            user_input: User's input text
+            slot_def: Slot definition with extraction_strategy
+            context: Rich context for semantic extraction
+
+        Returns:
+            ExtractionResult, or None if the slot needs extract_slot (LLM)
+        """
         strategy = slot_def.get("extraction_strategy", "regex")
 
-        # Route to appropriate extractor
         if strategy == "semantic":
-            if not self.semantic:
-                # Fallback to regex if semantic not available
-                print(f"[Slots] Semantic extraction not available, using regex fallback")
-                return await self.regex.extract(user_input, slot_def, context)
-            return await self.semantic.extract(user_input, slot_def, context)
+            if self.semantic:
+                return None
+            # Fallback to regex if semantic not available
+            print(f"[Slots] Semantic extraction not available, using regex fallback")
 
         elif strategy == "hybrid":
-            if not self.hybrid:
-                # Fallback to regex if hybrid not available
-                return await self.regex.extract(user_input, slot_def, context)
-            return await self.hybrid.extract(user_input, slot_def, context)
+            if self.hybrid:
+                return None
+            # Fallback to regex if hybrid not available
+
+        # "regex" or unknown (default)
+        return self.regex.extract_sync(user_input, slot_def, context)
 
-        else:  # "regex" or unknown (default)
-            return await self.regex.extract(user_input, slot_def, context)
+    async def extract_slots(
+        self,
+        user_input: str,
+        slot_defs: List[dict],
+        context: dict
+    ) -> List[ExtractionResult]:
+        """Extract several slots from the same input concurrently.
+
+        Semantic slots share one batched LLM call; every other slot goes
+        through extract_slot. All calls run concurrently.
+
+        Args:
+            user_input: User's input text
+            slot_defs: Slot definitions to fill
+            context: Rich context for semantic extraction
+
+        Returns:
+            One ExtractionResult per slot_def, in order
+        """
+        semantic = [
+            i for i, slot_def in enumerate(slot_defs)
+            if self.semantic and slot_def.get("extraction_strategy", "regex") == "semantic"
+        ]
+        if len(semantic) < 2:
+            semantic = []
+        batched = set(semantic)
+        others = [i for i in range(len(slot_defs)) if i not in batched]
+
+        jobs = [self.extract_slot(user_input, slot_defs[i], context) for i in others]
+        if semantic:
+            jobs.append(self.semantic.extract_batch(
+                user_input, [slot_defs[i] for i in semantic], context
+            ))
+        done = await asyncio.gather(*jobs)
+
+        results: List[Optional[ExtractionResult]] = [None] * len(slot_defs)
+        for i, result in zip(others, done):
+            results[i] = result
+        if semantic:
+            for i, result in zip(semantic, done[-1]):
+                results[i] = result
+        return results
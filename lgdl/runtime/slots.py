@@ -1,15 +1,85 @@
 """Slot-filling manager for multi-turn conversations (v1.0 + Phase 2 semantic extraction)"""
 import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
 
 if TYPE_CHECKING:
     from .state import StateManager
 
+# Optional Aho-Corasick automaton for the fuzzy timeframe phrase scan (one pass over the text)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+_NUMBER_RE = re.compile(r'-?\d+\.?\d*')
+
+# Timeframe: number + unit or "a/an" + unit ("a/an hour", "a day"), one alternation
+_TIMEFRAME_RE = re.compile(
+    r'(?P<n>\d+)\s*(?P<u>second|sec|s|minute|min|m|hour|hr|h|day|d|week|wk|w|month|mo|year|yr|y)s?'
+    r'|an?\s+(?P<u2>second|minute|hour|day|week|month|year)'
+)
+
+# Phrases like "just now", "recently", "a while ago", "ago"
+_FUZZY_PHRASES = ('just now', 'recently', 'a while', 'earlier', 'today', 'yesterday', 'ago')
+_FUZZY_PHRASE_RE = re.compile("|".join(map(re.escape, _FUZZY_PHRASES)))
+if AHOCORASICK_AVAILABLE:
+    _FUZZY_PHRASE_AC = ahocorasick.Automaton()
+    for _phrase in _FUZZY_PHRASES:
+        _FUZZY_PHRASE_AC.add_word(_phrase, _phrase)
+    _FUZZY_PHRASE_AC.make_automaton()
+else:
+    _FUZZY_PHRASE_AC = None
+
+_DATE_RES = [
+    re.compile(r'\d{4}-\d{2}-\d{2}'),  # ISO format
+    re.compile(r'\d{1,2}/\d{1,2}/\d{2,4}'),  # US format
+    re.compile(r'\d{1,2}-\d{1,2}-\d{2,4}'),  # Dashed format
+]
+
+
+def _to_number(value: Any) -> Optional[float]:
+    """value as a float, or the first number in its text (None if there is none).
+
+    Numbers and plain digit strings ("7", "42") skip the regex scan.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value)
+    if text.isascii() and text.isdigit():
+        return float(text)
+    num_match = _NUMBER_RE.search(text)
+    return float(num_match.group()) if num_match else None
+
+
+@lru_cache(maxsize=1024)
+def _enum_lookup(enum_values: Tuple[Any, ...]) -> Tuple[Dict[str, Any], Tuple[Tuple[str, Any], ...]]:
+    """Lowercased lookups for an enum slot, built once per distinct tuple.
+
+    Returns (lowercase -> first such enum value, ((lowercase, enum value), ...)).
+    """
+    pairs = tuple((str(enum_val).lower(), enum_val) for enum_val in enum_values)
+    exact: Dict[str, Any] = {}
+    for enum_str, enum_val in pairs:
+        exact.setdefault(enum_str, enum_val)
+    return exact, pairs
+
+
+def _has_fuzzy_phrase(text: str) -> bool:
+    """Whether text contains any fuzzy timeframe phrase, in one pass."""
+    if _FUZZY_PHRASE_AC is not None:
+        return next(_FUZZY_PHRASE_AC.iter(text), None) is not None
+    return _FUZZY_PHRASE_RE.search(text) is not None
+
 
 class SlotManager:
     """Manages slot-filling for multi-turn conversations"""
 
+    # Moves whose required slots are kept before the identity cache is reset
+    REQUIRED_CACHE_SIZE = 1024
+
     def __init__(self, state_manager: Optional["StateManager"] = None, config=None):
         """
         Initialize SlotManager.
@@ -21,8 +91,13 @@ class SlotManager:
                     If None, loads from environment.
         """
         self.state_manager = state_manager
-        # In-memory storage (fallback or when no state_manager): {conversation_id: {move_id: {slot_name: value}}}
-        self._slot_values: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # In-memory storage (fallback or when no state_manager): {(conversation_id, move_id, slot_name): value}
+        self._slots: Dict[Tuple[str, str, str], Any] = {}
+        # Filled slot names per (conversation_id, move_id), in fill order, for
+        # enumeration and clearing (a dict used as an ordered set)
+        self._slots_by_move: Dict[Tuple[str, str], Dict[str, None]] = {}
+        # id(move) -> (move, required slot names without a default)
+        self._required: Dict[int, Tuple[dict, Tuple[str, ...]]] = {}
 
         # Phase 2: Initialize extraction engine
         from ..config import LGDLConfig
@@ -46,8 +121,8 @@ class SlotManager:
         Returns:
             List of slot names that are required but not filled
         """
-        slots = move.get("slots", {})
-        if not slots:
+        required = self._required_slots(move)
+        if not required:
             return []
 
         move_id = move["id"]
@@ -56,17 +131,29 @@ class SlotManager:
         if self.state_manager:
             filled = await self.state_manager.persistent_storage.get_all_slots_for_move(conversation_id, move_id)
         else:
-            filled = self._slot_values.get(conversation_id, {}).get(move_id, {})
+            filled = self._slots_by_move.get((conversation_id, move_id), ())
 
-        missing = []
-        for slot_name, slot_def in slots.items():
-            if slot_def.get("required", True):
-                if slot_name not in filled:
-                    # Check if there's a default value
-                    if slot_def.get("default") is None:
-                        missing.append(slot_name)
+        return [slot_name for slot_name in required if slot_name not in filled]
 
-        return missing
+    def _required_slots(self, move: dict) -> Tuple[str, ...]:
+        """Required slots without a default, computed once per compiled move.
+
+        Keyed by identity rather than stored on the move: compiled IR is
+        shared between runtimes and is not mutated. The entry holds the move
+        so its id cannot be reused while cached; the cache is reset when full
+        so replaced moves are not kept alive.
+        """
+        entry = self._required.get(id(move))
+        if entry is not None and entry[0] is move:
+            return entry[1]
+        required = tuple(
+            slot_name for slot_name, slot_def in move.get("slots", {}).items()
+            if slot_def.get("required", True) and slot_def.get("default") is None
+        )
+        if len(self._required) >= self.REQUIRED_CACHE_SIZE:
+            self._required.clear()  # recompiled or ad-hoc moves must not pile up
+        self._required[id(move)] = (move, required)
+        return required
 
     def validate_slot_value(
         self,
@@ -90,13 +177,10 @@ class SlotManager:
                 return True, str(value)
 
             elif slot_type == "number":
-                # Try to parse as number
-                if isinstance(value, (int, float)):
-                    return True, float(value)
-                # Try to extract number from string
-                num_match = re.search(r'-?\d+\.?\d*', str(value))
-                if num_match:
-                    return True, float(num_match.group())
+                # Parse as number, or extract the first number from the string
+                num = _to_number(value)
+                if num is not None:
+                    return True, num
                 return False, None
 
             elif slot_type == "range":
@@ -105,16 +189,10 @@ class SlotManager:
                 min_val = slot_def.get("min", 0)
                 max_val = slot_def.get("max", 100)
 
-                if isinstance(value, (int, float)):
-                    num = float(value)
-                else:
-                    num_match = re.search(r'-?\d+\.?\d*', str(value))
-                    if not num_match:
-                        return False, None
-                    num = float(num_match.group())
+                num = _to_number(value)
 
                 # Inclusive bounds check
-                if min_val <= num <= max_val:
+                if num is not None and min_val <= num <= max_val:
                     return True, num
                 return False, None
 
@@ -122,15 +200,15 @@ class SlotManager:
                 # Validate value is one of the enum options
                 enum_values = slot_def.get("enum_values", [])
                 value_str = str(value).lower()
+                exact, enum_lower = _enum_lookup(tuple(enum_values))
 
                 # Direct match
-                for enum_val in enum_values:
-                    if value_str == str(enum_val).lower():
-                        return True, enum_val
+                if value_str in exact:
+                    return True, exact[value_str]
 
                 # Partial match
-                for enum_val in enum_values:
-                    if value_str in str(enum_val).lower() or str(enum_val).lower() in value_str:
+                for enum_str, enum_val in enum_lower:
+                    if value_str in enum_str or enum_str in value_str:
                         return True, enum_val
 
                 return False, None
@@ -140,25 +218,12 @@ class SlotManager:
                 value_str = str(value).lower()
 
                 # Pattern: number + unit or "a/an" + unit
-                patterns = [
-                    r'(\d+)\s*(second|sec|s)s?',
-                    r'(\d+)\s*(minute|min|m)s?',
-                    r'(\d+)\s*(hour|hr|h)s?',
-                    r'(\d+)\s*(day|d)s?',
-                    r'(\d+)\s*(week|wk|w)s?',
-                    r'(\d+)\s*(month|mo)s?',
-                    r'(\d+)\s*(year|yr|y)s?',
-                    r'an?\s+(second|minute|hour|day|week|month|year)',  # "a/an hour", "a day"
-                ]
-
-                for pattern in patterns:
-                    match = re.search(pattern, value_str)
-                    if match:
-                        # Return original matched string
-                        return True, value_str
+                if _TIMEFRAME_RE.search(value_str):
+                    # Return original matched string
+                    return True, value_str
 
                 # Accept phrases like "just now", "recently", "a while ago", "ago"
-                if any(phrase in value_str for phrase in ['just now', 'recently', 'a while', 'earlier', 'today', 'yesterday', 'ago']):
+                if _has_fuzzy_phrase(value_str):
                     return True, value_str
 
                 return False, None
@@ -167,14 +232,8 @@ class SlotManager:
                 # Basic date parsing - accept various formats
                 # This is simplified; production would use dateutil or similar
                 value_str = str(value)
-                date_patterns = [
-                    r'\d{4}-\d{2}-\d{2}',  # ISO format
-                    r'\d{1,2}/\d{1,2}/\d{2,4}',  # US format
-                    r'\d{1,2}-\d{1,2}-\d{2,4}',  # Dashed format
-                ]
-
-                for pattern in date_patterns:
-                    if re.search(pattern, value_str):
+                for pattern in _DATE_RES:
+                    if pattern.search(value_str):
                         return True, value_str
 
                 return False, None
@@ -225,12 +284,15 @@ class SlotManager:
         if context is None:
             context = {}
 
-        # Use extraction engine (Phase 2)
-        result = await self.extraction_engine.extract_slot(
-            user_input=input_text.strip(),
-            slot_def=slot_def,
-            context=context
-        )
+        # Use extraction engine (Phase 2); regex-only slots skip the coroutine
+        input_text = input_text.strip()
+        result = self.extraction_engine.extract_slot_sync(input_text, slot_def, context)
+        if result is None:
+            result = await self.extraction_engine.extract_slot(
+                user_input=input_text,
+                slot_def=slot_def,
+                context=context
+            )
 
         if result.success:
             print(f"[Slot] Extracted value using {result.strategy_used}: {result.value} (conf={result.confidence:.2f})")
@@ -268,13 +330,8 @@ class SlotManager:
             )
         else:
             # Fallback to in-memory storage
-            if conversation_id not in self._slot_values:
-                self._slot_values[conversation_id] = {}
-
-            if move_id not in self._slot_values[conversation_id]:
-                self._slot_values[conversation_id][move_id] = {}
-
-            self._slot_values[conversation_id][move_id][slot_name] = value
+            self._slots[(conversation_id, move_id, slot_name)] = value
+            self._slots_by_move.setdefault((conversation_id, move_id), {})[slot_name] = None
 
         return True
 
@@ -314,7 +371,11 @@ class SlotManager:
         if self.state_manager:
             return await self.state_manager.persistent_storage.get_all_slots_for_move(conversation_id, move_id)
         else:
-            return self._slot_values.get(conversation_id, {}).get(move_id, {}).copy()
+            slots = self._slots
+            return {
+                slot_name: slots[(conversation_id, move_id, slot_name)]
+                for slot_name in self._slots_by_move.get((conversation_id, move_id), ())
+            }
 
     async def clear_slots(
         self,
@@ -331,9 +392,8 @@ class SlotManager:
         if self.state_manager:
             await self.state_manager.persistent_storage.clear_slots_for_move(conversation_id, move_id)
         else:
-            if conversation_id in self._slot_values:
-                if move_id in self._slot_values[conversation_id]:
-                    del self._slot_values[conversation_id][move_id]
+            for slot_name in self._slots_by_move.pop((conversation_id, move_id), ()):
+                del self._slots[(conversation_id, move_id, slot_name)]
 
     async def get_slot_value(
         self,
@@ -355,7 +415,7 @@ class SlotManager:
         if self.state_manager:
             return await self.state_manager.persistent_storage.get_slot(conversation_id, move_id, slot_name)
         else:
-            return self._slot_values.get(conversation_id, {}).get(move_id, {}).get(slot_name)
+            return self._slots.get((conversation_id, move_id, slot_name))
 
     async def has_slot(
         self,
@@ -378,4 +438,4 @@ class SlotManager:
             value = await self.state_manager.persistent_storage.get_slot(conversation_id, move_id, slot_name)
             return value is not None
         else:
-            return slot_name in self._slot_values.get(conversation_id, {}).get(move_id, {})
+            return (conversation_id, move_id, slot_name) in self._slots
@@ -1,5 +1,5 @@
 from lgdl.parser.parser import parse_lgdl
-from lgdl.parser.ir import compile_game
+from lgdl.parser.ir import compile_game, compile_regex, tokenize
 
 def test_parse_and_compile():
     game = parse_lgdl("examples/medical/game.lgdl")
@@ -9,3 +9,44 @@ def test_parse_and_compile():
     mv = next(m for m in ir["moves"] if m["id"]=="appointment_request")
     # Medical game uses medium confidence (0.5) for state management testing
     assert mv["threshold"] >= 0.5
+
+def test_compiled_patterns_carry_token_sets():
+    game = parse_lgdl("examples/medical/game.lgdl")
+    ir = compile_game(game)
+    for mv in ir["moves"]:
+        for trig in mv["triggers"]:
+            for pat in trig["patterns"]:
+                assert pat["_tokens"] == tokenize(pat["text"])
+
+def test_union_regex_agrees_with_patterns():
+    from lgdl.runtime.matcher import union_regex
+
+    game = parse_lgdl("examples/medical/game.lgdl")
+    ir = compile_game(game)
+    pats = [p for mv in ir["moves"] for t in mv["triggers"] for p in t["patterns"]]
+    inputs = [p["text"].replace("{", "").replace("}", "") for p in pats]
+    inputs += ["", "hello there", "completely unrelated words"]
+    for mv in ir["moves"]:
+        live = [p for t in mv["triggers"] for p in t["patterns"]]
+        union = union_regex(live)
+        for text in inputs:
+            expected = any(p["regex"].search(text) for p in live)
+            assert bool(union and union.search(text)) == expected
+
+def test_union_regex_skips_backreferences():
+    import re
+    from lgdl.runtime.matcher import indexed_union_regex, union_regex
+
+    plain = {"regex": re.compile(r"hello (?P<name>\w+)")}
+    for src in (r"(?P<x>\w+) and (?P=x)", r"(\w+) or \1"):
+        live = [plain, {"regex": re.compile(src)}]
+        assert union_regex(live) is None
+        assert indexed_union_regex(live) is None
+    # An escaped backslash before a digit is not a backreference
+    assert union_regex([{"regex": re.compile(r"a\\1")}]).search("A\\1")
+
+def test_compile_regex_case_insensitive_with_params():
+    rx = compile_regex("pain in {location}")
+    assert rx.search("PAIN IN my arm").groupdict() == {"location": "my arm"}
+    # Syntax RE2 rejects still compiles (via the re fallback)
+    assert compile_regex("chest(?! pain)").search("Chest tightness")
@@ -168,6 +168,171 @@ async def test_llm_semantic_matcher_with_history():
     assert "confidence" in result
 
 
+@pytest.mark.asyncio
+async def test_llm_semantic_matcher_cache(monkeypatch, tmp_path):
+    """Repeated inputs reuse the cached LLM result; other patterns do not."""
+    from lgdl.runtime.matcher import EmbeddingClient, SemanticCache
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    class CountingLLM(MockLLMClient):
+        calls = 0
+
+        async def complete(self, *args, **kwargs):
+            CountingLLM.calls += 1
+            return await super().complete(*args, **kwargs)
+
+    matcher = LLMSemanticMatcher(
+        CountingLLM(default_confidence=0.8),
+        cache=SemanticCache(EmbeddingClient())
+    )
+    context = MatchingContext(game_name="test_game")
+
+    first = await matcher.match("my chest hurts", "pain in {location}", context)
+    second = await matcher.match("my chest hurts", "pain in {location}", context)
+    other = await matcher.match("my chest hurts", "I feel sick", context)
+
+    assert first["stage"] == "llm_semantic"
+    assert second["stage"] == "llm_semantic_cached"
+    assert second["confidence"] == first["confidence"]
+    assert second["cost"] == 0.0
+    assert other["stage"] == "llm_semantic"
+
+    assert CountingLLM.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_embeds_off_the_event_loop(monkeypatch, tmp_path):
+    """Cache lookups embed the input in a worker thread, once per input."""
+    import threading
+    from lgdl.runtime.matcher import EmbeddingClient, SemanticCache
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    emb = EmbeddingClient()
+    threads = []
+
+    def embed(text):
+        threads.append(threading.get_ident())
+        return emb._offline_embedding(text)
+
+    emb.embed = embed
+    matcher = LLMSemanticMatcher(MockLLMClient(default_confidence=0.8), cache=SemanticCache(emb))
+    context = MatchingContext(game_name="test_game")
+
+    await matcher.match_batch("my chest hurts", ["pain in {location}", "I feel sick"], context)
+    await matcher.match_batch("my chest aches", ["pain in {location}", "I feel sick"], context)
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_llm_semantic_matcher_batch():
+    """match_batch scores every pattern with a single LLM call."""
+    class CountingLLM(MockLLMClient):
+        calls = 0
+
+        async def complete(self, *args, **kwargs):
+            CountingLLM.calls += 1
+            return await super().complete(*args, **kwargs)
+
+    matcher = LLMSemanticMatcher(CountingLLM(default_confidence=0.7))
+    context = MatchingContext(game_name="test_game")
+    patterns = ["pain in {location}", "I feel sick", "I need help"]
+
+    results = await matcher.match_batch("my chest hurts", patterns, context)
+
+    assert CountingLLM.calls == 1
+    assert len(results) == len(patterns)
+    assert all(r["confidence"] == 0.7 for r in results)
+    assert all(r["stage"] == "llm_semantic" for r in results)
+
+    _, prompt = matcher._build_batch_prompt("my chest hurts", patterns, context)
+    for n, pattern in enumerate(patterns, start=1):
+        assert f'{n}. "{pattern}"' in prompt
+
+
+@pytest.mark.asyncio
+async def test_llm_semantic_matcher_batches_run_concurrently():
+    """Large candidate sets are split into batches issued concurrently."""
+    import asyncio
+
+    class SlowLLM(MockLLMClient):
+        in_flight = 0
+        peak = 0
+        calls = 0
+
+        async def complete(self, *args, **kwargs):
+            SlowLLM.calls += 1
+            SlowLLM.in_flight += 1
+            SlowLLM.peak = max(SlowLLM.peak, SlowLLM.in_flight)
+            await asyncio.sleep(0.01)
+            SlowLLM.in_flight -= 1
+            return await super().complete(*args, **kwargs)
+
+    matcher = LLMSemanticMatcher(SlowLLM(default_confidence=0.6), max_concurrency=2)
+    matcher.BATCH_SIZE = 2
+    patterns = [f"pattern {n}" for n in range(5)]
+
+    results = await matcher.match_batch("input", patterns, MatchingContext(game_name="g"))
+
+    assert SlowLLM.calls == 3
+    assert SlowLLM.peak == 2
+    assert [r["confidence"] for r in results] == [0.6] * 5
+
+
+def test_llm_system_prompt_is_static_per_game():
+    """The system prompt carries the game header and does not vary per call."""
+    matcher = LLMSemanticMatcher(MockLLMClient())
+    context = MatchingContext(
+        game_name="medical_triage",
+        game_description="Emergency triage",
+        vocabulary={"heart": ["ticker", "chest"]}
+    )
+
+    system1, user1 = matcher._build_prompt("my ticker hurts", "pain in {location}", context)
+    system2, user2 = matcher._build_prompt("I feel sick", "I don't feel good", context)
+
+    assert system1 is system2
+    assert "medical_triage" in system1
+    assert "'heart' also means: ticker, chest" in system1
+    assert "my ticker hurts" in user1 and "heart" in user1
+    assert "medical_triage" not in user2
+
+
+def test_llm_system_prompt_cache_is_lru_bounded(monkeypatch):
+    """Only the most recently used system prompts (and vocabularies) are kept."""
+    monkeypatch.setattr(LLMSemanticMatcher, "SYSTEM_PROMPT_CACHE_SIZE", 2)
+    matcher = LLMSemanticMatcher(MockLLMClient())
+    contexts = [MatchingContext(game_name=f"g{i}", vocabulary={"t": [str(i)]}) for i in range(3)]
+
+    first = matcher._system_prompt(contexts[0])
+    matcher._system_prompt(contexts[1])
+    assert matcher._system_prompt(contexts[0]) is first  # refreshed, so g1 is evicted next
+    matcher._system_prompt(contexts[2])
+
+    assert [key[0] for key in matcher._system_prompts] == ["g0", "g2"]
+
+
+def test_llm_turn_prefix_reused_across_patterns():
+    """The per-turn prompt prefix is built once and refreshed when history changes."""
+    matcher = LLMSemanticMatcher(MockLLMClient())
+    context = MatchingContext(game_name="test", vocabulary={"heart": ["ticker"]})
+    context.add_turn("assistant", "What brings you in?")
+
+    prefix = matcher._turn_prefix("my ticker hurts", context)
+    _, user1 = matcher._build_prompt("my ticker hurts", "chest pain", context)
+    _, user2 = matcher._build_prompt("my ticker hurts", "heart pain", context)
+
+    assert user1.startswith(prefix) and user2.startswith(prefix)
+    assert matcher._turn_prefix("my ticker hurts", context) is prefix
+
+    context.add_turn("user", "my ticker hurts")
+    assert "user: my ticker hurts" in matcher._turn_prefix("my ticker hurts", context)
+
+
 # ============================================================================
 # Unit Tests: Cascade Matcher
 # ============================================================================
@@ -197,6 +362,22 @@ def test_cascade_matcher_initialization_enabled():
     # Should have LLM matcher
     assert cascade.llm_matcher is not None
 
+    # The semantic cache does not force the lazy embedding client
+    assert cascade._emb is None
+    assert cascade.llm_matcher.cache.emb is cascade.emb
+
+
+@pytest.mark.asyncio
+async def test_cascade_embedding_client_created_lazily(test_game_with_vocabulary, test_config_disabled):
+    """Lexical-only turns never construct the embedding client."""
+    cascade = CascadeMatcher(test_config_disabled)
+
+    result = await cascade.match("I have pain in my chest", test_game_with_vocabulary)
+
+    assert result["stage"] == "lexical"
+    assert cascade._emb is None
+    assert cascade.emb is cascade.emb
+
 
 @pytest.mark.asyncio
 async def test_cascade_lexical_short_circuit(test_game_with_vocabulary, test_config_enabled):
@@ -237,6 +418,134 @@ async def test_cascade_embedding_stage(test_game_with_vocabulary, test_config_en
     assert result["stage"] in ["lexical", "embedding", "llm_semantic"]
 
 
+@pytest.mark.asyncio
+async def test_cascade_embeds_patterns_once(test_game_with_vocabulary, test_config_disabled):
+    """Pattern embeddings are computed once per game; each turn embeds only the input."""
+    cascade = CascadeMatcher(test_config_disabled)
+    emb = cascade.emb
+    emb.enabled = True
+    embedded = []
+
+    def embed(text):
+        embedded.append(text)
+        return emb._offline_embedding(text)
+
+    emb.embed = embed
+    emb.embed_many = lambda texts: [emb._offline_embedding(t) for t in texts]
+
+    await cascade.match("My chest hurts", test_game_with_vocabulary)
+    embedded.clear()
+    result = await cascade.match("something feels wrong", test_game_with_vocabulary)
+
+    assert embedded == ["something feels wrong"]
+    assert result["stage"] in ("lexical", "embedding")
+
+    # Matrix-scored confidences agree with per-pattern cosine scoring
+    row_of, matrix = cascade._pattern_matrix(test_game_with_vocabulary)
+    text = "something feels wrong"
+    scores = matrix @ emb._offline_embedding(text)
+    sims = {pat_id: float(scores[row]) for pat_id, row in row_of.items()}
+    for move in test_game_with_vocabulary["moves"]:
+        batched = cascade._embedding_match(text, move, sims=sims)
+        pairwise = cascade._embedding_match(text, move)
+        assert batched[0] == pytest.approx(pairwise[0], abs=1e-5)
+        assert batched[2] == pairwise[2]
+
+
+@pytest.mark.asyncio
+async def test_cascade_embeds_input_off_the_event_loop(test_game_with_vocabulary, test_config_disabled):
+    """The blocking input embedding runs in a worker thread, not on the loop."""
+    import threading
+
+    cascade = CascadeMatcher(test_config_disabled)
+    emb = cascade.emb
+    emb.enabled = True
+    threads = []
+
+    def embed(text):
+        threads.append(threading.get_ident())
+        return emb._offline_embedding(text)
+
+    emb.embed = embed
+    emb.embed_many = lambda texts: [emb._offline_embedding(t) for t in texts]
+
+    await cascade.match("something feels wrong", test_game_with_vocabulary)
+
+    assert threads and threading.get_ident() not in threads
+
+
+def test_cascade_lexical_set_matches_full_scan(test_game_with_vocabulary, test_config_disabled):
+    """RE2 set prefiltering finds the same lexical matches as scanning every regex."""
+    cascade = CascadeMatcher(test_config_disabled)
+    for text in ["I have chest pain", "my ticker hurts", "nothing relevant", ""]:
+        hits = cascade._lexical_hits(text, test_game_with_vocabulary)
+        for move in test_game_with_vocabulary["moves"]:
+            assert cascade._lexical_match(text, move, hits) == cascade._lexical_match(text, move)
+
+
+def test_cascade_game_caches_are_bounded(monkeypatch, test_game_with_vocabulary, test_config_disabled):
+    """Reloaded (copied) games do not accumulate in the per-game identity caches."""
+    import copy
+
+    monkeypatch.setattr(CascadeMatcher, "GAME_CACHE_SIZE", 2)
+    cascade = CascadeMatcher(test_config_disabled)
+    emb = cascade.emb
+    emb.enabled = True
+    emb.embed_many = lambda texts: [emb._offline_embedding(t) for t in texts]
+
+    for _ in range(4):
+        game = copy.deepcopy(test_game_with_vocabulary)
+        cascade._lexical_hits("I have chest pain", game)
+        assert cascade._pattern_matrix(game) is not None
+        assert len(cascade._lexical_sets) <= 2
+        assert len(cascade._pattern_mats) <= 2
+
+
+def test_cascade_lexical_union_fallback_matches_full_scan(
+    monkeypatch, test_game_with_vocabulary, test_config_disabled
+):
+    """Without RE2, per-move indexed unions pick the same pattern as scanning in order."""
+    from lgdl.runtime import matcher
+
+    monkeypatch.setattr(matcher, "RE2_AVAILABLE", False)
+    cascade = CascadeMatcher(test_config_disabled)
+    texts = [
+        "back pain, and I have pain in my chest",  # 2nd pattern matches further left
+        "I have pain in my chest",
+        "something is wrong",
+        "nothing relevant",
+    ]
+    for text in texts:
+        hits = cascade._lexical_hits(text, test_game_with_vocabulary)
+        assert hits is not None
+        for move in test_game_with_vocabulary["moves"]:
+            assert cascade._lexical_match(text, move, hits) == cascade._lexical_match(text, move)
+
+    move = test_game_with_vocabulary["moves"][0]
+    hits = cascade._lexical_hits(texts[0], test_game_with_vocabulary)
+    assert cascade._lexical_match(texts[0], move, hits)[2] == "I have pain in my {location}"
+
+
+@pytest.mark.asyncio
+async def test_cascade_skips_llm_without_vocabulary_or_signal(test_game_with_vocabulary, test_config_enabled):
+    """Stage 3 is skipped for low-scoring moves when the input has no vocabulary terms."""
+    cascade = CascadeMatcher(test_config_enabled)
+    context = MatchingContext.from_state(test_game_with_vocabulary, None)
+    batches = []
+
+    async def match_batch(text, patterns, ctx):
+        batches.append(patterns)
+        return [{"confidence": 0.0, "reasoning": "", "cost": 0.0, "stage": "llm_semantic"} for _ in patterns]
+
+    cascade.llm_matcher.match_batch = match_batch
+
+    await cascade.match("qqq zzz", test_game_with_vocabulary, context)
+    assert batches == []
+
+    await cascade.match("my ticker is acting up", test_game_with_vocabulary, context)
+    assert len(batches) == 1 and len(batches[0]) == 4
+
+
 # ============================================================================
 # Integration Tests: Vocabulary Compilation
 # ============================================================================
@@ -358,6 +667,101 @@ def test_matching_context_relevant_vocabulary():
     assert "head" not in relevant
 
 
+def test_relevant_vocabulary_automaton_matches_scan(monkeypatch):
+    """The Aho-Corasick lookup returns what the substring scan returns."""
+    pytest.importorskip("ahocorasick")
+    from lgdl.runtime import matching_context
+
+    vocabulary = {
+        "heart": ["ticker", "chest"],
+        "stomach": ["belly", "gut"],
+        "head": ["noggin", "skull"],
+        "ear": ["lobe"]
+    }
+    texts = ["My TICKER hurts", "gut and noggin", "heartburn", "nothing here", ""]
+
+    context = MatchingContext(game_name="test", vocabulary=vocabulary)
+    fast = [context.get_relevant_vocabulary(t) for t in texts]
+    monkeypatch.setattr(matching_context, "AHOCORASICK_AVAILABLE", False)
+    context = MatchingContext(game_name="test", vocabulary=vocabulary)
+    slow = [context.get_relevant_vocabulary(t) for t in texts]
+
+    assert fast == slow
+    assert list(fast[2]) == ["heart", "ear"]
+
+
+def test_relevant_vocabulary_scan_without_automaton(monkeypatch):
+    """The substring scan finds shared synonyms and returns {} when nothing occurs."""
+    from lgdl.runtime import matching_context
+
+    monkeypatch.setattr(matching_context, "AHOCORASICK_AVAILABLE", False)
+    context = MatchingContext(
+        game_name="test",
+        vocabulary={"heart": ["Chest", "ticker"], "lungs": ["chest"]}
+    )
+
+    assert context.get_relevant_vocabulary("tight CHEST") == {
+        "heart": ["Chest", "ticker"], "lungs": ["chest"]
+    }
+    assert context.get_relevant_vocabulary("nothing here") == {}
+
+
+def test_vocabulary_index_shared_across_turns(monkeypatch):
+    """Contexts rebuilt per turn reuse one index per vocabulary; the cache is bounded."""
+    from lgdl.runtime import matching_context
+
+    game = {"name": "g", "vocabulary": {"heart": ["ticker"]}}
+    first = MatchingContext.from_state(game)
+    assert first.get_relevant_vocabulary("my ticker") == {"heart": ["ticker"]}
+    index, _ = matching_context._vocabulary_index(game["vocabulary"])
+
+    second = MatchingContext.from_state(game)
+    assert second.get_relevant_vocabulary("my heart") == {"heart": ["ticker"]}
+    assert matching_context._vocabulary_index(game["vocabulary"])[0] is index
+
+    monkeypatch.setattr(matching_context, "VOCAB_INDEX_CACHE_SIZE", 2)
+    for i in range(5):
+        matching_context._vocabulary_index({f"term{i}": []})
+        assert len(matching_context._vocab_indexes) <= 2
+
+
+def test_relevant_vocabulary_memoized_per_text():
+    """Repeated lookups for the same text reuse the last result."""
+    context = MatchingContext(game_name="test", vocabulary={"heart": ["ticker"]})
+
+    first = context.get_relevant_vocabulary("my ticker")
+    assert context.get_relevant_vocabulary("my ticker") is first
+    # The memo belongs to the vocabulary, so a context rebuilt for it hits too
+    rebuilt = MatchingContext(game_name="test", vocabulary=context.vocabulary)
+    assert rebuilt.get_relevant_vocabulary("my ticker") is first
+    assert context.get_relevant_vocabulary("my heart") == {"heart": ["ticker"]}
+    assert context.get_relevant_vocabulary("nothing") == {}
+
+
+def test_matching_context_history_is_bounded():
+    """History and successful patterns keep only the most recent entries."""
+    context = MatchingContext(game_name="test", conversation_history=[{"role": "user", "content": "0"}])
+
+    for i in range(1, 15):
+        context.add_turn("user", str(i))
+        context.add_successful_pattern(f"pattern {i}")
+
+    assert len(context.conversation_history) == 10
+    assert context.conversation_history[0]["content"] == "5"
+    assert [t["content"] for t in context.get_recent_history(max_turns=3)] == ["12", "13", "14"]
+    assert context.get_recent_patterns(max_patterns=2) == ["pattern 13", "pattern 14"]
+    assert len(context.successful_patterns) == 10
+
+
+def test_matching_context_uses_slots():
+    """MatchingContext instances carry no per-instance __dict__."""
+    context = MatchingContext.empty("test")
+
+    assert not hasattr(context, "__dict__")
+    with pytest.raises(AttributeError):
+        context.unknown_attribute = 1
+
+
 # ============================================================================
 # Integration Tests: Runtime with Cascade
 # ============================================================================
@@ -712,6 +1116,18 @@ def test_cost_estimation():
     assert cost == 0.0
 
 
+def test_schema_description_from_serialized_schema():
+    """Schema descriptions format the same from orjson bytes or json text."""
+    import json
+    from lgdl.runtime.llm_client import _format_schema_json, _json_dumps
+
+    schema = LLMSemanticMatcher.RESPONSE_SCHEMA
+    description = _format_schema_json(_json_dumps(schema))
+
+    assert description == _format_schema_json(json.dumps(schema))
+    assert "- confidence (number): How well user input matches pattern [range: 0.0-1.0]" in description
+
+
 def test_metrics_cost_tracking():
     """Test that metrics track costs correctly."""
     metrics = LGDLMetrics()
@@ -8,7 +8,9 @@ import os, sqlite3, tempfile
 import pytest
 import numpy as np
 from pathlib import Path
-from lgdl.runtime.matcher import EmbeddingClient, cosine
+from lgdl.runtime.matcher import EmbeddingClient, TwoStageMatcher, cosine
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
 
 
 @pytest.fixture
@@ -33,7 +35,7 @@ def test_cache_persistence(clean_env):
     client = EmbeddingClient()
     vec1 = client.embed("test phrase")
     vec2 = client.embed("test phrase")
-    assert vec1 == vec2  # Same from cache
+    assert np.array_equal(vec1, vec2)  # Same from cache
 
 
 def test_offline_deterministic(clean_env):
@@ -44,7 +46,7 @@ def test_offline_deterministic(clean_env):
     vec1 = client1.embed("hello world")
     vec2 = client2.embed("hello world")
 
-    assert vec1 == vec2
+    assert np.array_equal(vec1, vec2)
     assert len(vec1) == 256  # Expected dimensionality
 
 
@@ -55,7 +57,7 @@ def test_offline_different_texts(clean_env):
     vec_hello = client.embed("hello world")
     vec_goodbye = client.embed("goodbye world")
 
-    assert vec_hello != vec_goodbye
+    assert not np.array_equal(vec_hello, vec_goodbye)
 
 
 def test_offline_similarity_properties(clean_env):
@@ -75,6 +77,16 @@ def test_offline_similarity_properties(clean_env):
     assert sim_diff < 1.0
 
 
+def test_normalized_cosine_matches_full(clean_env):
+    """Client vectors are unit length, so the dot-product shortcut agrees."""
+    client = EmbeddingClient()
+    a = client.embed("book an appointment")
+    b = client.embed("make an appointment")
+
+    assert np.linalg.norm(a) == pytest.approx(1.0, abs=1e-6)
+    assert cosine(a, b, normalized=True) == pytest.approx(cosine(a, b), abs=1e-6)
+
+
 def test_cache_versioning(clean_env):
     """Cache keys include model and version."""
     client = EmbeddingClient()
@@ -93,9 +105,131 @@ def test_cache_versioning(clean_env):
     assert row[1] == client.version_lock
 
 
+def test_cache_stores_float32_blobs(clean_env):
+    """Embeddings are stored as raw float32 bytes and returned as arrays."""
+    client = EmbeddingClient()
+    vec = client.embed("binary storage")
+
+    conn = sqlite3.connect(client.cache_db)
+    blob, encoding = conn.execute(
+        "SELECT embedding, encoding FROM embeddings WHERE text = ?",
+        ("binary storage",)
+    ).fetchone()
+    conn.close()
+
+    assert encoding == "f32"
+    assert len(blob) == 4 * len(vec)
+    assert vec.dtype == np.float32
+
+
+def test_int8_cache_encoding(clean_env, monkeypatch):
+    """EMBEDDING_CACHE_DTYPE=int8 stores scale + int8 codes and round-trips closely."""
+    monkeypatch.setenv("EMBEDDING_CACHE_DTYPE", "int8")
+    client = EmbeddingClient()
+    exact = client._offline_embedding("quantize me")
+    vec = client.embed("quantize me")
+
+    conn = sqlite3.connect(client.cache_db)
+    blob, encoding = conn.execute(
+        "SELECT embedding, encoding FROM embeddings WHERE text = ?", ("quantize me",)
+    ).fetchone()
+    conn.close()
+    assert encoding == "i8"
+    assert len(blob) == 4 + exact.size
+
+    assert cosine(vec, exact) > 0.999
+    assert np.array_equal(EmbeddingClient().embed("quantize me"), vec)
+
+
+def test_legacy_json_rows_migrated(clean_env):
+    """Rows written by the JSON-text cache are decoded and rewritten as float32."""
+    import json
+
+    clean_env.mkdir()
+    db = clean_env / "text-embedding-3-small_2025-01.db"
+    conn = sqlite3.connect(db)
+    conn.execute("""
+        CREATE TABLE embeddings (
+            text_hash TEXT PRIMARY KEY, text TEXT, model TEXT, version TEXT,
+            embedding BLOB, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    legacy = [0.6, 0.8]
+    client = EmbeddingClient()  # adds the encoding column, defaulting old rows to 'json'
+    conn.execute(
+        "INSERT INTO embeddings (text_hash, text, model, version, embedding) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (client._key("legacy"), "legacy", client.model, client.version_lock, json.dumps(legacy))
+    )
+    conn.commit()
+    conn.close()
+
+    client = EmbeddingClient()
+    vec = client.embed("legacy")
+    assert np.allclose(vec, legacy)
+
+    conn = sqlite3.connect(db)
+    encoding = conn.execute(
+        "SELECT encoding FROM embeddings WHERE text = ?", ("legacy",)
+    ).fetchone()[0]
+    conn.close()
+    assert encoding == "f32"
+
+
+def test_embed_many_matches_embed(clean_env):
+    """Batch embedding returns vectors in input order, consistent with embed()."""
+    client = EmbeddingClient()
+    cached = client.embed("already cached")
+
+    texts = ["first text", "already cached", "second text", "first text"]
+    vecs = client.embed_many(texts)
+
+    assert len(vecs) == len(texts)
+    assert np.array_equal(vecs[1], cached)
+    assert np.array_equal(vecs[0], vecs[3])
+    for text, vec in zip(texts, vecs):
+        assert np.array_equal(client.embed(text), vec)
+
+    conn = sqlite3.connect(client.cache_db)
+    count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+    conn.close()
+    assert count == 3
+
+
+def test_memory_lru_skips_sqlite(clean_env, monkeypatch):
+    """Hot embeddings are served from the in-memory LRU without touching SQLite."""
+    client = EmbeddingClient()
+    vec = client.embed("hot text")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("SQLite consulted for a hot embedding")
+
+    monkeypatch.setattr(client, "_get_cached", fail)
+    monkeypatch.setattr(client, "_get_cached_many", fail)
+    assert np.array_equal(client.embed("hot text"), vec)
+    assert np.array_equal(client.embed_many(["hot text"])[0], vec)
+
+
+def test_memory_lru_evicts_oldest(clean_env, monkeypatch):
+    """The LRU is bounded; evicted entries are reloaded from SQLite."""
+    monkeypatch.setattr(EmbeddingClient, "MEMORY_CACHE_SIZE", 2)
+    client = EmbeddingClient()
+    first = client.embed("one")
+    client.embed("two")
+    client.embed("three")
+
+    assert len(client._mem) == 2
+    assert client._mem_get(client._key("one")) is None
+    assert np.array_equal(client.embed("one"), first)
+
+
 def test_cache_db_created(clean_env):
-    """Cache database file is created."""
+    """Cache database file is created on first use, not at construction."""
     client = EmbeddingClient()
+    assert not client.cache_db.exists()
+
+    client.embed("hello")
     assert client.cache_db.exists()
     assert client.cache_db.suffix == ".db"
 
@@ -109,7 +243,7 @@ def test_cache_survives_restart(clean_env):
     client2 = EmbeddingClient()
     vec2 = client2.embed("persistence test")
 
-    assert vec1 == vec2
+    assert np.array_equal(vec1, vec2)
 
 
 def test_cache_disabled(monkeypatch, tmp_path):
@@ -126,7 +260,7 @@ def test_cache_disabled(monkeypatch, tmp_path):
         vec1 = client.embed("test")
         vec2 = client.embed("test")
 
-        assert vec1 == vec2
+        assert np.array_equal(vec1, vec2)
         assert not client.cache_enabled
         assert not hasattr(client, 'cache_db') or not client.cache_db.exists()
     finally:
@@ -186,16 +320,38 @@ def test_model_and_version_configuration(monkeypatch, clean_env):
 
 
 def test_cache_key_generation(clean_env):
-    """Cache keys are SHA256 hashes of text."""
+    """Cache keys are 128-bit BLAKE2b hashes of text."""
     import hashlib
 
     client = EmbeddingClient()
     text = "test text"
 
-    expected_key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    expected_key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
     actual_key = client._key(text)
 
     assert actual_key == expected_key
+    assert len(actual_key) == 32
+
+
+def test_sha256_keyed_rows_rekeyed(clean_env):
+    """Rows cached under the old sha256 keys are found after reopening."""
+    import hashlib
+
+    client = EmbeddingClient()
+    vec = client.embed("old key")
+    client.close()
+
+    conn = sqlite3.connect(client.cache_db)
+    conn.execute(
+        "UPDATE embeddings SET text_hash = ? WHERE text = ?",
+        (hashlib.sha256(b"old key").hexdigest(), "old key")
+    )
+    conn.commit()
+    conn.close()
+
+    client = EmbeddingClient()
+    assert client._get_cached(client._key("old key")) is not None
+    assert np.array_equal(client.embed("old key"), vec)
 
 
 def test_different_versions_different_cache(monkeypatch, tmp_path):
@@ -218,7 +374,7 @@ def test_different_versions_different_cache(monkeypatch, tmp_path):
 
         # Both should get same offline embedding (deterministic)
         # but they'll be cached separately
-        assert vec1 == vec2
+        assert np.array_equal(vec1, vec2)
 
         # Verify different cache files were created
         assert client1.cache_db != client2.cache_db
@@ -226,3 +382,177 @@ def test_different_versions_different_cache(monkeypatch, tmp_path):
         assert client2.cache_db.exists()
     finally:
         os.chdir(original_cwd)
+
+
+def _offline_matcher():
+    """TwoStageMatcher whose 'online' embeddings come from the offline encoder."""
+    matcher = TwoStageMatcher()
+    emb = matcher.emb
+    emb.enabled = True
+    emb.embed = emb._offline_embedding
+    emb.embed_many = lambda texts: [emb._offline_embedding(t) for t in texts]
+    return matcher
+
+
+def test_prepare_plan_cache_is_bounded(clean_env, monkeypatch):
+    """Recompiled games do not accumulate plans in the identity cache."""
+    from lgdl.parser.parser import parse_lgdl
+    from lgdl.parser.ir import compile_game
+
+    monkeypatch.setattr(TwoStageMatcher, "PLAN_CACHE_SIZE", 2)
+    game = parse_lgdl(str(EXAMPLES / "medical" / "game.lgdl"))
+    matcher = _offline_matcher()
+
+    for _ in range(4):
+        compiled = compile_game(game)
+        plan = matcher.prepare(compiled)
+        assert matcher.prepare(compiled) is plan
+        assert len(matcher._plans) <= 2
+
+
+def test_pattern_matrix_matches_pairwise_cosine(clean_env):
+    """Stacked pattern matrix scores agree with per-pattern cosine similarity."""
+    from lgdl.parser.parser import parse_lgdl
+    from lgdl.parser.ir import compile_game
+
+    compiled = compile_game(parse_lgdl(str(EXAMPLES / "medical" / "game.lgdl")))
+    matcher = _offline_matcher()
+    plan = matcher.prepare(compiled)
+
+    assert plan["pat_mat"].shape == (len(plan["rows"]), 256)
+    assert matcher.prepare(compiled) is plan  # cached per game
+
+    text = "I need to see Dr. Smith"
+    sims = plan["pat_mat"] @ matcher.emb.embed(text)
+    for row, (_, pat) in enumerate(plan["rows"]):
+        expected = cosine(matcher.emb.embed(text), matcher.emb.embed(pat["text"]))
+        assert sims[row] == pytest.approx(expected, abs=1e-5)
+
+    result = matcher.match(text, compiled)
+    assert result["move"]["id"] == "appointment_request"
+
+
+def test_candidate_rows_match_full_scoring(clean_env):
+    """Scoring only candidate rows agrees with the full GEMV on those rows."""
+    rng = np.random.default_rng(0)
+    pat_mat = rng.random((10, 8), dtype=np.float32)
+    pat_mat /= np.linalg.norm(pat_mat, axis=1, keepdims=True)
+    text_vec = pat_mat[3]
+
+    full = TwoStageMatcher._score_rows(pat_mat, text_vec, None)
+    candidates = np.array([2, 3, 7])
+    sparse = TwoStageMatcher._score_rows(pat_mat, text_vec, candidates)
+
+    assert np.allclose(sparse[candidates], full[candidates])
+    assert not sparse[[0, 1, 4, 5, 6, 8, 9]].any()
+
+
+def test_match_batch_matches_single_matches(clean_env):
+    """match_batch embeds inputs together and returns what match() returns."""
+    from lgdl.parser.parser import parse_lgdl
+    from lgdl.parser.ir import compile_game
+
+    compiled = compile_game(parse_lgdl(str(EXAMPLES / "medical" / "game.lgdl")))
+    matcher = _offline_matcher()
+    batches = []
+    embed_many = matcher.emb.embed_many
+    matcher.emb.embed_many = lambda texts: batches.append(list(texts)) or embed_many(texts)
+    texts = ["I need to see Dr. Smith", "appointment please", "hello"]
+
+    matcher.prepare(compiled)
+    batches.clear()
+    batched = matcher.match_batch(texts, compiled)
+
+    assert batches == [texts]
+    for text, result in zip(texts, batched):
+        single = matcher.match(text, compiled)
+        assert result["move"] is single["move"]
+        assert result["score"] == pytest.approx(single["score"])
+        assert result["params"] == single["params"]
+
+
+def test_matrix_scores_match_scalar_blend(clean_env):
+    """Vectorized pattern scores agree with the per-pattern scalar formulas."""
+    from lgdl.parser.parser import parse_lgdl
+    from lgdl.parser.ir import compile_game
+
+    compiled = compile_game(parse_lgdl(str(EXAMPLES / "medical" / "game.lgdl")))
+    matcher = _offline_matcher()
+    plan = matcher.prepare(compiled)
+    text = "I need to see Dr. Smith"
+
+    state = {"plan": plan}
+    scores = matcher._matrix_scores(text, state)
+    for row, (_, pat) in enumerate(plan["rows"]):
+        sem = matcher._semantic(text, pat, state)
+        mods = pat.get("mods", [])
+        if "strict" in mods:
+            expected = max(0.92, sem)
+        elif "fuzzy" in mods:
+            expected = sem
+        else:
+            expected = max(0.75, 0.7 * sem + 0.3 * 0.75)
+        assert scores[row] == pytest.approx(expected, abs=1e-6)
+
+
+def test_device_scoring_falls_back_to_numpy(clean_env, monkeypatch):
+    """A device-backed plan scores like the NumPy path (or falls back to it)."""
+    import warnings
+    from lgdl.parser.parser import parse_lgdl
+    from lgdl.parser.ir import compile_game
+
+    compiled = compile_game(parse_lgdl(str(EXAMPLES / "medical" / "game.lgdl")))
+    text = "I need to see Dr. Smith"
+    expected = _offline_matcher().match(text, compiled)
+
+    monkeypatch.setattr(TwoStageMatcher, "GPU_MIN_ELEMENTS", 1)
+    matcher = _offline_matcher()
+    matcher.device = "cpu"
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        result = matcher.match(text, compiled)
+
+    assert result["move"]["id"] == expected["move"]["id"]
+    assert result["score"] == pytest.approx(expected["score"], abs=1e-2)
+
+
+def test_strict_hit_skips_embedding(clean_env):
+    """A strict regex hit decides the score without embedding the input."""
+    from lgdl.parser.parser import parse_lgdl_source
+    from lgdl.parser.ir import compile_game
+
+    source = """
+game strict_test {
+    moves {
+        move see_doctor {
+            when user says something like: ["I need to see Dr. {doctor}" (strict)]
+            confidence: 0.8
+            when confident {
+                respond with: "ok"
+            }
+        }
+    }
+}
+"""
+    compiled = compile_game(parse_lgdl_source(source)[0])
+    matcher = _offline_matcher()
+    matcher.prepare(compiled)
+
+    calls = []
+    offline = matcher.emb._offline_embedding
+    matcher.emb.embed = lambda text: calls.append(text) or offline(text)
+
+    result = matcher.match("I need to see Dr. Smith", compiled)
+    assert result["move"]["id"] == "see_doctor"
+    assert result["score"] == 0.92
+    assert calls == []
+
+
+def test_offline_embedding_is_process_independent(clean_env):
+    """Offline bigram hashing does not depend on Python's randomized hash()."""
+    client = EmbeddingClient()
+    vec = client.embed("ab")
+
+    expected = np.zeros(256, dtype=np.float32)
+    expected[(((ord("a") << 8) | ord("b")) * 2654435761 & 0xFFFFFFFF) >> 24] = 1.0
+    assert np.array_equal(vec, expected)
@@ -163,6 +163,33 @@ def test_should_stop_stagnation():
     assert reason == "stagnation"
 
 
+def test_should_stop_stagnation_only_on_latest_deltas():
+    """Only the two most recent deltas count toward stagnation."""
+    state = NegotiationState()
+    state.round = 2
+    state.deltas = [0.01, 0.01, 0.20]
+
+    assert state.should_stop(confidence=0.70, threshold=0.85) == (False, None)
+
+    state.deltas.append(-0.02)
+    assert state.should_stop(confidence=0.70, threshold=0.85) == (False, None)
+
+    state.deltas.append(0.03)
+    assert state.should_stop(confidence=0.70, threshold=0.85) == (True, "stagnation")
+
+
+def test_should_stop_stagnation_window():
+    """A wider window needs that many consecutive low deltas."""
+    state = NegotiationState()
+    state.round = 1
+    state.deltas = [0.20, 0.01, 0.02]
+
+    assert state.should_stop(0.70, 0.85, max_rounds=5, stagnation_window=3) == (False, None)
+
+    state.deltas.append(0.0)
+    assert state.should_stop(0.70, 0.85, max_rounds=5, stagnation_window=3) == (True, "stagnation")
+
+
 def test_should_continue():
     """Negotiation continues when no stop conditions met."""
     state = NegotiationState()
@@ -301,6 +328,30 @@ async def test_negotiation_context_update(mock_matcher, compiled_game_with_clari
     assert result.rounds[0].updated_params["doctor"] == "Smith"
 
 
+@pytest.mark.asyncio
+async def test_round_snapshots_are_read_only_and_shared(mock_matcher, compiled_game_with_clarify):
+    """Rounds that repeat the same answer share one read-only params snapshot."""
+    loop = NegotiationLoop(max_rounds=3, epsilon=0.0)
+
+    async def mock_ask_user(question, options):
+        return "Smith"
+
+    result = await loop.clarify_until_confident(
+        move=compiled_game_with_clarify["moves"][0],
+        initial_input="I need something",
+        initial_match={"score": 0.4, "params": {}},
+        matcher=mock_matcher,
+        compiled_game=compiled_game_with_clarify,
+        ask_user=mock_ask_user
+    )
+
+    assert len(result.rounds) == 3
+    first = result.rounds[0].updated_params
+    with pytest.raises(TypeError):
+        first["doctor"] = "Jones"
+    assert all(r.updated_params is first for r in result.rounds)
+
+
 @pytest.mark.asyncio
 async def test_negotiation_manifest_recording():
     """Verify NegotiationRound structure and NegotiationResult format."""
@@ -366,3 +417,122 @@ async def test_negative_delta_resets_stagnation(mock_matcher, compiled_game_with
     # If we hit threshold, great; if not, we tested the full 3 rounds
     if result.success:
         assert result.reason == "threshold_met"
+
+
+def test_find_clarify_action_cached_per_move(compiled_game_with_clarify):
+    """The clarify action is looked up once per move object."""
+    loop = NegotiationLoop()
+    move = compiled_game_with_clarify["moves"][0]
+
+    action = loop._find_clarify_action(move)
+    assert action["question"] == "Which doctor?"
+
+    move["blocks"] = []  # Cached result is reused for the same move object
+    assert loop._find_clarify_action(move) is action
+    assert loop._find_clarify_action({"id": "other", "blocks": []}) is None
+
+
+def test_clarify_cache_is_bounded(monkeypatch):
+    """Moves from old compilations do not accumulate in the identity cache."""
+    monkeypatch.setattr(NegotiationLoop, "CLARIFY_CACHE_SIZE", 2)
+    loop = NegotiationLoop()
+    moves = [{"id": f"m{i}", "blocks": []} for i in range(5)]
+
+    for move in moves:
+        assert loop._find_clarify_action(move) is None
+        assert len(loop._clarify_cache) <= 2
+
+
+@pytest.mark.asyncio
+async def test_missing_clarify_action_raises_before_asking(mock_matcher):
+    """E200 is raised up front, without prompting the user."""
+    from lgdl.errors import RuntimeError as LGDLRuntimeError
+
+    move = {"id": "no_clarify", "threshold": 0.85, "blocks": []}
+    asked = []
+
+    async def mock_ask_user(question, options):
+        asked.append(question)
+        return "anything"
+
+    with pytest.raises(LGDLRuntimeError):
+        await NegotiationLoop().clarify_until_confident(
+            move=move,
+            initial_input="I need something",
+            initial_match={"score": 0.4, "params": {}},
+            matcher=mock_matcher,
+            compiled_game={"moves": [move]},
+            ask_user=mock_ask_user
+        )
+    assert asked == []
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_rematches(compiled_game_with_clarify):
+    """Concurrent submissions are matched in one match_batch call, off the loop."""
+    import asyncio
+    import threading
+    from lgdl.runtime.negotiation import MatcherBatcher
+
+    class BatchMatcher:
+        def __init__(self):
+            self.batches = []
+            self.threads = []
+
+        def match_batch(self, texts, compiled_game):
+            self.batches.append(list(texts))
+            self.threads.append(threading.get_ident())
+            return [{"move": None, "score": len(t) / 100, "params": {}} for t in texts]
+
+    matcher = BatchMatcher()
+    batcher = MatcherBatcher(max_batch=8, max_wait=0.01)
+    results = await asyncio.gather(*(
+        batcher.submit(matcher, text, compiled_game_with_clarify)
+        for text in ["a", "bb", "ccc"]
+    ))
+
+    assert matcher.batches == [["a", "bb", "ccc"]]
+    assert threading.get_ident() not in matcher.threads
+    assert [r["score"] for r in results] == [0.01, 0.02, 0.03]
+
+
+@pytest.mark.asyncio
+async def test_batcher_awaits_async_matchers(compiled_game_with_clarify):
+    """Matchers without match_batch are called directly (coroutines awaited)."""
+    from lgdl.runtime.negotiation import MatcherBatcher
+
+    class AsyncMatcher:
+        async def match(self, text, compiled_game, context=None):
+            return {"move": None, "score": 0.7, "params": {"text": text}}
+
+    result = await MatcherBatcher().submit(AsyncMatcher(), "hello", compiled_game_with_clarify)
+    assert result["params"] == {"text": "hello"}
+
+
+def test_enrich_input_skips_values_already_present():
+    """Values already in the original or appended text are not appended again."""
+    loop = NegotiationLoop()
+
+    assert loop._enrich_input("I need to see a doctor", {"doctor": "Smith"}) == "I need to see a doctor Smith"
+    assert loop._enrich_input("see Dr. SMITH", {"doctor": "smith"}) == "see Dr. SMITH"
+    assert loop._enrich_input("book", {"a": "Smith Jr", "b": "smith", "c": None}) == "book Smith Jr"
+
+
+
+def test_enrich_input_returns_original_when_nothing_appended():
+    """With nothing new to append, the original string is returned as-is."""
+    loop = NegotiationLoop()
+    original = "see  Dr. Smith"
+
+    assert loop._enrich_input(original, {"doctor": "smith", "empty": ""}) is original
+    assert loop._enrich_input(original, {"time": " next   week "}) == "see  Dr. Smith next week"
+
+def test_enrich_input_never_exceeds_length_cap():
+    """A value that would overflow the 2KB cap is not appended."""
+    loop = NegotiationLoop()
+
+    original = "x" * 2000
+    enriched = loop._enrich_input(original, {"short": "Smith", "long": "y" * 100, "after": "Jones"})
+
+    assert enriched == original + " Smith"
+    assert len(enriched) <= 2048
@@ -107,6 +107,97 @@ def test_reload_game():
     assert reloaded_hash == original_hash
 
 
+def test_reload_rehashes_only_changed_files(tmp_path, monkeypatch):
+    """File hashes are reused while mtime/size are unchanged."""
+    import hashlib
+    import os
+    from types import SimpleNamespace
+    import lgdl.runtime.registry as registry_module
+    import shutil
+
+    game = tmp_path / "game.lgdl"
+    shutil.copy("examples/medical/game.lgdl", game)
+    reg = GameRegistry()
+    reg.register("test", str(game))
+    original_hash = reg.get_metadata("test")["file_hash"]
+
+    hashed = []
+    real_sha256 = hashlib.sha256
+
+    def counting_sha256(data):
+        hashed.append(len(data))
+        return real_sha256(data)
+
+    monkeypatch.setattr(registry_module, "hashlib", SimpleNamespace(sha256=counting_sha256))
+
+    reg.reload("test")
+    assert hashed == []
+    assert reg.get_metadata("test")["file_hash"] == original_hash
+
+    game.write_text(game.read_text() + "\n# edited\n")
+    st = game.stat()
+    os.utime(game, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    reg.reload("test")
+    assert len(hashed) == 1
+    assert reg.get_metadata("test")["file_hash"] != original_hash
+    # Only the latest version of each file is remembered
+    assert GameRegistry._hash_cache[str(game.absolute())][2].startswith(
+        reg.get_metadata("test")["file_hash"]
+    )
+
+
+def test_failed_reload_keeps_previous_game(tmp_path):
+    """A reload that fails to compile leaves the old game registered."""
+    import shutil
+
+    game = tmp_path / "game.lgdl"
+    shutil.copy("examples/medical/game.lgdl", game)
+    reg = GameRegistry()
+    reg.register("test", str(game))
+    runtime = reg.get_runtime("test")
+
+    game.write_text("this is not lgdl {")
+    with pytest.raises(Exception):
+        reg.reload("test")
+
+    assert reg.get_runtime("test") is runtime
+    assert "test" in reg.games
+
+
+def test_identical_files_share_compiled_ir(tmp_path):
+    """Games with identical contents compile once and share the IR."""
+    import shutil
+
+    first = tmp_path / "a.lgdl"
+    second = tmp_path / "b.lgdl"
+    shutil.copy("examples/medical/game.lgdl", first)
+    shutil.copy("examples/medical/game.lgdl", second)
+
+    reg = GameRegistry()
+    reg.register("tenant_a", str(first))
+    reg.register("tenant_b", str(second))
+
+    assert reg.games["tenant_a"]["compiled"] is reg.games["tenant_b"]["compiled"]
+    assert reg.get_metadata("tenant_a")["path"] != reg.get_metadata("tenant_b")["path"]
+
+
+def test_compiled_cache_is_bounded(tmp_path, monkeypatch):
+    """Edited-and-reloaded games do not accumulate compiled IR."""
+    import shutil
+
+    monkeypatch.setattr(GameRegistry, "COMPILED_CACHE_SIZE", 2)
+    game = tmp_path / "game.lgdl"
+    shutil.copy("examples/medical/game.lgdl", game)
+    reg = GameRegistry()
+    reg.register("test", str(game))
+
+    for i in range(4):
+        game.write_text(game.read_text() + f"\n# edit {i}\n")
+        reg.reload("test")
+        assert len(GameRegistry._compiled_cache) <= 2
+        assert reg.games["test"]["compiled"] is not None
+
+
 def test_reload_not_found():
     """Reload raises KeyError for unregistered game."""
     reg = GameRegistry()
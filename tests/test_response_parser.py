@@ -126,6 +126,13 @@ class TestResponseParser:
         parsed = parser.parse_response("Is it sharp or dull?")
         assert parsed.question_type == QuestionType.YES_NO
 
+    def test_classification_follows_rule_priority(self, parser):
+        """Higher-priority rules win even when a lower one matches further left"""
+        assert parser._classify_question("Where is it, left or right?") == QuestionType.CHOICE
+        assert parser._classify_question("What is it, and why?") == QuestionType.WHAT
+        assert parser._classify_question("Tell me:\nwhere does it hurt?") == QuestionType.WHERE
+        assert parser._classify_question("Sounds good?") == QuestionType.UNKNOWN
+
     def test_extract_primary_question(self, parser):
         """Test extraction of primary question from multi-sentence response"""
         response = "I understand you have chest pain. Where exactly is the pain? Is it severe?"
@@ -189,6 +196,28 @@ class TestResponseParser:
 
         assert parsed.question_type == QuestionType.WHY
 
+    def test_parse_response_is_memoized(self, parser):
+        """Re-parsing the same response returns the cached, frozen result"""
+        import dataclasses
+
+        parsed = parser.parse_response("Where does it hurt? Is it constant?")
+
+        assert parser.parse_response("Where does it hurt? Is it constant?") is parsed
+        assert ResponseParser().parse_response("Where does it hurt? Is it constant?") is parsed
+        assert parsed.questions == ("Where does it hurt?", "Is it constant?")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            parsed.awaiting_response = False
+
+    def test_classification_ignores_case(self, parser):
+        """Classification lowercases the question instead of folding case per pattern"""
+        assert parser._classify_question("WHERE does it hurt?") == QuestionType.WHERE
+        assert parser._classify_question("IS it constant?") == QuestionType.YES_NO
+        assert parser._classify_question("Left OR right?") == QuestionType.CHOICE
+
+    def test_parser_is_stateless(self, parser):
+        """Instances carry no per-instance state; patterns live on the class"""
+        assert vars(parser) == {}
+
     def test_original_response_preserved(self, parser):
         """Test that original response text is preserved"""
         response = "Testing preservation. Is this working?"
@@ -10,3 +10,27 @@ async def _run():
 
 def test_runtime_smoke():
     asyncio.run(_run())
+
+
+def test_actions_dispatch_sync_or_capability():
+    rt = LGDLRuntime({"name": "t", "moves": []})
+
+    # Non-capability actions are plain calls, not coroutines
+    assert rt._exec_action_sync({"type": "respond", "data": {"text": "hi"}}, {}) == ("hi", None, "ok")
+
+    calls = []
+
+    class Cap:
+        async def execute(self, name, payload):
+            calls.append((name, payload))
+            await asyncio.sleep(0)
+            return {"message": "found", "data": {"count": 2}}
+
+    rt.cap = Cap()
+    rt.policy.allowed = lambda func: True
+    params = {"item": "tea"}
+    action = {"type": "capability", "data": {"call": {"service": "shop", "function": "search"}}}
+    result = asyncio.run(rt._exec_capability(action, params))
+    assert result == ("found", "search", "ok")
+    assert calls == [("shop.search", {"item": "tea"})]
+    assert params["count"] == 2
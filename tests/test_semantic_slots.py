@@ -45,6 +45,59 @@ async def test_regex_extractor_number():
     assert result.strategy_used == "regex"
 
 
+
+def test_regex_extractor_resolves_slot_plan_once():
+    """Slot definitions are resolved into a SlotPlan once per dict."""
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "range", "min": 1, "max": 10, "name": "severity"}
+
+    assert extractor.extract_sync("7", slot_def, {}).success
+    plan = extractor._plans[id(slot_def)][1]
+    assert (plan.type, plan.min, plan.max) == ("range", 1, 10)
+
+    assert not extractor.extract_sync("12", slot_def, {}).success
+    assert extractor._plans[id(slot_def)][1] is plan
+
+
+def test_regex_extractor_sync_path():
+    """extract_sync gives the same result as the awaitable extract."""
+    import asyncio
+
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "number", "name": "severity"}
+
+    result = extractor.extract_sync("about 7", slot_def, {})
+    assert result == asyncio.run(extractor.extract("about 7", slot_def, {}))
+    assert result.value == 7.0
+
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_regex_extractor_timeframe_phrases(monkeypatch, use_automaton):
+    """Phrase detection gives the same answers with or without pyahocorasick."""
+    if not use_automaton:
+        monkeypatch.setattr(RegexSlotExtractor, "_PHRASE_AC", None)
+    elif RegexSlotExtractor._PHRASE_AC is None:
+        pytest.skip("pyahocorasick not installed")
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "timeframe", "name": "onset"}
+
+    assert extractor.extract_sync("it began Last Night", slot_def, {}).confidence == 0.7
+    assert extractor.extract_sync("a while", slot_def, {}).confidence == 0.5
+
+@pytest.mark.asyncio
+async def test_regex_extractor_number_miss_is_shared():
+    """Number misses return one shared, immutable failure result."""
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "number", "name": "severity"}
+
+    first = await extractor.extract(user_input="a lot", slot_def=slot_def, context={})
+    second = await extractor.extract(user_input="not sure", slot_def=slot_def, context={})
+
+    assert not first.success
+    assert first.reasoning == "No number found in input"
+    assert second is first
+
 @pytest.mark.asyncio
 async def test_regex_extractor_range_validation():
     """Test range validation in regex extractor."""
@@ -99,6 +152,56 @@ async def test_regex_extractor_enum():
     assert result.confidence == 0.8
 
 
+@pytest.mark.asyncio
+async def test_regex_extractor_enum_exact_match_ignores_case():
+    """Exact enum matches are case-insensitive, prefer the first listed value, and are shared."""
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "enum", "enum_values": ["SMS", "sms", "Email"], "name": "channel"}
+
+    result = await extractor.extract(user_input="EMAIL", slot_def=slot_def, context={})
+    assert result.value == "Email"
+    assert result.confidence == 1.0
+
+    result = await extractor.extract(user_input="sms", slot_def=slot_def, context={})
+    assert result.value == "SMS"
+
+    # Hits share one prebuilt result per enum value
+    assert await extractor.extract(user_input="SmS", slot_def=slot_def, context={}) is result
+
+
+@pytest.mark.asyncio
+async def test_regex_extractor_date():
+    """Test ISO/US date normalization and rejection of impossible dates."""
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "date", "name": "visit"}
+
+    result = await extractor.extract(user_input="on 3/7/2025", slot_def=slot_def, context={})
+    assert result.value == "2025-03-07"
+    assert result.confidence == 0.85
+
+    result = await extractor.extract(user_input="2025-02-30", slot_def=slot_def, context={})
+    assert result.value == "2025-02-30"
+    assert result.confidence == 0.3  # Not a real date, raw text fallback
+
+
+@pytest.mark.asyncio
+async def test_regex_extractor_timeframe():
+    """Test timeframe extraction of quantities and relative phrases."""
+    extractor = RegexSlotExtractor()
+    slot_def = {"type": "timeframe", "name": "onset"}
+
+    result = await extractor.extract(user_input="About 3 Weeks", slot_def=slot_def, context={})
+    assert result.value == "3 weeks"
+    assert result.confidence == 0.9
+
+    result = await extractor.extract(user_input="  Since Yesterday ", slot_def=slot_def, context={})
+    assert result.value == "Since Yesterday"
+    assert result.confidence == 0.7
+
+    result = await extractor.extract(user_input="a while", slot_def=slot_def, context={})
+    assert result.confidence == 0.5
+
+
 # ============================================================================
 # Unit Tests: SemanticSlotExtractor
 # ============================================================================
@@ -144,6 +247,48 @@ async def test_semantic_extractor_with_vocabulary():
     assert "ticker" in result.reasoning.lower()
 
 
+def test_semantic_response_schema_shared_per_slot_shape():
+    """Slots with the same type, name and enum values share one schema dict."""
+    extractor = SemanticSlotExtractor(MockLLMClient())
+
+    schema = extractor._get_response_schema({"type": "enum", "name": "side", "enum_values": ["left", "right"]})
+    again = extractor._get_response_schema({"type": "enum", "name": "side", "enum_values": ["left", "right"]})
+
+    assert again is schema
+    assert schema["value"] == {"description": "The extracted side", "type": "string", "enum": ["left", "right"]}
+    assert extractor._get_response_schema({"type": "number", "name": "side"})["value"]["type"] == "number"
+
+
+@pytest.mark.asyncio
+async def test_semantic_extractor_memoizes_repeats():
+    """Identical extraction requests reuse the cached result; errors are not cached."""
+    class CountingMockLLM(MockLLMClient):
+        calls = 0
+        fail = False
+
+        async def complete(self, prompt, response_schema, **kwargs):
+            CountingMockLLM.calls += 1
+            if CountingMockLLM.fail:
+                raise RuntimeError("boom")
+            return await super().complete(prompt, response_schema, **kwargs)
+
+    extractor = SemanticSlotExtractor(CountingMockLLM())
+    slot_def = {"type": "string", "name": "location"}
+
+    first = await extractor.extract("my chest", slot_def, {})
+    assert await extractor.extract("my chest", slot_def, {}) is first
+    assert CountingMockLLM.calls == 1
+
+    # Different context -> different prompt -> new call
+    await extractor.extract("my chest", slot_def, {"filled_slots": {"severity": 5}})
+    assert CountingMockLLM.calls == 2
+
+    CountingMockLLM.fail = True
+    await extractor.extract("my arm", slot_def, {})
+    await extractor.extract("my arm", slot_def, {})
+    assert CountingMockLLM.calls == 4
+
+
 # ============================================================================
 # Unit Tests: HybridSlotExtractor
 # ============================================================================
@@ -229,6 +374,40 @@ async def test_extraction_engine_routes_correctly():
     assert result.strategy_used == "regex"
 
 
+@pytest.mark.asyncio
+async def test_extraction_engine_batches_semantic_slots():
+    """Semantic slots filled from the same input share one LLM call."""
+    config = LGDLConfig(
+        openai_api_key="test-key",
+        enable_semantic_slot_extraction=True
+    )
+    engine = SlotExtractionEngine(config)
+
+    class CountingMockLLM(MockLLMClient):
+        calls = 0
+
+        async def complete(self, prompt, response_schema, **kwargs):
+            CountingMockLLM.calls += 1
+            return await super().complete(prompt, response_schema, **kwargs)
+
+    engine.semantic.llm = CountingMockLLM(default_confidence=0.8)
+
+    results = await engine.extract_slots(
+        user_input="pain in my chest since 3 days",
+        slot_defs=[
+            {"type": "string", "extraction_strategy": "semantic", "name": "location"},
+            {"type": "number", "extraction_strategy": "regex", "name": "days"},
+            {"type": "string", "extraction_strategy": "semantic", "name": "quality"},
+        ],
+        context={}
+    )
+
+    assert CountingMockLLM.calls == 1
+    assert [r.strategy_used for r in results] == ["semantic", "regex", "semantic"]
+    assert results[1].value == 3.0
+    assert results[0].confidence == results[2].confidence == 0.8
+
+
 @pytest.mark.asyncio
 async def test_extraction_engine_fallback_when_semantic_disabled():
     """Test graceful fallback when semantic extraction disabled."""
@@ -254,6 +433,29 @@ async def test_extraction_engine_fallback_when_semantic_disabled():
     assert result.strategy_used == "regex"  # Fell back
 
 
+def test_extraction_engine_from_env(monkeypatch):
+    """from_env builds the engine from an environment-loaded LGDLConfig."""
+    monkeypatch.setenv("LGDL_ENABLE_SEMANTIC_SLOT_EXTRACTION", "false")
+
+    engine = SlotExtractionEngine.from_env()
+
+    assert isinstance(engine.config, LGDLConfig)
+    assert engine.semantic is None
+
+
+def test_extraction_engine_sync_path():
+    """extract_slot_sync answers LLM-free slots and defers the rest."""
+    disabled = SlotExtractionEngine(LGDLConfig(enable_semantic_slot_extraction=False))
+    enabled = SlotExtractionEngine(LGDLConfig(openai_api_key="test-key", enable_semantic_slot_extraction=True))
+    semantic_slot = {"type": "number", "extraction_strategy": "semantic", "name": "test"}
+
+    result = disabled.extract_slot_sync("8", semantic_slot, {})
+    assert result.value == 8.0 and result.strategy_used == "regex"
+
+    assert enabled.extract_slot_sync("8", semantic_slot, {}) is None
+    assert enabled.extract_slot_sync("8", {"type": "number", "name": "test"}, {}).value == 8.0
+
+
 # ============================================================================
 # Grammar & Compilation Tests
 # ============================================================================
@@ -400,6 +602,17 @@ async def test_extraction_result_dataclass():
     assert len(result.alternatives) == 2
 
 
+def test_extraction_result_is_frozen_and_slotted():
+    """ExtractionResult is immutable and carries no per-instance __dict__."""
+    import dataclasses
+
+    result = ExtractionResult(success=False, value=None, confidence=0.0, strategy_used="regex")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.strategy_used = "hybrid(regex)"
+    assert not hasattr(result, "__dict__")
+
+
 # ============================================================================
 # Summary Test
 # ============================================================================
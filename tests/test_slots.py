@@ -68,6 +68,16 @@ def test_slot_validation_number(slot_manager):
     assert valid is False
 
 
+def test_slot_validation_number_digit_fast_path(slot_manager):
+    """Digit-only strings parse directly; other text keeps first-number semantics"""
+    slot_def = {"type": "number"}
+
+    assert slot_manager.validate_slot_value(slot_def, "42") == (True, 42.0)
+    assert slot_manager.validate_slot_value(slot_def, "1e5") == (True, 1.0)
+    assert slot_manager.validate_slot_value(slot_def, "inf") == (False, None)
+    assert slot_manager.validate_slot_value(slot_def, "\u00b2") == (False, None)
+
+
 def test_slot_validation_range(slot_manager):
     """Test range slot validation with constraints"""
     slot_def = {"type": "range", "min": 1.0, "max": 10.0}
@@ -148,6 +158,17 @@ def test_slot_validation_timeframe(slot_manager):
     assert valid is False
 
 
+def test_slot_validation_timeframe_phrases_without_automaton(slot_manager, monkeypatch):
+    """Fuzzy timeframe phrases are found by the regex fallback too"""
+    from lgdl.runtime import slots
+
+    monkeypatch.setattr(slots, "_FUZZY_PHRASE_AC", None)
+    slot_def = {"type": "timeframe"}
+
+    assert slot_manager.validate_slot_value(slot_def, "a while back")[0] is True
+    assert slot_manager.validate_slot_value(slot_def, "not a timeframe")[0] is False
+
+
 def test_slot_validation_timeframe_failures(slot_manager):
     """Test timeframe validation rejects nonsense input"""
     slot_def = {"type": "timeframe"}
@@ -263,6 +284,62 @@ async def test_slot_clearing(slot_manager):
     assert await slot_manager.get_slot_values(move_id, conv_id) == {}
 
 
+@pytest.mark.asyncio
+async def test_clear_slots_scoped_to_move(slot_manager):
+    """Clearing one move leaves other moves and conversations untouched"""
+    await slot_manager.fill_slot("c1", "m1", "name", "Ann")
+    await slot_manager.fill_slot("c1", "m2", "name", "Bob")
+    await slot_manager.fill_slot("c2", "m1", "name", "Cy")
+
+    await slot_manager.clear_slots("c1", "m1")
+    await slot_manager.clear_slots("c1", "missing")
+
+    assert await slot_manager.get_slot_values("m1", "c1") == {}
+    assert await slot_manager.get_slot_value("c1", "m2", "name") == "Bob"
+    assert await slot_manager.get_slot_values("m1", "c2") == {"name": "Cy"}
+
+    for slot_name in ("zeta", "alpha", "mid"):
+        await slot_manager.fill_slot("c3", "m1", slot_name, slot_name)
+    await slot_manager.fill_slot("c3", "m1", "zeta", "again")
+    assert list(await slot_manager.get_slot_values("m1", "c3")) == ["zeta", "alpha", "mid"]
+
+    missing = await slot_manager.get_missing_slots(
+        {"id": "m1", "slots": {"name": {"type": "string", "required": True}}}, "c1"
+    )
+    assert missing == ["name"]
+
+
+@pytest.mark.asyncio
+async def test_required_slots_computed_once_per_move(slot_manager):
+    """Required-slot names are cached by move identity without touching the IR"""
+    move = {
+        "id": "m",
+        "slots": {
+            "a": {"type": "string", "required": True},
+            "b": {"type": "string", "required": False},
+            "c": {"type": "string", "required": True, "default": "x"},
+        },
+    }
+
+    assert await slot_manager.get_missing_slots(move, "c1") == ["a"]
+    cached = slot_manager._required_slots(move)
+    assert slot_manager._required_slots(move) is cached
+    assert set(move) == {"id", "slots"}
+
+    await slot_manager.fill_slot("c1", "m", "a", "done")
+    assert await slot_manager.get_missing_slots(move, "c1") == []
+
+
+def test_required_slots_cache_is_bounded(slot_manager, monkeypatch):
+    """Moves from old compilations do not accumulate in the identity cache"""
+    monkeypatch.setattr(SlotManager, "REQUIRED_CACHE_SIZE", 2)
+    moves = [{"id": f"m{i}", "slots": {"a": {"type": "string"}}} for i in range(5)]
+
+    for move in moves:
+        assert slot_manager._required_slots(move) == ("a",)
+        assert len(slot_manager._required) <= 2
+
+
 @pytest.mark.asyncio
 async def test_has_slot(slot_manager):
     """Test checking if a slot exists"""